@@ -0,0 +1,432 @@
+"""Runtime benchmarks for the generated code
+
+Generates modules from the bundled test schemas and documents and measures what
+matters once the code is in production: the cold import time of the generated
+module, the `model_validate` throughput on synthetic responses and the
+serialization throughput of the `Arguments` of every operation. Every case is
+generated once for each variant of generator options, so that options like
+freezing or discriminated unions can be compared.
+
+Run it with `python -m tests.benchmarks` (see `--help` for the options).
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLEnumType,
+    GraphQLInputObjectType,
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    GraphQLScalarType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    is_abstract_type,
+    type_from_ast,
+)
+
+from turms.config import DeferBuildConfig, FreezeConfig, GeneratorConfig
+from turms.helpers import load_introspection_from_url
+from turms.plugins.enums import EnumsPlugin
+from turms.plugins.fragments import FragmentsPlugin
+from turms.plugins.funcs import get_operation_class_name
+from turms.plugins.inputs import InputsPlugin
+from turms.plugins.operations import OperationsPlugin
+from turms.registry import ClassRegistry
+from turms.run import build_schema_from_schema_type, generate_ast, write_code_to_file
+from turms.stylers.default import DefaultStyler
+from turms.utils import parse_documents
+
+from .utils import build_relative_glob, parse_to_code
+
+
+SCALAR_SAMPLES = {
+    "ID": "1",
+    "String": "text",
+    "Int": 1,
+    "Float": 1.5,
+    "Boolean": True,
+    "UUID": "1b4e28ba-2fa1-41d2-883f-0016d3cca427",
+    "DateTime": "2022-01-01T00:00:00",
+    "Any": {"key": "value"},
+    "GenericScalar": {"key": "value"},
+}
+"""Values for the scalars of the synthetic responses and variables (others are strings)"""
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    schema: Callable[[], GraphQLSchema]
+    documents: str
+    scalar_definitions: Dict[str, str] = field(default_factory=dict)
+
+
+CASES = [
+    BenchmarkCase(
+        "beasts",
+        lambda: build_schema_from_schema_type(
+            build_relative_glob("/schemas/beasts.graphql")
+        ),
+        "/documents/beasts/*.graphql",
+    ),
+    BenchmarkCase(
+        "arkitekt",
+        lambda: build_schema_from_schema_type(
+            build_relative_glob("/schemas/arkitekt.graphql")
+        ),
+        "/documents/arkitekt/**/*.graphql",
+        {
+            "uuid": "str",
+            "Callback": "str",
+            "Any": "typing.Any",
+            "QString": "str",
+            "UUID": "pydantic.UUID4",
+        },
+    ),
+    BenchmarkCase(
+        "countries",
+        lambda: build_schema_from_schema_type(
+            load_introspection_from_url("https://countries.trevorblades.com/")
+        ),
+        "/documents/countries/*.graphql",
+    ),
+    BenchmarkCase(
+        "nested_inputs",
+        lambda: build_schema_from_schema_type(
+            build_relative_glob("/schemas/nested_inputs.graphql")
+        ),
+        "/documents/nested_inputs/*.graphql",
+    ),
+    BenchmarkCase(
+        "unions",
+        lambda: build_schema_from_schema_type(
+            build_relative_glob("/schemas/union.graphql")
+        ),
+        "/documents/unions/*.graphql",
+    ),
+]
+
+
+VARIANTS: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "freeze": {"freeze": FreezeConfig(enabled=True)},
+    "discriminate_unions": {"discriminate_unions": True},
+    "defer_build": {"defer_build": DeferBuildConfig(enabled=True)},
+}
+"""The generator options every case is generated with (compared against default)"""
+
+
+def deep_merge(a: Any, b: Any) -> Any:
+    """Merges the responses of overlapping selections (e.g. a field and a fragment)"""
+    if isinstance(a, dict) and isinstance(b, dict):
+        merged = dict(a)
+        for key, value in b.items():
+            merged[key] = deep_merge(merged[key], value) if key in merged else value
+        return merged
+    if isinstance(a, list) and isinstance(b, list) and len(a) == len(b):
+        return [deep_merge(x, y) for x, y in zip(a, b)]
+    return b
+
+
+class ResponseSampler:
+    """Builds synthetic responses for operations, every nullable field is filled"""
+
+    def __init__(
+        self,
+        client_schema: GraphQLSchema,
+        fragments: Dict[str, FragmentDefinitionNode],
+        list_size: int = 10,
+    ):
+        self.client_schema = client_schema
+        self.fragments = fragments
+        self.list_size = list_size
+
+    def applies(self, type_condition: Optional[str], type: GraphQLObjectType) -> bool:
+        if type_condition is None or type_condition == type.name:
+            return True
+        condition = self.client_schema.get_type(type_condition)
+        return is_abstract_type(condition) and self.client_schema.is_sub_type(
+            condition, type
+        )
+
+    def sample_selection(
+        self, selection_set: SelectionSetNode, type: GraphQLObjectType
+    ) -> Dict[str, Any]:
+        result = {"__typename": type.name}
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                key = selection.alias.value if selection.alias else selection.name.value
+                if selection.name.value == "__typename":
+                    value = type.name
+                else:
+                    value = self.sample_output(
+                        type.fields[selection.name.value].type,
+                        selection.selection_set,
+                    )
+                result[key] = deep_merge(result[key], value) if key in result else value
+            elif isinstance(selection, InlineFragmentNode):
+                condition = (
+                    selection.type_condition.name.value
+                    if selection.type_condition
+                    else None
+                )
+                if self.applies(condition, type):
+                    result = deep_merge(
+                        result, self.sample_selection(selection.selection_set, type)
+                    )
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments[selection.name.value]
+                if self.applies(fragment.type_condition.name.value, type):
+                    result = deep_merge(
+                        result, self.sample_selection(fragment.selection_set, type)
+                    )
+        return result
+
+    def sample_output(self, type, selection_set, index: int = 0) -> Any:
+        if isinstance(type, GraphQLNonNull):
+            return self.sample_output(type.of_type, selection_set, index)
+        if isinstance(type, GraphQLList):
+            return [
+                self.sample_output(type.of_type, selection_set, i)
+                for i in range(self.list_size)
+            ]
+        if isinstance(type, GraphQLScalarType):
+            return SCALAR_SAMPLES.get(type.name, "text")
+        if isinstance(type, GraphQLEnumType):
+            return next(iter(type.values))
+        if is_abstract_type(type):
+            possible_types = self.client_schema.get_possible_types(type)
+            type = possible_types[index % len(possible_types)]
+        return self.sample_selection(selection_set, type)
+
+    def sample_operation(self, o: OperationDefinitionNode) -> Dict[str, Any]:
+        root = self.client_schema.get_root_type(o.operation)
+        data = self.sample_selection(o.selection_set, root)
+        data.pop("__typename")
+        return data
+
+
+def sample_input(type, depth: int = 0) -> Any:
+    """Builds a synthetic variable value (nullable input fields stop at depth 3)"""
+    if not isinstance(type, GraphQLNonNull) and depth > 3:
+        return None
+    if isinstance(type, GraphQLNonNull):
+        type = type.of_type
+    if isinstance(type, GraphQLList):
+        return [sample_input(type.of_type, depth + 1) for _ in range(3)]
+    if isinstance(type, GraphQLScalarType):
+        return SCALAR_SAMPLES.get(type.name, "text")
+    if isinstance(type, GraphQLEnumType):
+        return next(iter(type.values))
+    if isinstance(type, GraphQLInputObjectType):
+        return {
+            key: sample_input(input_field.type, depth + 1)
+            for key, input_field in type.fields.items()
+        }
+    raise NotImplementedError(f"Unknown input type {type}")  # pragma: no cover
+
+
+def generate_case(case: BenchmarkCase, client_schema: GraphQLSchema, options: dict):
+    """Generates the module code and the synthetic data (keyed by operation class)"""
+    config = GeneratorConfig(
+        documents=build_relative_glob(case.documents),
+        scalar_definitions=case.scalar_definitions,
+        **options,
+    )
+    stylers = [DefaultStyler()]
+    generated_ast = generate_ast(
+        config,
+        client_schema,
+        stylers=stylers,
+        plugins=[EnumsPlugin(), InputsPlugin(), FragmentsPlugin(), OperationsPlugin()],
+    )
+
+    documents = parse_documents(client_schema, config.documents)
+    fragments = {
+        definition.name.value: definition
+        for definition in documents.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    sampler = ResponseSampler(client_schema, fragments)
+    registry = ClassRegistry(config, stylers, lambda *args, **kwargs: None)
+
+    samples = {}
+    for definition in documents.definitions:
+        if isinstance(definition, OperationDefinitionNode):
+            samples[get_operation_class_name(definition, registry)] = {
+                "data": sampler.sample_operation(definition),
+                "variables": {
+                    v.variable.name.value: sample_input(
+                        type_from_ast(client_schema, v.type)
+                    )
+                    for v in definition.variable_definitions
+                },
+            }
+
+    return parse_to_code(generated_ast), samples
+
+
+IMPORT_CODE = """
+import sys, time
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+
+class Warm(BaseModel):
+    value: int = Field(default=1, alias="v")
+
+
+sys.path.insert(0, sys.argv[1])
+start = time.perf_counter()
+import schema
+print(time.perf_counter() - start)
+"""
+
+
+THROUGHPUT_CODE = """
+import json, sys, timeit
+sys.path.insert(0, sys.argv[1])
+import schema
+
+samples = json.load(open(sys.argv[2]))
+number = int(sys.argv[3])
+
+
+def best(function):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+validate, arguments = [], []
+for name, sample in samples.items():
+    operation = getattr(schema, name)
+    data, variables = sample["data"], sample["variables"]
+    validate.append(best(lambda: operation.model_validate(data)))
+    if hasattr(operation, "Arguments"):
+        arguments.append(
+            best(
+                lambda: operation.Arguments.model_validate(variables).model_dump(
+                    by_alias=True
+                )
+            )
+        )
+
+print(json.dumps({"validate": validate, "arguments": arguments}))
+"""
+
+
+def run_python(code: str, *args: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code, *args], capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+    return result.stdout
+
+
+def measure(code: str, samples: dict, import_repeats: int, number: int) -> dict:
+    """Measures the generated module in fresh interpreters (times in microseconds)"""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        write_code_to_file(code, tmpdirname, "schema.py")
+        samples_path = os.path.join(tmpdirname, "samples.json")
+        with open(samples_path, "w") as f:
+            json.dump(samples, f)
+
+        # Every import runs in a new process, after pydantic itself was imported and used
+        import_time = min(
+            float(run_python(IMPORT_CODE, tmpdirname)) for _ in range(import_repeats)
+        )
+        throughput = json.loads(
+            run_python(THROUGHPUT_CODE, tmpdirname, samples_path, str(number))
+        )
+
+    def mean(values):
+        return sum(values) / len(values) * 1e6 if values else 0.0
+
+    return {
+        "import": import_time * 1e6,
+        "validate": mean(throughput["validate"]),
+        "arguments": mean(throughput["arguments"]),
+    }
+
+
+def run_benchmarks(
+    cases: List[BenchmarkCase] = CASES,
+    variants: Dict[str, Dict[str, Any]] = VARIANTS,
+    import_repeats: int = 5,
+    number: int = 200,
+) -> Dict[str, Dict[str, dict]]:
+    """Runs the benchmarks, returns the results by case and variant
+
+    Cases whose schema can not be loaded (e.g. countries without network access)
+    are skipped."""
+    results = {}
+    for case in cases:
+        try:
+            client_schema = case.schema()
+        except Exception as e:
+            print(f"Skipping {case.name}: {e}", file=sys.stderr)
+            continue
+
+        results[case.name] = {}
+        for variant, options in variants.items():
+            code, samples = generate_case(case, client_schema, options)
+            results[case.name][variant] = measure(code, samples, import_repeats, number)
+
+    return results
+
+
+def format_results(results: Dict[str, Dict[str, dict]]) -> str:
+    """Formats the results as table, with the change relative to the first variant"""
+    lines = [
+        f"{'case':<15}{'variant':<22}{'import (us)':>20}{'validate (us)':>20}{'arguments (us)':>20}"
+    ]
+    for case, variants in results.items():
+        baseline = next(iter(variants.values()))
+        for variant, result in variants.items():
+            cells = []
+            for key in ("import", "validate", "arguments"):
+                value = result[key]
+                change = (
+                    f" ({(value / baseline[key] - 1) * 100:+.0f}%)"
+                    if baseline[key] and result is not baseline
+                    else ""
+                )
+                cells.append(f"{value:.1f}{change}".rjust(20))
+            lines.append(f"{case:<15}{variant:<22}" + "".join(cells))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--case", action="append", help="Only run these cases")
+    parser.add_argument("--variant", action="append", help="Only run these variants")
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--import-repeats", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print the raw results")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in CASES if not args.case or case.name in args.case]
+    variants = {
+        name: options
+        for name, options in VARIANTS.items()
+        if not args.variant or name in args.variant
+    }
+
+    results = run_benchmarks(cases, variants, args.import_repeats, args.number)
+    print(json.dumps(results, indent=2) if args.json else format_results(results))
+
+
+if __name__ == "__main__":
+    main()
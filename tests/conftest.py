@@ -7,6 +7,16 @@ from turms.run import (
 from .utils import build_relative_glob
 from graphql import build_client_schema
 from turms.helpers import load_introspection_from_url
+import turms.snapshot
+
+
+@pytest.fixture(autouse=True)
+def snapshot_key(tmp_path_factory, monkeypatch):
+    """Signs snapshots and cached pickles with a key of the test, instead of the
+    key of the user"""
+    path = tmp_path_factory.mktemp("home") / "snapshot.key"
+    monkeypatch.setattr(turms.snapshot, "SNAPSHOT_KEY_PATH", str(path))
+    return path
 
 
 @pytest.fixture(scope="session")
@@ -23,6 +23,16 @@ async def asubscribe(model: Type[T], variables) -> T:
     yield model(variables)  # pragma: nocover
 
 
+# The data of mocked responses by operation name (for convert_query)
+MOCKED_RESPONSES = {}
+
+
+def convert_query(model: Type[T], variables) -> T:
+    import msgspec
+
+    return msgspec.convert(MOCKED_RESPONSES[model.__name__], model)
+
+
 class ExtraArguments(BaseModel):
     extra: Optional[str]
 
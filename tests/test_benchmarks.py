@@ -0,0 +1,14 @@
+from .benchmarks import CASES, VARIANTS, format_results, run_benchmarks
+
+
+def test_benchmarks_run():
+    cases = [case for case in CASES if case.name == "unions"]
+    variants = {name: VARIANTS[name] for name in ("default", "discriminate_unions")}
+
+    results = run_benchmarks(cases, variants, import_repeats=1, number=1)
+
+    assert set(results["unions"]) == {"default", "discriminate_unions"}
+    for result in results["unions"].values():
+        assert result["import"] > 0
+        assert result["validate"] > 0
+    assert "discriminate_unions" in format_results(results)
@@ -0,0 +1,164 @@
+import importlib.util
+import os
+import shutil
+
+from click.testing import CliRunner
+
+from turms.cli.main import cli
+from turms.run import (
+    compile_bytecode,
+    gen,
+    generate,
+    generation_hash,
+    is_up_to_date,
+    load_projects_from_configpath,
+    read_generation_hash,
+    write_generation,
+    write_if_changed,
+)
+
+from .utils import build_relative_glob
+
+
+def setup_local_project(td):
+    schema_dir = os.path.join(td, "schema")
+    graphql_dir = os.path.join(td, "graphql")
+    os.mkdir(schema_dir)
+    os.mkdir(graphql_dir)
+
+    shutil.copyfile(
+        build_relative_glob("/configs/test_cli_local.yaml"),
+        os.path.join(td, "graphql.config.yaml"),
+    )
+    shutil.copyfile(
+        build_relative_glob("/schemas/nested_inputs.graphql"),
+        os.path.join(schema_dir, "nested_inputs.graphql"),
+    )
+    shutil.copytree(
+        build_relative_glob("/documents/nested_inputs"),
+        os.path.join(graphql_dir, "nested_inputs"),
+    )
+
+
+def test_generation_hash(tmp_path, monkeypatch):
+    setup_local_project(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    project = load_projects_from_configpath("graphql.config.yaml")["nested_inputs"]
+    assert not is_up_to_date(project)
+
+    generated_code, schema = generate(project)
+    write_generation(project, generated_code, schema)
+
+    stored_hash = read_generation_hash(project.extensions.turms)
+    assert stored_hash == generation_hash(project, schema)
+    assert is_up_to_date(project)
+
+    # Unchanged inputs return the stored code
+    assert generate(project)[0] == generated_code
+
+    with open(os.path.join("graphql", "nested_inputs", "test.graphql"), "a") as f:
+        f.write("\n# a changed document\n")
+
+    assert generation_hash(project, schema) != stored_hash
+    assert not is_up_to_date(project)
+
+
+def test_edited_generation_is_not_up_to_date(tmp_path, monkeypatch):
+    setup_local_project(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    project = load_projects_from_configpath("graphql.config.yaml")["nested_inputs"]
+    generated_code, schema = generate(project)
+    generated_file = write_generation(project, generated_code, schema)
+    assert is_up_to_date(project)
+
+    with open(generated_file, "a") as f:
+        f.write("\n# a hand edit\n")
+    assert not is_up_to_date(project)
+    assert generate(project)[0] == generated_code, "Edits should be regenerated"
+
+    os.remove(generated_file)
+    assert not is_up_to_date(project)
+
+
+def test_generation_cache_uses_overwrite_path(tmp_path, monkeypatch):
+    setup_local_project(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    gen("graphql.config.yaml", overwrite_path="other")
+    assert os.path.exists(os.path.join("other", "schema.py"))
+
+    project = load_projects_from_configpath("graphql.config.yaml")["nested_inputs"]
+    assert not is_up_to_date(project)
+    assert is_up_to_date(project, outdir="other")
+
+    logged = []
+    generate(project, log=lambda message, **kwargs: logged.append(message))
+    assert not any("Skipping" in message for message in logged)
+    generate(
+        project, log=lambda message, **kwargs: logged.append(message), outdir="other"
+    )
+    assert any("Skipping" in message for message in logged)
+
+
+def test_gen_check(tmp_path):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path) as td:
+        setup_local_project(td)
+
+        result = runner.invoke(cli, ["gen", "--check"])
+        assert result.exit_code == 1, result.output
+        assert not os.path.exists(os.path.join(td, "examples", "api", "schema.py"))
+
+        result = runner.invoke(cli, ["gen"])
+        assert result.exit_code == 0, result.output
+
+        result = runner.invoke(cli, ["gen", "--check"])
+        assert result.exit_code == 0, result.output
+
+
+def test_write_if_changed(tmp_path):
+    path = str(tmp_path / "schema.py")
+    assert write_if_changed(path, "a = 1\n")
+
+    os.chmod(path, 0o640)
+    os.utime(path, ns=(0, 0))
+    assert not write_if_changed(path, "a = 1\n")
+    assert os.stat(path).st_mtime_ns == 0, "Unchanged files should not be touched"
+
+    assert write_if_changed(path, "a = 2\n")
+    with open(path) as f:
+        assert f.read() == "a = 2\n"
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    assert os.listdir(tmp_path) == ["schema.py"]
+
+
+def test_compile_bytecode(tmp_path, monkeypatch):
+    setup_local_project(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    project = load_projects_from_configpath("graphql.config.yaml")["nested_inputs"]
+    project.extensions.turms.compile_bytecode = "unchecked-hash"
+
+    generated_code, schema = generate(project)
+    generated_file = write_generation(project, generated_code, schema)
+
+    cfile = importlib.util.cache_from_source(generated_file)
+    with open(cfile, "rb") as f:
+        header = f.read(16)
+    assert header[:4] == importlib.util.MAGIC_NUMBER
+    assert int.from_bytes(header[4:8], "little") == 0b01
+
+    # An up to date .pyc is not compiled again
+    os.utime(cfile, ns=(0, 0))
+    write_generation(project, generated_code, schema)
+    assert os.stat(cfile).st_mtime_ns == 0
+
+    with open(generated_file, "a") as f:
+        f.write("\nCHANGED = True\n")
+    assert compile_bytecode(generated_file, "timestamp") == cfile
+    assert os.stat(cfile).st_mtime_ns != 0
+    with open(cfile, "rb") as f:
+        assert int.from_bytes(f.read(8)[4:8], "little") == 0
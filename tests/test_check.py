@@ -0,0 +1,71 @@
+import os
+import shutil
+
+from click.testing import CliRunner
+
+from turms import check
+from turms.check import check_documents
+from turms.cli.main import cli
+
+from .test_cache import setup_local_project
+from .utils import build_relative_glob
+
+
+def test_check_valid_documents(arkitekt_schema):
+    errors = check_documents(
+        arkitekt_schema, [build_relative_glob("/documents/arkitekt/**/*.graphql")]
+    )
+    assert errors == {}
+
+
+def test_check_valid_documents_in_pool(arkitekt_schema, monkeypatch):
+    monkeypatch.setattr(check, "SERIAL_THRESHOLD", 0)
+    errors = check_documents(
+        arkitekt_schema,
+        [build_relative_glob("/documents/arkitekt/**/*.graphql")],
+        max_workers=2,
+    )
+    assert errors == {}
+
+
+def test_check_uses_parse_cache_dir(arkitekt_schema, monkeypatch, tmp_path):
+    shutil.copytree(build_relative_glob("/documents/arkitekt"), tmp_path / "documents")
+    monkeypatch.setattr(check, "SERIAL_THRESHOLD", 0)
+    errors = check_documents(
+        arkitekt_schema,
+        [str(tmp_path / "documents" / "**" / "*.graphql")],
+        max_workers=2,
+        cache_dir=str(tmp_path / "cache"),
+    )
+    assert errors == {}
+    assert any(file.endswith(".pickle") for file in os.listdir(tmp_path / "cache"))
+
+
+def test_check_reports_errors_per_file(nested_input_schema, tmp_path):
+    syntax_error = tmp_path / "syntax.graphql"
+    syntax_error.write_text("query Broken {\n  nested(\n")
+
+    unknown_field = tmp_path / "unknown.graphql"
+    unknown_field.write_text("query Unknown {\n  thisWillError\n}\n")
+
+    errors = check_documents(nested_input_schema, [str(tmp_path / "*.graphql")])
+
+    assert set(errors.keys()) == {str(syntax_error), str(unknown_field)}
+    assert "Syntax Error" in errors[str(syntax_error)][0].message
+    assert errors[str(unknown_field)][0].locations[0].line == 2
+
+
+def test_check_cli(tmp_path, monkeypatch):
+    setup_local_project(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["check"])
+    assert result.exit_code == 0, result.output
+
+    with open(os.path.join("graphql", "nested_inputs", "error.graphql"), "w") as f:
+        f.write("query Unknown {\n  thisWillError\n}\n")
+
+    result = runner.invoke(cli, ["check"])
+    assert result.exit_code == 1
+    assert "error.graphql:2:3" in result.output
@@ -184,3 +184,62 @@ def test_run_no_error_code(tmp_path):
 
         result = runner.invoke(cli, ["gen"])
         assert result.exit_code == 0, result.output
+
+
+DOWNLOAD_CONFIG = """
+projects:
+  first:
+    schema: schema/nested_inputs.graphql
+    extensions: &extensions
+      turms: {}
+  second:
+    schema: schema/nested_inputs.graphql
+    extensions: *extensions
+  beasts:
+    schema: schema/beasts.graphql
+    extensions: *extensions
+  missing:
+    schema: schema/missing.graphql
+    extensions: *extensions
+"""
+
+
+def test_run_download_shared_schemas(tmp_path, monkeypatch):
+    import turms.run
+
+    runner = CliRunner()
+    built = []
+    build_schema = turms.run.build_schema_from_schema_type
+
+    def counting_build_schema(schema, **kwargs):
+        built.append(schema)
+        return build_schema(schema, **kwargs)
+
+    monkeypatch.setattr(
+        turms.run, "build_schema_from_schema_type", counting_build_schema
+    )
+
+    with runner.isolated_filesystem(temp_dir=tmp_path) as td:
+        with open(os.path.join(td, "graphql.config.yaml"), "w") as f:
+            f.write(DOWNLOAD_CONFIG)
+        os.mkdir(os.path.join(td, "schema"))
+        for name in ["nested_inputs", "beasts"]:
+            shutil.copyfile(
+                build_relative_glob(f"/schemas/{name}.graphql"),
+                os.path.join(td, "schema", f"{name}.graphql"),
+            )
+
+        result = runner.invoke(cli, ["download", "--workers", "2"])
+        assert result.exit_code == 1, result.output
+        assert "missing" in result.output
+
+        assert sorted(built) == sorted(
+            [
+                "schema/nested_inputs.graphql",
+                "schema/beasts.graphql",
+                "schema/missing.graphql",
+            ]
+        ), "Shared schemas should only be built once"
+        for name in ["first", "second", "beasts"]:
+            assert os.path.exists(os.path.join(td, f"{name}.schema.graphql"))
+        assert not os.path.exists(os.path.join(td, "missing.schema.graphql"))
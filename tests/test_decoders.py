@@ -0,0 +1,77 @@
+from turms.config import GeneratorConfig
+from turms.parsers.decoders import DecodersParser
+from turms.plugins.enums import EnumsPlugin
+from turms.plugins.fragments import FragmentsPlugin
+from turms.plugins.inputs import InputsPlugin
+from turms.plugins.operations import OperationsPlugin
+from turms.run import generate_ast
+from turms.stylers.capitalize import CapitalizeStyler
+from turms.stylers.snake_case import SnakeCaseStyler
+
+from .utils import build_relative_glob, unit_test_with
+
+
+def generate_with_decoders(config, schema):
+    generated_ast = generate_ast(
+        config,
+        schema,
+        stylers=[CapitalizeStyler(), SnakeCaseStyler()],
+        plugins=[EnumsPlugin(), InputsPlugin(), FragmentsPlugin(), OperationsPlugin()],
+    )
+    return DecodersParser().parse_ast(generated_ast)
+
+
+def test_decoders_on_unions(union_schema):
+    config = GeneratorConfig(
+        documents=build_relative_glob("/documents/unions/*.graphql"),
+    )
+
+    unit_test_with(
+        generate_with_decoders(config, union_schema),
+        """
+        responses = [
+            (Nana, decode_Nana, {"hallo": {"__typename": "Foo", "blip": "A", "forward": "yes"}}),
+            (Nana, decode_Nana, {"hallo": {"__typename": "Bar", "nana": 1}}),
+            (Nana, decode_Nana, {"hallo": None}),
+            (Nana2, decode_Nana2, {"hallo": {"__typename": "Baz", "bloop": "C"}}),
+            (Nana3, decode_Nana3, {"hallo": {"__typename": "Bar", "nana": 1}}),
+            (Nana4, decode_Nana4, {"hallo": {"__typename": "Bar", "nana": 1}}),
+        ]
+        for operation, decode, data in responses:
+            assert decode(data) == operation.model_validate(data), (data, decode(data))
+
+        assert isinstance(decode_Nana2({"hallo": {"__typename": "Baz", "bloop": "C"}}).hallo.bloop, TestEnum2)
+        """,
+    )
+
+
+def test_decoders_on_lists_and_interfaces(multi_interface_schema):
+    config = GeneratorConfig(
+        documents=build_relative_glob("/documents/multi_interface/**/*.graphql"),
+    )
+
+    unit_test_with(
+        generate_with_decoders(config, multi_interface_schema),
+        """
+        data = {"myflows": [{"__typename": "Flow", "id": "1", "name": "one"}, None]}
+        assert decode_MyFlows(data) == MyFlows.model_validate(data)
+        assert decode_MyFlows({"myflows": None}).myflows is None
+        """,
+    )
+
+
+def test_decoders_validate_custom_scalars(scalar_schema, tmp_path):
+    (tmp_path / "query.graphql").write_text("query GetScalar {\n  getScalar\n}\n")
+    config = GeneratorConfig(
+        documents=str(tmp_path / "*.graphql"),
+        scalar_definitions={"MyCustomScalar": "datetime.datetime"},
+    )
+
+    unit_test_with(
+        generate_with_decoders(config, scalar_schema),
+        """
+        import datetime
+        data = {"getScalar": "2024-01-01T00:00:00"}
+        assert decode_GetScalar(data).get_scalar == datetime.datetime(2024, 1, 1)
+        """,
+    )
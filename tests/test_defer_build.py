@@ -0,0 +1,82 @@
+import ast
+
+from .utils import build_relative_glob, unit_test_with
+from turms.config import GeneratorConfig
+from turms.run import generate_ast
+from turms.plugins.enums import EnumsPlugin
+from turms.plugins.inputs import InputsPlugin
+from turms.plugins.fragments import FragmentsPlugin
+from turms.plugins.operations import OperationsPlugin
+from turms.stylers.default import DefaultStyler
+
+
+ARKITEKT_SCALARS = {
+    "uuid": "str",
+    "Callback": "str",
+    "Any": "typing.Any",
+    "QString": "str",
+    "UUID": "pydantic.UUID4",
+}
+
+
+def test_defer_build(arkitekt_schema):
+    config = GeneratorConfig(
+        documents=build_relative_glob("/documents/arkitekt/**/*.graphql"),
+        scalar_definitions=ARKITEKT_SCALARS,
+        defer_build={"enabled": True},
+    )
+
+    generated_ast = generate_ast(
+        config,
+        arkitekt_schema,
+        stylers=[DefaultStyler()],
+        plugins=[EnumsPlugin(), InputsPlugin(), FragmentsPlugin(), OperationsPlugin()],
+    )
+
+    generated = ast.unparse(
+        ast.fix_missing_locations(ast.Module(body=generated_ast, type_ignores=[]))
+    )
+    assert "model_rebuild()" not in generated, "Deferred models should not be rebuilt"
+
+    unit_test_with(
+        generated_ast,
+        """
+        assert Get_template in DEFERRED_MODELS
+        assert Get_template.Arguments in DEFERRED_MODELS
+        assert not any(model.__pydantic_complete__ for model in DEFERRED_MODELS)
+
+        warmup([Get_template], background=False)
+        assert Get_template.__pydantic_complete__
+        assert not Get_template.Arguments.__pydantic_complete__
+
+        thread = warmup()
+        thread.join()
+        assert all(model.__pydantic_complete__ for model in DEFERRED_MODELS)
+        assert Get_template(template=None).template is None
+        """,
+    )
+
+
+def test_defer_build_additional_config(arkitekt_schema):
+    config = GeneratorConfig(
+        documents=build_relative_glob("/documents/arkitekt/**/*.graphql"),
+        scalar_definitions=ARKITEKT_SCALARS,
+        additional_config={"WidgetInput": {"defer_build": True}},
+    )
+
+    generated_ast = generate_ast(
+        config,
+        arkitekt_schema,
+        stylers=[DefaultStyler()],
+        plugins=[EnumsPlugin(), InputsPlugin(), FragmentsPlugin(), OperationsPlugin()],
+    )
+
+    unit_test_with(
+        generated_ast,
+        """
+        assert DEFERRED_MODELS == (WidgetInput,)
+        assert not WidgetInput.__pydantic_complete__
+        warmup(background=False)
+        assert WidgetInput.__pydantic_complete__
+        """,
+    )
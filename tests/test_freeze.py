@@ -35,3 +35,44 @@ def test_freeze_classes(countries_schema):
     generated = ast.unparse(ast.fix_missing_locations(md))
     unit_test_with(generated_ast, "x = Countries(countries=[])")
     assert "from enum import Enum" in generated, "EnumPlugin not working"
+
+
+ARKITEKT_SCALARS = {
+    "uuid": "str",
+    "Callback": "str",
+    "Any": "typing.Any",
+    "QString": "str",
+    "UUID": "pydantic.UUID4",
+}
+
+
+def test_freeze_cache_hash(arkitekt_schema):
+    config = GeneratorConfig(
+        documents=build_relative_glob("/documents/arkitekt/**/*.graphql"),
+        scalar_definitions=ARKITEKT_SCALARS,
+        freeze={"enabled": True, "cache_hash": True, "include": ["ReserveParamsInput"]},
+    )
+
+    generated_ast = generate_ast(
+        config,
+        arkitekt_schema,
+        stylers=[DefaultStyler()],
+        plugins=[EnumsPlugin(), InputsPlugin(), FragmentsPlugin(), OperationsPlugin()],
+    )
+
+    unit_test_with(
+        generated_ast,
+        """
+        a = ReserveParamsInput(agents=["a"])
+        b = ReserveParamsInput.model_validate({"agents": ["a"]})
+        assert a._cached_hash is None
+        assert a == b and hash(a) == hash(b)
+        assert a._cached_hash == hash(a)
+
+        c = a.model_copy(update={"agents": ("c",)})
+        assert c.agents == ("c",) and c != a and hash(c) != hash(a)
+        assert len({a, b, c}) == 2
+        assert a.model_dump(exclude_none=True) == {"agents": ("a",)}
+        assert "_cached_hash" not in WidgetInput.__private_attributes__
+        """,
+    )
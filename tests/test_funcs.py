@@ -234,3 +234,53 @@ def test_extra_args(beast_schema):
         generated_ast,
         "",
     )
+
+
+def test_serialize_variables(multi_interface_schema):
+    config = GeneratorConfig(
+        documents=build_relative_glob("/documents/multi_interface/**/*.graphql"),
+    )
+
+    generated_ast = generate_ast(
+        config,
+        multi_interface_schema,
+        stylers=[DefaultStyler()],
+        plugins=[
+            EnumsPlugin(),
+            InputsPlugin(),
+            FragmentsPlugin(),
+            OperationsPlugin(),
+            FuncsPlugin(
+                config=FuncsPluginConfig(
+                    serialize_variables=True,
+                    definitions=[
+                        FunctionDefinition(type="query", use="mocks.query"),
+                        FunctionDefinition(type="mutation", use="mocks.query"),
+                    ],
+                ),
+            ),
+        ],
+    )
+
+    unit_test_with(
+        generated_ast,
+        """
+        import json
+
+        variables = {
+            "name": "flow",
+            "nodes": [
+                NodeInput(id="1", type="arg", position=PositionInput(x=1, y=2), extra={"a": 1}),
+                None,
+            ],
+            "edges": None,
+        }
+        serialized = serialize_Draw_variables(variables)
+        expected = Draw.Arguments(**variables).model_dump(by_alias=True, mode="json")
+        del expected["edges"]
+        assert serialized == expected
+        assert json.loads(json.dumps(serialized)) == serialized
+
+        assert serialize_Get_flow_variables({"id": None}) == {}
+        """,
+    )
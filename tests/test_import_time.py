@@ -0,0 +1,62 @@
+import subprocess
+import sys
+
+import pytest
+from pydantic import ValidationError
+
+from turms.config import GeneratorConfig
+
+
+HEAVY_MODULES = {"graphql", "pydantic", "pydantic_settings", "black", "turms.run"}
+"""Modules that should only be imported by the commands that need them"""
+
+
+def import_times(statement: str):
+    """Runs the statement with -X importtime in a fresh interpreter and returns the
+    cumulative import time (in us) of every top level package and imported module"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # The header line
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_is_lazy():
+    times = import_times("import turms.cli.main")
+
+    assert "turms.cli.main" in times
+    heavy = HEAVY_MODULES & set(times)
+    assert not heavy, (
+        f"Importing the cli imports {heavy} "
+        f"(took {times['turms.cli.main'] / 1000:.0f}ms)"
+    )
+
+
+def test_config_does_not_import_plugins():
+    times = import_times(
+        "from turms.config import GeneratorConfig;"
+        "GeneratorConfig(plugins=[{'type': 'turms.plugins.funcs.FuncsPlugin'}],"
+        "processors=[{'type': 'turms.processors.black.BlackProcessor'}])"
+    )
+
+    assert "turms.plugins.funcs" not in times
+    assert "black" not in times
+
+
+def test_config_validates_plugin_modules():
+    with pytest.raises(ValidationError):
+        GeneratorConfig(plugins=[{"type": "turms.plugins.missing.MissingPlugin"}])
+
+    with pytest.raises(ValidationError):
+        GeneratorConfig(plugins=[{"type": "nonexisting_package.Plugin"}])
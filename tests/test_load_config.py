@@ -50,3 +50,30 @@ def test_load_multi_schemea_fields(multi_schema_field_config):
         projects = load_projects_from_configpath(config)
         print(projects)
         assert len(projects) == 1, "Should have at exactly one project"
+
+
+def test_load_projects_cache(tmp_path, monkeypatch):
+    config_path = tmp_path / "graphql.config.yaml"
+    config_path.write_text(
+        "schema: schema.graphql\nextensions:\n  turms:\n    out_dir: first\n"
+    )
+
+    first = load_projects_from_configpath(str(config_path))
+    first["default"].extensions.turms.documents = "changed/*.graphql"
+
+    # The cached projects are copied, so changes do not leak into later loads
+    second = load_projects_from_configpath(str(config_path))
+    assert second["default"].extensions.turms.documents is None
+    assert second["default"] is not first["default"]
+
+    monkeypatch.setenv("TURMS_DOMAIN", "example")
+    assert load_projects_from_configpath(str(config_path))[
+        "default"
+    ].extensions.turms.domain == "example"
+
+    config_path.write_text(
+        "schema: schema.graphql\nextensions:\n  turms:\n    out_dir: second\n"
+    )
+    assert load_projects_from_configpath(str(config_path))[
+        "default"
+    ].extensions.turms.out_dir == "second"
@@ -45,3 +45,74 @@ def test_extra_arguments(arkitekt_schema):
         generated_ast,
         "ReturnPortInput(child=ReturnPortInput(bound=BoundTypeInput.AGENT))",
     )
+
+
+def test_bytes_entry_points(multi_interface_schema):
+    config = GeneratorConfig(
+        documents=build_relative_glob("/documents/multi_interface/**/*.graphql"),
+    )
+
+    generated_ast = generate_ast(
+        config,
+        multi_interface_schema,
+        stylers=[DefaultStyler()],
+        plugins=[
+            EnumsPlugin(),
+            InputsPlugin(),
+            FragmentsPlugin(),
+            OperationsPlugin(
+                config=OperationsPluginConfig(bytes_entry_points=True)
+            ),
+        ],
+    )
+
+    unit_test_with(
+        generated_ast,
+        """
+        body = b'{"data": {"myflows": [{"__typename": "Flow", "id": "1", "name": "one"}]}}'
+        flows = MyFlows.from_response_bytes(body)
+        assert flows.myflows[0].id == "1"
+
+        try:
+            MyFlows.from_response_bytes('{"data": null, "errors": [{"message": "Denied"}]}')
+        except ValueError as error:
+            assert "Denied" in str(error)
+        else:
+            raise AssertionError("Expected a ValueError")
+        """,
+    )
+
+
+def test_streaming_lists(multi_interface_schema):
+    config = GeneratorConfig(
+        documents=build_relative_glob("/documents/multi_interface/**/*.graphql"),
+    )
+
+    generated_ast = generate_ast(
+        config,
+        multi_interface_schema,
+        stylers=[DefaultStyler()],
+        plugins=[
+            EnumsPlugin(),
+            InputsPlugin(),
+            FragmentsPlugin(),
+            OperationsPlugin(config=OperationsPluginConfig(streaming_lists=True)),
+        ],
+    )
+
+    unit_test_with(
+        generated_ast,
+        """
+        import json
+
+        flows = [{"__typename": "Flow", "id": str(i), "name": "flow"} for i in range(100)]
+        body = json.dumps({"errors": None, "data": {"myflows": flows + [None]}}).encode()
+        chunks = [body[i : i + 7] for i in range(0, len(body), 7)]
+
+        items = list(MyFlows.iter_myflows(chunks))
+        assert [item.id for item in items[:-1]] == [str(i) for i in range(100)]
+        assert items[-1] is None
+        assert list(MyFlows.iter_myflows(b'{"data": {"myflows": null}}')) == []
+        assert not hasattr(Flow, "iter_flow")
+        """,
+    )
@@ -0,0 +1,71 @@
+from .utils import build_relative_glob, unit_test_with
+from turms.config import GeneratorConfig
+from turms.run import generate_ast, parse_asts_to_string
+from turms.plugins.enums import EnumsPlugin
+from turms.plugins.inputs import InputsPlugin
+from turms.plugins.operations import OperationsPlugin, OperationsPluginConfig
+from turms.plugins.funcs import (
+    FuncsPlugin,
+    FuncsPluginConfig,
+    FunctionDefinition,
+)
+from turms.plugins.fragments import FragmentsPlugin
+from turms.stylers.default import DefaultStyler
+
+
+def generate_arkitekt(arkitekt_schema, parallel: bool):
+    config = GeneratorConfig(
+        documents=build_relative_glob("/documents/arkitekt/**/*.graphql"),
+        scalar_definitions={
+            "uuid": "str",
+            "Callback": "str",
+            "Any": "typing.Any",
+            "QString": "str",
+            "UUID": "pydantic.UUID4",
+        },
+    )
+
+    return generate_ast(
+        config,
+        arkitekt_schema,
+        stylers=[DefaultStyler()],
+        plugins=[
+            EnumsPlugin(),
+            InputsPlugin(),
+            FragmentsPlugin(),
+            OperationsPlugin(
+                config=OperationsPluginConfig(parallel=parallel, max_workers=2)
+            ),
+            FuncsPlugin(
+                config=FuncsPluginConfig(
+                    parallel=parallel,
+                    max_workers=2,
+                    definitions=[
+                        FunctionDefinition(
+                            type="query",
+                            use="mocks.query",
+                            is_async=False,
+                        ),
+                        FunctionDefinition(
+                            type="mutation",
+                            use="mocks.aquery",
+                            is_async=True,
+                        ),
+                        FunctionDefinition(
+                            type="subscription",
+                            use="mocks.asubscribe",
+                            is_async=True,
+                        ),
+                    ],
+                ),
+            ),
+        ],
+    )
+
+
+def test_parallel_generation_is_identical(arkitekt_schema):
+    serial = parse_asts_to_string(generate_arkitekt(arkitekt_schema, False))
+    parallel_ast = generate_arkitekt(arkitekt_schema, True)
+
+    assert parse_asts_to_string(parallel_ast) == serial
+    unit_test_with(parallel_ast, "")
@@ -0,0 +1,135 @@
+import glob
+import os
+
+import pytest
+from graphql import OperationDefinitionNode, parse, print_ast
+
+import turms.utils
+from turms.helpers import load_dsl_from_glob
+from turms.run import build_schema_from_schema_type
+from turms.utils import (
+    InvalidDocuments,
+    clear_document_cache,
+    parse_document_file_cached,
+    parse_documents,
+    parse_schema_glob,
+)
+
+from .utils import build_relative_glob
+
+
+def operation_names(document):
+    return sorted(
+        definition.name.value
+        for definition in document.definitions
+        if isinstance(definition, OperationDefinitionNode)
+    )
+
+
+def test_unchanged_documents_are_not_parsed_again(arkitekt_schema):
+    files = sorted(glob.glob(build_relative_glob("/documents/arkitekt/**/*.graphql")))
+
+    first = [parse_document_file_cached(file) for file in files]
+    second = [parse_document_file_cached(file) for file in files]
+
+    assert all(a is b for a, b in zip(first, second))
+
+
+def test_cached_documents_are_not_changed(nested_input_schema, tmp_path):
+    document = tmp_path / "query.graphql"
+    document.write_text("query Beasts {\n  beasts {\n    id\n  }\n}\n")
+
+    parsed = parse_documents(nested_input_schema, str(document))
+    assert "__typename" in print_ast(parsed)
+
+    # The typename is only added to the returned copy, not to the cached document
+    cached = parse_document_file_cached(str(document))
+    assert print_ast(cached) == print_ast(parse(document.read_text()))
+
+
+def test_changed_documents_are_parsed_again(nested_input_schema, tmp_path):
+    document = tmp_path / "query.graphql"
+    document.write_text("query First {\n  __typename\n}\n")
+    assert (
+        parse_document_file_cached(str(document)).definitions[0].name.value == "First"
+    )
+
+    document.write_text("query Second {\n  __typename\n}\n")
+    os.utime(document, ns=(0, 0))
+    assert (
+        parse_document_file_cached(str(document)).definitions[0].name.value == "Second"
+    )
+
+
+def test_syntax_errors_point_to_their_file(nested_input_schema, tmp_path):
+    (tmp_path / "valid.graphql").write_text("query Valid {\n  __typename\n}\n")
+    (tmp_path / "broken.graphql").write_text("query Broken {\n  nested(\n")
+
+    with pytest.raises(InvalidDocuments) as e:
+        parse_documents(nested_input_schema, str(tmp_path / "*.graphql"))
+
+    assert "broken.graphql:2:10" in str(e.value)
+
+
+def test_parse_cache_dir(arkitekt_schema, tmp_path):
+    glob = build_relative_glob("/documents/arkitekt/**/*.graphql")
+    cache_dir = str(tmp_path / "cache")
+
+    clear_document_cache()
+    parsed = parse_documents(arkitekt_schema, glob, cache_dir=cache_dir)
+    assert os.listdir(cache_dir)
+
+    clear_document_cache()
+    loaded = parse_documents(arkitekt_schema, glob, cache_dir=cache_dir)
+
+    assert operation_names(parsed) == operation_names(loaded)
+
+
+@pytest.mark.parametrize("planted", ["foreign", "unsigned"])
+def test_unverified_pickles_are_not_loaded(
+    planted, snapshot_key, tmp_path, monkeypatch
+):
+    document = tmp_path / "query.graphql"
+    document.write_text("query Beasts {\n  __typename\n}\n")
+    cache_dir = tmp_path / "cache"
+
+    clear_document_cache()
+    parse_document_file_cached(str(document), cache_dir=str(cache_dir))
+    (pickle_path,) = cache_dir.iterdir()
+
+    if planted == "foreign":
+        # Signed with the key of somebody else
+        snapshot_key.write_bytes(b"someone else")
+    else:
+        pickle_path.write_bytes(pickle_path.read_bytes().split(b"\n", 1)[1])
+
+    unpickled = []
+    monkeypatch.setattr(turms.utils.pickle, "loads", unpickled.append)
+
+    clear_document_cache()
+    loaded = parse_document_file_cached(str(document), cache_dir=str(cache_dir))
+
+    assert not unpickled
+    assert loaded.definitions[0].name.value == "Beasts"
+
+
+def test_modular_schema(tmp_path):
+    # The first file ends without a newline, which used to merge it with the next
+    (tmp_path / "a_scalars.graphql").write_text("scalar Date")
+    (tmp_path / "b_query.graphql").write_text("type Query {\n  today: Date\n}\n")
+    (tmp_path / "c_empty.graphql").write_text("")
+    glob = str(tmp_path / "*.graphql")
+
+    schema = build_schema_from_schema_type(glob)
+    assert schema.query_type.fields["today"].type.name == "Date"
+    assert "scalar Date\ntype Query" in load_dsl_from_glob(glob)
+
+    first = parse_schema_glob(glob)
+    second = parse_schema_glob(glob)
+    assert all(a is b for a, b in zip(first.definitions, second.definitions))
+
+    (tmp_path / "b_query.graphql").write_text("type Query {\n  yesterday: Date\n}\n")
+    os.utime(tmp_path / "b_query.graphql", ns=(0, 0))
+    changed = parse_schema_glob(glob)
+    assert changed.definitions[0] is first.definitions[0]
+    assert changed.definitions[1].fields[0].name.value == "yesterday"
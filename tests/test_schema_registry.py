@@ -0,0 +1,94 @@
+import os
+import shutil
+
+import turms.run
+from turms.run import (
+    SchemaRegistry,
+    gen,
+    get_schema_key,
+    load_projects_from_configpath,
+)
+
+from .utils import build_relative_glob
+
+
+SHARED_CONFIG = """
+projects:
+  first:
+    schema: schema/nested_inputs.graphql
+    documents: graphql/nested_inputs/*.graphql
+    extensions:
+      turms: &turms
+        out_dir: first
+        cache: True
+        dump_schema: True
+        plugins:
+          - type: turms.plugins.enums.EnumsPlugin
+          - type: turms.plugins.inputs.InputsPlugin
+          - type: turms.plugins.fragments.FragmentsPlugin
+          - type: turms.plugins.operations.OperationsPlugin
+  second:
+    schema: [schema/nested_inputs.graphql]
+    documents: graphql/nested_inputs/*.graphql
+    extensions:
+      turms:
+        <<: *turms
+        out_dir: second
+"""
+
+
+def test_schema_key():
+    assert get_schema_key("schema.graphql") == get_schema_key("schema.graphql")
+    assert get_schema_key("a.graphql") != get_schema_key("b.graphql")
+
+    projects = {
+        "first": {"http://localhost/graphql": {"headers": {"A": "1"}}},
+        "second": {"http://localhost/graphql": {"headers": {"A": "2"}}},
+    }
+    assert get_schema_key(projects["first"]) != get_schema_key(projects["second"])
+
+
+def test_shared_schema_is_built_once(tmp_path, monkeypatch):
+    os.mkdir(tmp_path / "schema")
+    shutil.copyfile(
+        build_relative_glob("/schemas/nested_inputs.graphql"),
+        tmp_path / "schema" / "nested_inputs.graphql",
+    )
+    shutil.copytree(
+        build_relative_glob("/documents/nested_inputs"),
+        tmp_path / "graphql" / "nested_inputs",
+    )
+    (tmp_path / "graphql.config.yaml").write_text(SHARED_CONFIG)
+    monkeypatch.chdir(tmp_path)
+
+    built, printed = [], []
+    build_schema = turms.run.build_schema_from_schema_type
+    print_schema = turms.run.print_schema
+
+    def counting_build_schema(schema, **kwargs):
+        built.append(schema)
+        return build_schema(schema, **kwargs)
+
+    def counting_print_schema(schema):
+        printed.append(schema)
+        return print_schema(schema)
+
+    monkeypatch.setattr(
+        turms.run, "build_schema_from_schema_type", counting_build_schema
+    )
+    monkeypatch.setattr(turms.run, "print_schema", counting_print_schema)
+
+    gen("graphql.config.yaml", strict=True)
+
+    # The second project lists the same schema, the list is unwrapped on build
+    assert built == ["schema/nested_inputs.graphql"]
+    assert len(printed) == 1, "The sdl should be printed once for hashes and dumps"
+    for out_dir in ["first", "second"]:
+        assert os.path.exists(os.path.join(out_dir, "schema.py"))
+        assert os.path.exists(os.path.join(out_dir, "schema.graphql"))
+
+    projects = load_projects_from_configpath("graphql.config.yaml")
+    schemas = SchemaRegistry()
+    assert schemas.get_schema(projects["first"].schema_url) is schemas.get_schema(
+        "schema/nested_inputs.graphql"
+    )
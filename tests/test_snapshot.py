@@ -0,0 +1,131 @@
+import os
+import shutil
+
+from click.testing import CliRunner
+from graphql import print_schema
+
+import turms.run
+import turms.snapshot
+from turms.cli.main import cli
+from turms.run import SchemaRegistry, build_schema_from_schema_type
+from turms.snapshot import SNAPSHOT_DIR, load_snapshot, write_snapshot
+
+from .utils import build_relative_glob
+
+
+def fail_to_build(*args, **kwargs):
+    raise AssertionError("The schema should have been loaded from the snapshot")
+
+
+def write_spacex_snapshot(tmp_path, monkeypatch):
+    shutil.copyfile(
+        build_relative_glob("/introspection/spacex.json"), tmp_path / "spacex.json"
+    )
+    monkeypatch.chdir(tmp_path)
+
+    schema = build_schema_from_schema_type("spacex.json", allow_introspection=True)
+    return schema, write_snapshot("spacex.json", schema)
+
+
+def test_introspection_snapshot(tmp_path, monkeypatch):
+    assert load_snapshot("spacex.json") is None
+    schema, path = write_spacex_snapshot(tmp_path, monkeypatch)
+    assert path
+
+    with monkeypatch.context() as m:
+        m.setattr(turms.run, "build_client_schema", fail_to_build)
+        loaded = build_schema_from_schema_type(
+            ["spacex.json"], snapshot_dir=SNAPSHOT_DIR
+        )
+        assert SchemaRegistry().get_schema("spacex.json", use_snapshots=True)
+
+    assert print_schema(loaded) == print_schema(schema)
+
+
+def test_snapshots_are_opt_in(tmp_path, monkeypatch):
+    write_spacex_snapshot(tmp_path, monkeypatch)
+
+    built = []
+    build_client_schema = turms.run.build_client_schema
+    monkeypatch.setattr(
+        turms.run,
+        "build_client_schema",
+        lambda *args: built.append(args) or build_client_schema(*args),
+    )
+
+    build_schema_from_schema_type("spacex.json", allow_introspection=True)
+    SchemaRegistry().get_schema("spacex.json", allow_introspection=True)
+    assert len(built) == 2
+
+
+def test_foreign_snapshots_are_not_unpickled(tmp_path, monkeypatch, snapshot_key):
+    _, path = write_spacex_snapshot(tmp_path, monkeypatch)
+    unpickled = []
+    monkeypatch.setattr(turms.snapshot.pickle, "loads", unpickled.append)
+
+    # Tampered with (e.g. a malicious pickle with a recomputed plain digest)
+    with open(path, "rb") as f:
+        content = f.read()
+    with open(path, "wb") as f:
+        f.write(content[:-2] + b"N.")
+    assert load_snapshot("spacex.json") is None
+
+    # Written by another user (with another key)
+    with open(path, "wb") as f:
+        f.write(content)
+    snapshot_key.write_bytes(b"another key")
+    assert load_snapshot("spacex.json") is None
+    assert unpickled == []
+
+
+def test_sdl_snapshot_is_invalidated(tmp_path, monkeypatch):
+    (tmp_path / "schema").mkdir()
+    (tmp_path / "schema" / "scalars.graphql").write_text(
+        "directive @unit(name: String) on FIELD_DEFINITION\nscalar Date\n"
+    )
+    (tmp_path / "schema" / "query.graphql").write_text(
+        'type Query {\n  today: Date\n  length: Int @unit(name: "m")\n}\n'
+    )
+    monkeypatch.chdir(tmp_path)
+
+    schema = build_schema_from_schema_type("schema/*.graphql")
+    write_snapshot("schema/*.graphql", schema)
+
+    with monkeypatch.context() as m:
+        m.setattr(turms.run, "build_ast_schema", fail_to_build)
+        loaded = build_schema_from_schema_type(
+            "schema/*.graphql", snapshot_dir=SNAPSHOT_DIR
+        )
+
+    # Ast nodes are kept (plugins read directives from them), without locations
+    field = loaded.query_type.fields["length"]
+    assert field.ast_node.directives[0].name.value == "unit"
+    assert field.ast_node.loc is None
+
+    (tmp_path / "schema" / "query.graphql").write_text(
+        "type Query {\n  yesterday: Date\n}\n"
+    )
+    assert load_snapshot("schema/*.graphql") is None
+    assert (
+        "yesterday"
+        in build_schema_from_schema_type("schema/*.graphql").query_type.fields
+    )
+
+
+def test_download_snapshot(tmp_path):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path) as td:
+        shutil.copyfile(
+            build_relative_glob("/configs/test_cli_local.yaml"),
+            os.path.join(td, "graphql.config.yaml"),
+        )
+        os.mkdir(os.path.join(td, "schema"))
+        shutil.copyfile(
+            build_relative_glob("/schemas/nested_inputs.graphql"),
+            os.path.join(td, "schema", "nested_inputs.graphql"),
+        )
+
+        result = runner.invoke(cli, ["download", "--snapshot"])
+        assert result.exit_code == 0, result.output
+        assert load_snapshot("schema/nested_inputs.graphql") is not None
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from turms import streaming
+from turms.helpers import load_introspection_from_file
+from turms.streaming import iter_json_list, load_json_stream
+
+from .utils import build_relative_glob
+
+
+DOCUMENT = {
+    "errors": None,
+    "extensions": {"skipped": [1, {"tricky": '}]\\"[{,'}]},
+    "data": {
+        "before": 1,
+        "items": [{"id": i, "value": 1.5e10, "text": "ä,]"} for i in range(50)]
+        + [12345, -0.25e-3, None, [], {}],
+        "after": 2,
+    },
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 20])
+def test_iter_json_list_chunks(chunk_size):
+    body = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+
+    assert list(iter_json_list(chunks, ("data", "items"))) == DOCUMENT["data"]["items"]
+
+
+def test_iter_json_list_null_and_errors():
+    assert list(iter_json_list(b'{"data": {"items": null}}', ("data", "items"))) == []
+    assert list(iter_json_list('{"data": {"items": [ ]}}', ("data", "items"))) == []
+
+    with pytest.raises(ValueError):
+        list(iter_json_list(b'{"data": null}', ("data", "items")))
+
+    with pytest.raises(KeyError):
+        list(iter_json_list(b'{"data": {"other": []}}', ("data", "items")))
+
+    with pytest.raises(ValueError):
+        list(iter_json_list(b'{"data": {"items": [1, 2', ("data", "items")))
+
+
+@pytest.mark.parametrize("split_depth", [0, 1, 3, 10])
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_load_json_stream(chunk_size, split_depth):
+    body = json.dumps(DOCUMENT, ensure_ascii=False, indent=2).encode()
+    body = b"\xef\xbb\xbf" + body + b"\n"
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+
+    assert load_json_stream(chunks, split_depth=split_depth) == DOCUMENT
+
+
+def test_load_json_stream_errors():
+    assert load_json_stream(" 12 ") == 12
+
+    with pytest.raises(ValueError):
+        load_json_stream([b'{"data": {"items": [1, 2'])
+
+    with pytest.raises(ValueError):
+        load_json_stream([b'{"data": 1}', b" {}"])
+
+    with pytest.raises(ValueError):
+        load_json_stream([b"   "])
+
+
+def test_values_spanning_many_chunks(monkeypatch):
+    calls = []
+
+    class CountingDecoder(streaming.JSONDecoder):
+        def raw_decode(self, s, idx=0):
+            calls.append(idx)
+            return super().raw_decode(s, idx)
+
+    monkeypatch.setattr(streaming, "JSONDecoder", CountingDecoder)
+
+    body = json.dumps({"data": {"items": ["x" * 100000]}}).encode()
+    chunks = [body[i : i + 10] for i in range(0, len(body), 10)]
+
+    assert list(iter_json_list(chunks, ("data", "items"))) == ["x" * 100000]
+    # The buffer grows geometrically before decoding again, instead of per chunk
+    assert len(calls) < 50
+
+
+def test_load_introspection_from_file():
+    path = build_relative_glob("/introspection/spacex.json")
+    with open(path, "rb") as f:
+        expected = json.loads(f.read())
+
+    assert load_introspection_from_file(path) == expected
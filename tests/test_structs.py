@@ -0,0 +1,119 @@
+import pytest
+
+from turms.config import GeneratorConfig
+from turms.parsers.structs import StructsParser
+from turms.plugins.enums import EnumsPlugin
+from turms.plugins.fragments import FragmentsPlugin
+from turms.plugins.funcs import FuncsPlugin, FuncsPluginConfig, FunctionDefinition
+from turms.plugins.inputs import InputsPlugin
+from turms.plugins.operations import OperationsPlugin
+from turms.run import generate_ast
+from turms.stylers.capitalize import CapitalizeStyler
+from turms.stylers.snake_case import SnakeCaseStyler
+
+from .utils import build_relative_glob, unit_test_with
+
+# The generated code depends on msgspec, turms itself does not
+pytest.importorskip("msgspec")
+
+
+def generate_structs(config, schema, plugins=None):
+    generated_ast = generate_ast(
+        config,
+        schema,
+        stylers=[CapitalizeStyler(), SnakeCaseStyler()],
+        plugins=plugins
+        or [EnumsPlugin(), InputsPlugin(), FragmentsPlugin(), OperationsPlugin()],
+    )
+    return StructsParser().parse_ast(generated_ast)
+
+
+def test_structs_on_unions(union_schema):
+    config = GeneratorConfig(
+        documents=build_relative_glob("/documents/unions/*.graphql"),
+    )
+
+    unit_test_with(
+        generate_structs(config, union_schema),
+        """
+        import msgspec
+        nana = msgspec.convert({"hallo": {"__typename": "Foo", "blip": "A", "forward": "yes"}}, Nana)
+        assert isinstance(nana.hallo, NanaFooInlineFragment)
+        assert nana.hallo.blip == TestEnum1.A
+        assert msgspec.convert({"hallo": {"__typename": "Bar", "nana": 1}}, Nana4).hallo.nana == 1
+        assert isinstance(msgspec.convert({"hallo": {"__typename": "Baz", "bloop": "C"}}, Nana3).hallo, VeryNestedFragmentBaz)
+        """,
+    )
+
+
+def test_structs_with_aliases_and_funcs(multi_interface_schema):
+    config = GeneratorConfig(
+        documents=build_relative_glob("/documents/multi_interface/**/*.graphql"),
+    )
+
+    unit_test_with(
+        generate_structs(
+            config,
+            multi_interface_schema,
+            plugins=[
+                EnumsPlugin(),
+                InputsPlugin(),
+                FragmentsPlugin(),
+                OperationsPlugin(),
+                FuncsPlugin(
+                    config=FuncsPluginConfig(
+                        definitions=[
+                            FunctionDefinition(type="query", use="mocks.query"),
+                            FunctionDefinition(type="mutation", use="mocks.query"),
+                        ]
+                    )
+                ),
+            ],
+        ),
+        """
+        import msgspec
+        edge = msgspec.convert({"id": "1", "type": "x", "source": "a", "target": "b", "sourceHandle": "c", "targetHandle": "d"}, EdgeInput)
+        assert edge.source_handle == "c"
+        assert msgspec.to_builtins(edge)["sourceHandle"] == "c"
+        assert msgspec.convert({"myflows": [{"__typename": "Flow", "id": "1", "name": "one"}, None]}, MyFlows).myflows[0].id == "1"
+        """,
+    )
+
+
+def test_structs_with_funcs_on_unions(union_schema, tmp_path):
+    # Without the query on inline fragments (Nana), whose function is not
+    # generated correctly for pydantic models either
+    document = open(build_relative_glob("/documents/unions/test.graphql")).read()
+    (tmp_path / "test.graphql").write_text(document[document.index("query Nana2") :])
+    config = GeneratorConfig(documents=str(tmp_path / "*.graphql"))
+
+    unit_test_with(
+        generate_structs(
+            config,
+            union_schema,
+            plugins=[
+                EnumsPlugin(),
+                InputsPlugin(),
+                FragmentsPlugin(),
+                OperationsPlugin(),
+                FuncsPlugin(
+                    config=FuncsPluginConfig(
+                        definitions=[
+                            FunctionDefinition(type="query", use="mocks.convert_query"),
+                        ]
+                    )
+                ),
+            ],
+        ),
+        """
+        import mocks
+        mocks.MOCKED_RESPONSES["Nana2"] = {"hallo": {"__typename": "Baz", "bloop": "C"}}
+        mocks.MOCKED_RESPONSES["Nana4"] = {"hallo": {"__typename": "Bar", "nana": 1}}
+        hallo = nana2()
+        assert isinstance(hallo, BazFragmentBaz)
+        assert hallo.typename == "Baz"
+        assert hallo.bloop == TestEnum2.C
+        assert isinstance(nana4(), DelegatingFragmentBar)
+        assert nana4().nana == 1
+        """,
+    )
@@ -0,0 +1,161 @@
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from graphql import build_schema, get_introspection_query, graphql_sync
+
+from turms.config import AdvancedSchemaField
+from turms.errors import GenerationError
+from turms.run import build_schema_from_schema_type
+from turms.transport import RequestsTransport, Transport, set_default_transport
+
+from .utils import build_relative_glob
+
+
+with open(build_relative_glob("/schemas/nested_inputs.graphql"), "rb") as f:
+    SDL = f.read()
+
+
+class SchemaHandler(BaseHTTPRequestHandler):
+    """Serves the nested inputs schema gzipped, flaky, slow or by introspection"""
+
+    requests = []
+
+    def respond(self, status: int, body: bytes = b"", headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.requests.append((self.path, dict(self.headers)))
+
+        if self.path == "/schema.graphql":
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                self.respond(200, gzip.compress(SDL), {"Content-Encoding": "gzip"})
+            else:
+                self.respond(200, SDL)
+        elif self.path == "/flaky":
+            failed = sum(1 for path, _ in self.requests if path == "/flaky")
+            self.respond(503 if failed <= 2 else 200, SDL)
+        elif self.path == "/slow":
+            time.sleep(1)
+            self.respond(200, SDL)
+        elif self.path == "/private":
+            self.respond(200 if self.headers.get("X-Token") == "secret" else 401, SDL)
+        else:
+            self.respond(405)
+
+    def do_POST(self):
+        self.requests.append((self.path, dict(self.headers)))
+        query = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        result = graphql_sync(build_schema(SDL.decode()), query["query"])
+        self.respond(200, json.dumps({"data": result.data}).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    SchemaHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SchemaHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_compressed_schema(server_url):
+    schema = build_schema_from_schema_type(f"{server_url}/schema.graphql")
+    assert schema.get_type("NestedInput")
+
+    _, headers = SchemaHandler.requests[0]
+    assert "gzip" in headers["Accept-Encoding"]
+
+
+def test_headers(server_url):
+    field = AdvancedSchemaField(headers={"X-Token": "secret"}, retries=0)
+    schema = build_schema_from_schema_type({f"{server_url}/private": field})
+    assert schema.get_type("NestedInput")
+
+    with pytest.raises(GenerationError):
+        build_schema_from_schema_type(
+            {f"{server_url}/private": AdvancedSchemaField(retries=0)}
+        )
+
+
+def test_retries(server_url):
+    with pytest.raises(GenerationError):
+        build_schema_from_schema_type(
+            {f"{server_url}/flaky": AdvancedSchemaField(retries=1, backoff=0)}
+        )
+
+    # The third request succeeds
+    schema = build_schema_from_schema_type(
+        {f"{server_url}/flaky": AdvancedSchemaField(retries=1, backoff=0)}
+    )
+    assert schema.get_type("NestedInput")
+
+
+def test_timeout(server_url):
+    start = time.monotonic()
+    with pytest.raises(GenerationError):
+        build_schema_from_schema_type(
+            {f"{server_url}/slow": AdvancedSchemaField(timeout=0.1, retries=0)}
+        )
+    assert time.monotonic() - start < 1
+
+
+def test_introspection_fallback(server_url):
+    transport = RequestsTransport(chunk_size=1024)
+    schema = build_schema_from_schema_type(
+        f"{server_url}/graphql", allow_introspection=True, transport=transport
+    )
+    transport.close()
+
+    assert schema.get_type("NestedInput")
+    assert [path for path, _ in SchemaHandler.requests] == ["/graphql", "/graphql"]
+
+
+class FakeTransport(Transport):
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, url, headers=None, data=None, **options):
+        self.requests.append((method, url, options))
+        return iter([SDL[:10], SDL[10:]])
+
+
+def test_replace_default_transport():
+    transport = FakeTransport()
+    set_default_transport(transport)
+    try:
+        schema = build_schema_from_schema_type(
+            {"http://schema.invalid/graphql": AdvancedSchemaField(timeout=5)}
+        )
+    finally:
+        set_default_transport(None)
+
+    assert schema.get_type("NestedInput")
+    assert transport.requests == [
+        (
+            "GET",
+            "http://schema.invalid/graphql",
+            {"timeout": 5, "retries": 2, "backoff": 0.5},
+        )
+    ]
+
+
+def test_incomplete_transport():
+    class IncompleteTransport(Transport):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteTransport()
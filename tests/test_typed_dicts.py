@@ -0,0 +1,60 @@
+import ast
+
+from turms.config import GeneratorConfig
+from turms.parsers.typed_dicts import TypedDictsParser
+from turms.plugins.enums import EnumsPlugin
+from turms.plugins.fragments import FragmentsPlugin
+from turms.plugins.funcs import FuncsPlugin, FuncsPluginConfig, FunctionDefinition
+from turms.plugins.inputs import InputsPlugin
+from turms.plugins.operations import OperationsPlugin
+from turms.run import generate_ast
+from turms.stylers.capitalize import CapitalizeStyler
+from turms.stylers.snake_case import SnakeCaseStyler
+
+from .utils import build_relative_glob, unit_test_with
+
+
+def test_typed_dicts_with_funcs(multi_interface_schema):
+    config = GeneratorConfig(
+        documents=build_relative_glob("/documents/multi_interface/**/*.graphql"),
+    )
+    generated_ast = generate_ast(
+        config,
+        multi_interface_schema,
+        stylers=[CapitalizeStyler(), SnakeCaseStyler()],
+        plugins=[
+            EnumsPlugin(),
+            InputsPlugin(),
+            FragmentsPlugin(),
+            OperationsPlugin(),
+            FuncsPlugin(
+                config=FuncsPluginConfig(
+                    definitions=[
+                        FunctionDefinition(type="query", use="mocks.query"),
+                        FunctionDefinition(
+                            type="mutation", use="mocks.aquery", is_async=True
+                        ),
+                    ]
+                )
+            ),
+        ],
+    )
+
+    parsed_ast = TypedDictsParser().parse_ast(generated_ast)
+    assert not any(
+        isinstance(node, ast.ImportFrom) and node.module == "pydantic"
+        for node in parsed_ast
+    )
+
+    unit_test_with(
+        parsed_ast,
+        """
+        assert ListFlow.__required_keys__ == {"__typename", "id"}
+        assert EdgeInput.__optional_keys__ == {"sourceHandle", "targetHandle", "label"}
+        assert MyFlows.Meta.document.startswith("fragment ListFlow")
+
+        response = {"myflows": [{"__typename": "Flow", "id": "1", "name": "one"}]}
+        query = lambda operation, variables: response
+        assert my_flows() is response["myflows"]
+        """,
+    )
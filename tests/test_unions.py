@@ -78,3 +78,73 @@ def test_fields_in_inline_fragment_on_union(union_schema):
 
     
 
+
+
+def test_discriminated_unions(union_schema):
+    config = GeneratorConfig(
+        documents=build_relative_glob("/documents/unions/*.graphql"),
+        discriminate_unions=True,
+    )
+    generated_ast = generate_ast(
+        config,
+        union_schema,
+        stylers=[CapitalizeStyler(), SnakeCaseStyler()],
+        plugins=[EnumsPlugin(), InputsPlugin(), FragmentsPlugin(), OperationsPlugin()],
+    )
+
+    unit_test_with(
+        generated_ast,
+        """
+        import pydantic
+        assert Nana(hallo={'__typename': 'Foo', 'blip': 'A', 'forward': 'yes'}).hallo.blip == 'A'
+        assert Nana(hallo={'__typename': 'Bar', 'nana': 1}).hallo.nana == 1
+        assert Nana3(hallo={'__typename': 'Baz', 'bloop': 'C'}).hallo.bloop == 'C'
+        assert Nana4(hallo={'__typename': 'Bar', 'nana': 1}).hallo.nana == 1
+        try:
+            Nana(hallo={'__typename': 'Baz', 'bloop': 'C'})
+            raise AssertionError("Baz is not a member of the union")
+        except pydantic.ValidationError as e:
+            assert e.errors()[0]["type"] == "union_tag_invalid"
+        """,
+    )
+
+
+def test_discriminated_unions_with_union_fragment(union_schema, tmp_path):
+    (tmp_path / "mixed.graphql").write_text(
+        """
+        fragment BazFragment on Element {
+          ... on Baz {
+            bloop
+          }
+        }
+
+        query Mixed {
+          hallo {
+            ...BazFragment
+            ... on Bar {
+              nana
+            }
+          }
+        }
+        """
+    )
+    config = GeneratorConfig(
+        documents=str(tmp_path / "*.graphql"),
+        discriminate_unions=True,
+    )
+    generated_ast = generate_ast(
+        config,
+        union_schema,
+        stylers=[CapitalizeStyler(), SnakeCaseStyler()],
+        plugins=[EnumsPlugin(), InputsPlugin(), FragmentsPlugin(), OperationsPlugin()],
+    )
+
+    # The fragment is a union over all members, which overlaps with the inline
+    # fragment on Bar, so the selection is not discriminated
+    unit_test_with(
+        generated_ast,
+        """
+        assert Mixed(hallo={'__typename': 'Baz', 'bloop': 'C'}).hallo.bloop == 'C'
+        assert Mixed(hallo={'__typename': 'Bar', 'nana': 1}).hallo.typename == 'Bar'
+        """,
+    )
@@ -0,0 +1,127 @@
+import glob
+import os
+
+from graphql import parse, validate
+
+from turms import validation
+from turms.validation import clear_validation_cache, validate_incrementally
+
+from .utils import build_relative_glob
+
+
+def read_documents(glob_path):
+    return "\n".join(
+        open(file).read() for file in sorted(glob.glob(glob_path, recursive=True))
+    )
+
+
+def count_validations(monkeypatch):
+    calls = []
+    original = validation.validate
+
+    def counting_validate(*args, **kwargs):
+        calls.append(args[1])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(validation, "validate", counting_validate)
+    return calls
+
+
+def test_same_errors_as_validate(arkitekt_schema):
+    document = parse(
+        read_documents(build_relative_glob("/documents/arkitekt/**/*.graphql"))
+        + "\nquery Faulty {\n  thisWillError\n}\nfragment Unused on Node {\n  id\n}\n"
+    )
+    clear_validation_cache()
+
+    expected = sorted(e.message for e in validate(arkitekt_schema, document))
+    assert expected
+    assert (
+        sorted(e.message for e in validate_incrementally(arkitekt_schema, document))
+        == expected
+    )
+
+
+def test_unreachable_fragments_are_unused(nested_input_schema):
+    # B is only spread by the unused fragment A, so both are unused
+    document = parse(
+        "query Q {\n  __typename\n}\n"
+        "fragment A on Query {\n  ...B\n}\n"
+        "fragment B on Query {\n  __typename\n}\n"
+    )
+    clear_validation_cache()
+
+    expected = sorted(e.message for e in validate(nested_input_schema, document))
+    assert expected == ["Fragment 'A' is never used.", "Fragment 'B' is never used."]
+    assert (
+        sorted(e.message for e in validate_incrementally(nested_input_schema, document))
+        == expected
+    )
+
+
+def test_only_changed_definitions_are_validated(nested_input_schema, monkeypatch):
+    clear_validation_cache()
+    calls = count_validations(monkeypatch)
+
+    first = "query A {\n  __typename\n}\nquery B {\n  __typename\n}\n"
+    assert validate_incrementally(nested_input_schema, parse(first)) == []
+    assert len(calls) == 2
+
+    changed = "query A {\n  __typename\n}\nquery B {\n  __typename \n}\n"
+    assert validate_incrementally(nested_input_schema, parse(changed)) == []
+    assert len(calls) == 3
+
+
+def test_changed_fragments_revalidate_dependents(arkitekt_schema, monkeypatch):
+    clear_validation_cache()
+    calls = count_validations(monkeypatch)
+
+    operation = "query A {\n  nodes {\n    ...N\n  }\n}\n"
+    validate_incrementally(
+        arkitekt_schema, parse(operation + "fragment N on Node {\n  id\n}\n")
+    )
+    assert len(calls) == 2
+
+    errors = validate_incrementally(
+        arkitekt_schema, parse(operation + "fragment N on Node {\n  idx\n}\n")
+    )
+    assert len(calls) == 4
+    assert len(errors) == 1
+
+
+def test_valid_keys_are_persisted(nested_input_schema, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path)
+    document = parse("query A {\n  __typename\n}\n")
+
+    clear_validation_cache()
+    validate_incrementally(nested_input_schema, document, cache_dir=cache_dir)
+    assert os.path.exists(os.path.join(cache_dir, validation.VALIDATION_CACHE_NAME))
+
+    clear_validation_cache()
+    calls = count_validations(monkeypatch)
+    assert (
+        validate_incrementally(nested_input_schema, document, cache_dir=cache_dir) == []
+    )
+    assert calls == []
+
+
+def test_unsigned_valid_keys_are_ignored(
+    nested_input_schema, tmp_path, snapshot_key, monkeypatch
+):
+    cache_dir = str(tmp_path)
+    document = parse("query A {\n  __typename\n}\n")
+
+    clear_validation_cache()
+    validate_incrementally(nested_input_schema, document, cache_dir=cache_dir)
+
+    # Signed with the key of somebody else
+    snapshot_key.write_bytes(b"someone else")
+
+    clear_validation_cache()
+    assert validation._load_valid_keys(cache_dir) == set()
+
+    calls = count_validations(monkeypatch)
+    assert (
+        validate_incrementally(nested_input_schema, document, cache_dir=cache_dir) == []
+    )
+    assert len(calls) == 1
@@ -0,0 +1,184 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from graphql import (
+    DocumentNode,
+    FragmentDefinitionNode,
+    GraphQLError,
+    GraphQLSchema,
+    validate,
+)
+
+from turms.utils import parse_document_file_cached
+from turms.validation import (
+    FILE_RULES,
+    check_global_rules,
+    error_key,
+    resolve_fragment_dependencies,
+)
+
+SERIAL_THRESHOLD = 64
+"""Below this amount of files, the files are checked without a process pool"""
+
+
+FileErrors = Dict[str, List[GraphQLError]]
+
+
+_worker_state = {}
+
+
+def _initialize_worker(client_schema: GraphQLSchema, cache_dir: Optional[str] = None):
+    _worker_state["client_schema"] = client_schema
+    _worker_state["cache_dir"] = cache_dir
+
+
+def _parse_file(file: str) -> Tuple[str, Optional[DocumentNode], List[GraphQLError]]:
+    try:
+        document = parse_document_file_cached(file, _worker_state["cache_dir"])
+        return file, document, []
+    except GraphQLError as error:
+        return file, None, [error]
+
+
+def _validate_file(item: Tuple[str, DocumentNode]) -> Tuple[str, List[GraphQLError]]:
+    file, document = item
+    return file, validate(_worker_state["client_schema"], document, FILE_RULES)
+
+
+def get_error_file(error: GraphQLError, default: str) -> str:
+    """Returns the file an error occured in (fragments of other files keep their file)"""
+    if error.source and error.source.name:
+        return error.source.name
+    return default
+
+
+def check_files(
+    client_schema: GraphQLSchema,
+    files: Iterable[str],
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+) -> FileErrors:
+    """Validates document files against a schema, one file at a time
+
+    Every file is parsed on its own, so that syntax errors only affect their own
+    file. Each file is then validated together with the fragments it spreads
+    from other files. Rules that need to see every document (unique names,
+    unused fragments) are checked once over all files. Above `SERIAL_THRESHOLD`
+    files, parsing and validation are sharded by file in a process pool. Files are
+    parsed through the document cache (see `parse_document_file_cached`).
+
+    Args:
+        client_schema (GraphQLSchema): The schema to validate against
+        files (Iterable[str]): The document files
+        max_workers (Optional[int], optional): The maximum amount of processes. Defaults to the cpu count.
+        cache_dir (Optional[str], optional): The directory for parsed documents. Defaults to None.
+
+    Returns:
+        FileErrors: The errors (with locations) for every file that has errors
+    """
+    files = sorted(set(files))
+    use_pool = len(files) > SERIAL_THRESHOLD and max_workers != 1
+
+    if use_pool:
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(files) // (workers * 4))
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialize_worker,
+            initargs=(client_schema, cache_dir),
+        )
+
+        def map_function(function, items):
+            return executor.map(function, items, chunksize=chunksize)
+
+    else:
+        executor = None
+        _initialize_worker(client_schema, cache_dir)
+        map_function = map
+
+    errors: FileErrors = {}
+    documents: Dict[str, DocumentNode] = {}
+
+    def add_errors(file, file_errors):
+        for error in file_errors:
+            errors.setdefault(get_error_file(error, file), []).append(error)
+
+    try:
+        for file, document, file_errors in map_function(_parse_file, files):
+            add_errors(file, file_errors)
+            if document is not None:
+                documents[file] = document
+
+        add_errors(
+            None,
+            check_global_rules(
+                definition
+                for document in documents.values()
+                for definition in document.definitions
+            ),
+        )
+
+        fragments = {}
+        for document in documents.values():
+            for definition in document.definitions:
+                if isinstance(definition, FragmentDefinitionNode):
+                    fragments.setdefault(definition.name.value, definition)
+
+        items = [
+            (
+                file,
+                DocumentNode(
+                    definitions=tuple(document.definitions)
+                    + tuple(resolve_fragment_dependencies(document, fragments))
+                ),
+            )
+            for file, document in documents.items()
+        ]
+
+        for file, file_errors in map_function(_validate_file, items):
+            add_errors(file, file_errors)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Errors in fragments are reported once, even if the fragment is used in many files
+    deduplicated: FileErrors = {}
+    for file in sorted(errors, key=str):
+        seen = set()
+        for error in errors[file]:
+            key = error_key(error)
+            if key not in seen:
+                seen.add(key)
+                deduplicated.setdefault(file, []).append(error)
+
+    return deduplicated
+
+
+def check_documents(
+    client_schema: GraphQLSchema,
+    scan_globs: Iterable[str],
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+) -> FileErrors:
+    """Validates all documents matched by the globs against the schema,
+    using the same validation rules as `parse_documents`"""
+    files = set()
+    for scan_glob in scan_globs:
+        files.update(glob.glob(scan_glob, recursive=True))
+
+    return check_files(
+        client_schema, files, max_workers=max_workers, cache_dir=cache_dir
+    )
+
+
+def format_error(error: GraphQLError, file: Optional[str]) -> str:
+    """Formats an error as `file:line:column: message`"""
+    locations = error.locations or []
+    if locations:
+        return "\n".join(
+            f"{file}:{location.line}:{location.column}: {error.message}"
+            for location in locations
+        )
+    return f"{file}: {error.message}"
@@ -1,23 +1,15 @@
 from enum import Enum
 import os
-from typing import Dict
-from turms.config import GraphQLProject
-from turms.run import generate, write_code_to_file, write_project, write_schema_to_file
+from typing import TYPE_CHECKING, Dict, List
 from rich import get_console
-from rich.panel import Panel
-from rich.live import Live
-from rich.tree import Tree
-from rich.console import Group
 import rich_click as click
-from turms.run import (
-    scan_folder_for_single_config,
-    load_projects_from_configpath,
-    build_schema_from_schema_type,
-)
-from .watch import stream_changes
-from graphql import print_schema
 from functools import wraps
 
+# The generator (graphql, pydantic, the plugins) and most of rich are only imported
+# within the commands that need them, so that `turms --help` and `turms init` start fast
+if TYPE_CHECKING:
+    from turms.config import GraphQLProject
+
 click.rich_click.USE_RICH_MARKUP = True
 
 directory = os.getcwd()
@@ -28,6 +20,7 @@ class TurmsOptions(str, Enum):
     INIT = "init"
     DOWNLOAD = "download"
     WATCH = "watch"
+    CHECK = "check"
 
 
 logo = """
@@ -65,7 +58,13 @@ projects:
 """
 
 
-def generate_projects(projects: Dict[str, GraphQLProject], title="Turms"):
+def generate_projects(projects: Dict[str, "GraphQLProject"], title="Turms"):
+    from rich.console import Group
+    from rich.live import Live
+    from rich.panel import Panel
+    from rich.tree import Tree
+    from turms.run import SchemaRegistry, generate, write_generation
+
     generation_message = f"Generating the {'.'.join(projects.keys())} projects. This may take a while...\n"
 
     tree = Tree("Generating projects", style="bold green")
@@ -80,6 +79,7 @@ def generate_projects(projects: Dict[str, GraphQLProject], title="Turms"):
     )
 
     raised_exceptions = []
+    schemas = SchemaRegistry()
 
     with Live(panel, screen=False) as live:
         for key, project in projects.items():
@@ -92,22 +92,12 @@ def generate_projects(projects: Dict[str, GraphQLProject], title="Turms"):
                     project_tree.add(Tree(message, style="yellow"))
 
             try:
-                generated_code, schema = generate(project, log=log)
+                generated_code, schema = generate(project, log=log, schemas=schemas)
 
                 project_tree.label = f"{key} ✔️"
                 live.update(panel)
 
-                write_code_to_file(
-                    generated_code,
-                    project.extensions.turms.out_dir,
-                    project.extensions.turms.generated_name,
-                )
-
-                if project.extensions.turms.dump_schema:
-                    write_schema_to_file(schema, project.extensions.turms.out_dir, project.extensions.turms.schema_name)
-
-                if project.extensions.turms.dump_configuration:
-                    write_project(project, project.extensions.turms.out_dir, project.extensions.turms.configuration_name)
+                write_generation(project, generated_code, schema, schemas=schemas)
 
             except Exception as e:
                 project_tree.style = "red"
@@ -130,11 +120,210 @@ def generate_projects(projects: Dict[str, GraphQLProject], title="Turms"):
         ) from raised_exceptions[0]
 
 
+def check_projects(projects: Dict[str, "GraphQLProject"], title="Turms"):
+    from rich.live import Live
+    from rich.panel import Panel
+    from rich.tree import Tree
+    from turms.run import SchemaRegistry, is_up_to_date
+
+    tree = Tree("Checking projects", style="bold green")
+
+    panel = Panel(
+        tree,
+        title=title,
+        title_align="left",
+        border_style="green",
+        padding=(1, 1),
+    )
+
+    stale_projects = []
+    schemas = SchemaRegistry()
+
+    with Live(panel, screen=False) as live:
+        for key, project in projects.items():
+            project_tree = Tree(f"{key}", style="not bold white")
+            tree.add(project_tree)
+            live.update(panel)
+
+            def log(message, level):
+                if level == "WARN":
+                    project_tree.add(Tree(message, style="yellow"))
+
+            try:
+                up_to_date = is_up_to_date(project, log=log, schemas=schemas)
+            except Exception as e:
+                up_to_date = False
+                project_tree.add(Tree(str(e), style="red"))
+
+            if up_to_date:
+                project_tree.label = f"{key} ✔️ up to date"
+            else:
+                project_tree.style = "red"
+                project_tree.label = f"{key} 💥 stale"
+                stale_projects.append(key)
+
+            live.update(panel)
+
+    if stale_projects:
+        raise click.ClickException(
+            f"Generated code is stale for: {', '.join(stale_projects)}. Run `turms gen` to update it."
+        )
+
+
+def validate_projects(
+    projects: Dict[str, "GraphQLProject"],
+    schema_path: str = None,
+    max_workers: int = None,
+):
+    """Validates the documents of the projects, printing errors per file"""
+    from graphql import build_schema
+    from turms.check import check_documents, format_error
+    from turms.run import SchemaRegistry, get_document_globs
+
+    error_count = 0
+    schemas = SchemaRegistry()
+
+    for key, project in projects.items():
+        gen_config = project.extensions.turms
+
+        if schema_path:
+            with open(schema_path, "r") as f:
+                schema = build_schema(f.read())
+        else:
+            schema = schemas.get_schema(
+                project.schema_url,
+                allow_introspection=gen_config.allow_introspection,
+                use_snapshots=gen_config.use_snapshots,
+            )
+
+        errors = check_documents(
+            schema,
+            [glob for glob in get_document_globs(gen_config, project) if glob],
+            max_workers=max_workers,
+            cache_dir=gen_config.parse_cache_dir,
+        )
+
+        for file, file_errors in errors.items():
+            for error in file_errors:
+                get_console().print(format_error(error, file), style="red", highlight=False)
+                error_count += 1
+
+        if not errors:
+            get_console().print(f"{key} ✔️ documents are valid", style="green")
+
+    if error_count:
+        raise click.ClickException(f"Found {error_count} invalid document(s)")
+
+
+def download_projects(
+    projects: Dict[str, "GraphQLProject"],
+    directory: str,
+    out: str = ".schema.graphql",
+    max_workers: int = None,
+    snapshot: bool = False,
+    title="Turms",
+):
+    """Downloads the schemas of the projects concurrently (sharing one connection pool),
+    fetching projects that point to the same schema (and headers) only once. With
+    `snapshot`, a snapshot of every local schema is written as well."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from graphql import print_schema
+    from rich.live import Live
+    from rich.panel import Panel
+    from rich.tree import Tree
+    from turms.errors import GenerationError
+    from turms.run import (
+        build_schema_from_schema_type,
+        get_schema_key,
+        write_if_changed,
+    )
+    from turms.snapshot import write_snapshot
+    from turms.transport import RequestsTransport
+
+    shared: Dict[str, List[str]] = {}
+    for key, project in projects.items():
+        shared.setdefault(get_schema_key(project.schema_url), []).append(key)
+
+    max_workers = max_workers or min(8, len(shared)) or 1
+
+    try:
+        transport = RequestsTransport(pool_maxsize=max_workers)
+    except GenerationError:  # pragma: no cover
+        transport = None  # The loaders will raise a proper error for urls
+
+    tree = Tree("Downloading schemas", style="bold green")
+    panel = Panel(
+        tree,
+        title=title,
+        title_align="left",
+        border_style="green",
+        padding=(1, 1),
+    )
+    project_trees = {}
+    for key in projects:
+        project_trees[key] = tree.add(f"{key}", style="not bold white")
+
+    failed_projects = []
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, Live(
+            panel, screen=False
+        ) as live:
+            futures = {
+                executor.submit(
+                    build_schema_from_schema_type,
+                    projects[keys[0]].schema_url,
+                    allow_introspection=True,
+                    transport=transport,
+                ): keys
+                for keys in shared.values()
+            }
+
+            for future in as_completed(futures):
+                keys = futures[future]
+                try:
+                    schema = future.result()
+                    sdl = print_schema(schema)
+                    for key in keys:
+                        filename = os.path.join(directory, f"{key}{out}")
+                        write_if_changed(filename, sdl)
+                        project_trees[key].label = f"{key} ✔️ {filename}"
+
+                    if snapshot:
+                        path = write_snapshot(projects[keys[0]].schema_url, schema)
+                        for key in keys:
+                            project_trees[key].add(
+                                f"Snapshot: {path}"
+                                if path
+                                else "No snapshot (not a local schema)"
+                            )
+                except Exception as e:
+                    for key in keys:
+                        project_trees[key].style = "red"
+                        project_trees[key].label = f"{key} 💥"
+                        project_trees[key].add(Tree(str(e), style="red"))
+                        failed_projects.append(key)
+                live.update(panel)
+    finally:
+        if transport is not None:
+            transport.close()
+
+    if failed_projects:
+        raise click.ClickException(
+            f"Failed to download the schema for: {', '.join(failed_projects)}"
+        )
+
+
 def with_projects(func):
     @click.argument("project", default=None, required=False)
     @click.option("--config", default=None)
     @wraps(func)
     def wrapper(*args, config=None, project=None, **kwargs):
+        from turms.run import (
+            load_projects_from_configpath,
+            scan_folder_for_single_config,
+        )
+
         try:
             app_directory = os.getcwd()
             config = config or scan_folder_for_single_config(app_directory)
@@ -165,6 +354,12 @@ def with_projects(func):
 
 
 def watch_projects(projects, title="Turms"):  # pragma: no cover
+    from rich.console import Group
+    from rich.live import Live
+    from rich.panel import Panel
+    from turms.run import generate, write_generation
+    from .watch import stream_changes
+
     if len(projects) > 1:
         raise click.ClickException(
             "Watching multiple projects is not supported. Please specify a single project!"
@@ -202,11 +397,7 @@ def watch_projects(projects, title="Turms"):  # pragma: no cover
                     project,
                 )
 
-                write_code_to_file(
-                    generated_code,
-                    project.extensions.turms.out_dir,
-                    project.extensions.turms.generated_name,
-                )
+                write_generation(project, generated_code, schema)
 
                 tree.renderable = "Generation Successfull"
                 tree.border_style = "green"
@@ -236,6 +427,8 @@ def cli(ctx):
 @click.option("--config", default="graphql.config.yaml", help="The config file to use")
 def init(config):
     """Initialize a new graphql project"""
+    from rich.panel import Panel
+
     welcome_panel = Panel(logo + welcome, title="turms", border_style="bold green")
 
     get_console().print(welcome_panel)
@@ -256,9 +449,36 @@ def init(config):
 
 @cli.command()
 @with_projects
-def gen(projects):
+@click.option(
+    "--check",
+    is_flag=True,
+    default=False,
+    help="Only check if the generated code is up to date (exits with 1 if it is stale) without writing anything",
+)
+def gen(projects, check):
     """Generate the graphql project"""
-    generate_projects(projects)
+    if check:
+        check_projects(projects)
+    else:
+        generate_projects(projects)
+
+
+@cli.command()
+@with_projects
+@click.option(
+    "--schema",
+    default=None,
+    help="Validate against this sdl file instead of loading the project schema",
+)
+@click.option(
+    "--workers",
+    default=None,
+    type=int,
+    help="The maximum amount of processes used to parse and validate the documents",
+)
+def check(projects, schema, workers):
+    """Validate the documents of the graphql project without generating code"""
+    validate_projects(projects, schema_path=schema, max_workers=workers)
 
 
 @cli.command()
@@ -280,23 +500,27 @@ def watch(projects):  # pragma: no cover
     default=None,
     help="The output directory for the schema files (will default to the current working directory)",
 )
-def download(projects, out, dir):
+@click.option(
+    "--workers",
+    default=None,
+    type=int,
+    help="The maximum amount of schemas that are downloaded concurrently",
+)
+@click.option(
+    "--snapshot",
+    is_flag=True,
+    default=False,
+    help="Also write a snapshot of every local schema, which is loaded instead of building the schema as long as its files do not change",
+)
+def download(projects, out, dir, workers, snapshot):
     """Download the graphql projects schema as a sdl file"""
-
-    try:
-        app_directory = dir or os.getcwd()
-        for key, project in projects.items():
-            filename = f"{key}{out}"
-            get_console().print(
-                f"Downloading schema for project {key} to {app_directory}/{filename}"
-            )
-            schema = build_schema_from_schema_type(
-                project.schema_url, allow_introspection=True
-            )
-            with open(os.path.join(app_directory, filename), "w") as f:
-                f.write(print_schema(schema))
-    except Exception as e:
-        raise click.ClickException(str(e)) from e
+    download_projects(
+        projects,
+        dir or os.getcwd(),
+        out=out,
+        max_workers=workers,
+        snapshot=snapshot,
+    )
 
 
 if __name__ == "__main__":
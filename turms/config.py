@@ -21,7 +21,8 @@ from typing import (
     Literal,
     runtime_checkable,
 )
-from turms.helpers import import_string
+from turms.helpers import check_importable, import_string
+from turms.transport import DEFAULT_BACKOFF, DEFAULT_RETRIES, DEFAULT_TIMEOUT
 from enum import Enum
 
 
@@ -134,6 +135,50 @@ class FreezeConfig(BaseSettings):
         True, description="Convert GraphQL List to tuple (with varying length"
     )
     """Convert GraphQL List to tuple (with varying length)"""
+    cache_hash: bool = Field(
+        False, description="Cache the hash of frozen models and compare them by hash first"
+    )
+    """Generate a `__hash__` that is computed once per instance and an `__eq__` that
+    short-circuits on identity and on differing cached hashes (pydantic v2)"""
+
+
+class DeferBuildConfig(BaseSettings):
+    """Configuration for deferring the building of the pydantic schemas
+    of the generated models
+
+    Models with `defer_build` only build their validators when they are first
+    used, which reduces the import time of the generated module. A `warmup`
+    function is generated, that builds the deferred models ahead of time
+    (by default in a background thread), e.g. once a service has started.
+
+    """
+
+    enabled: bool = Field(False, description="Enabling this, will defer building the models")
+    """Enabling this, will defer building the models"""
+
+    types: List[GraphQLTypes] = Field(
+        [
+            GraphQLTypes.INPUT,
+            GraphQLTypes.FRAGMENT,
+            GraphQLTypes.OBJECT,
+            GraphQLTypes.QUERY,
+            GraphQLTypes.MUTATION,
+            GraphQLTypes.SUBSCRIPTION,
+        ],
+        description="The types to defer",
+    )
+    """The core types (Input, Fragment, Object, Operation) to defer"""
+
+    exclude: Optional[List[str]] = Field(
+        None, description="List of types to exclude from deferring"
+    )
+    """List of types to exclude from deferring"""
+    include: Optional[List[str]] = Field(
+        None, description="List of types to include in deferring"
+    )
+    """The types to defer"""
+    warmup: bool = Field(True, description="Generate a warmup function")
+    """Generate a warmup function, that builds the deferred models"""
 
 
 ExtraOptions = Optional[Union[Literal["ignore"], Literal["allow"], Literal["forbid"]]]
@@ -183,6 +228,7 @@ class OptionsConfig(BaseSettings):
 
 
 PydanticVersion = Literal["v1", "v2"]
+BytecodeMode = Literal["timestamp", "checked-hash", "unchecked-hash"]
 
 
 class GeneratorConfig(BaseSettings):
@@ -212,6 +258,16 @@ class GeneratorConfig(BaseSettings):
     schema_name: str = "schema.graphql"
     generated_name: str = "schema.py"
     """ The name of the generated file within the output directory"""
+    cache: bool = False
+    """Store a hash of all generation inputs next to the generated file and skip the generation if they did not change"""
+    hash_name: Optional[str] = None
+    """The name of the file storing the generation hash within the output directory. Defaults to `.<generated_name>.hash`"""
+    parse_cache_dir: Optional[str] = None
+    """A directory to store parsed documents (as pickles) and validation results in, so that unchanged documents are not parsed or validated again across runs"""
+    use_snapshots: bool = False
+    """Load local schemas from the snapshots written by `turms download --snapshot` (only snapshots signed with the key of the current user are loaded)"""
+    compile_bytecode: Optional[BytecodeMode] = None
+    """Compile the generated module to its .pyc (in __pycache__) right after writing it, so that the first import does not compile it. `unchecked-hash` pycs stay valid if the mtime of the module changes (e.g. in container images)"""
     documents: Optional[str] = None
     """The documents to parse. Setting this will overwrite the documents in the graphql config"""
     verbose: bool = False
@@ -232,6 +288,8 @@ class GeneratorConfig(BaseSettings):
     """Always resolve interfaces to concrete types"""
     exclude_typenames: bool = False
     """Exclude __typename from generated models when calling dict or json"""
+    discriminate_unions: bool = False
+    """Annotate unions with a discriminator on the typename field, so that pydantic picks the member by its __typename instead of trying every member"""
 
     scalar_definitions: Dict[str, PythonType] = Field(
         default_factory=dict,
@@ -244,6 +302,12 @@ class GeneratorConfig(BaseSettings):
     )
     """Configuration for freezing the generated models: by default disabled"""
 
+    defer_build: DeferBuildConfig = Field(
+        default_factory=DeferBuildConfig,
+        description="Configuration for deferring the building of the generated models",
+    )
+    """Configuration for deferring the building of the generated models (pydantic v2): by default disabled"""
+
     options: OptionsConfig = Field(
         default_factory=OptionsConfig,
         description="Configuration for pydantic options",
@@ -291,9 +355,10 @@ class GeneratorConfig(BaseSettings):
 
     @field_validator("parsers", "plugins", "processors", "stylers")
     def validate_importable(cls, v):
+        # Only check that the modules exist, they are imported when instantiated
         try:
             for parser in v:
-                import_string(parser.type)
+                check_importable(parser.type)
         except Exception as e:
             raise ValueError(f"Invalid import: {parser.type} {e}") from e
 
@@ -321,7 +386,14 @@ class Extensions(BaseModel):
 
 
 class AdvancedSchemaField(BaseModel):
-    headers: Dict[str, str]
+    headers: Dict[str, str] = Field(default_factory=dict)
+    "Additional headers for the requests to this schema url"
+    timeout: Optional[float] = DEFAULT_TIMEOUT
+    "Seconds to wait for a connection or for data (None waits forever)"
+    retries: int = DEFAULT_RETRIES
+    "How often a failed request (connection errors, timeouts, 429 and 5xx) is retried"
+    backoff: float = DEFAULT_BACKOFF
+    "Seconds to wait before the first retry, doubled for every further retry"
 
 
 SchemaField = Union[AnyHttpUrl, str, Dict[str, AdvancedSchemaField]]
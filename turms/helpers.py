@@ -1,15 +1,14 @@
 import json
 from importlib import import_module
+from importlib.util import find_spec
 from typing import Any, Dict, Optional, Tuple
 import glob
 from pydantic import AnyHttpUrl
 from turms.errors import GenerationError
-
-from graphql import (
-    get_introspection_query,
-)
+from turms.transport import Transport, get_default_transport
 
 IntrospectionResult = Dict[str, Any]
+READ_BLOCK_SIZE = 256 * 1024
 DSLString = str
 
 
@@ -19,6 +18,27 @@ def import_class(module_path, class_name):
     return getattr(module, class_name)
 
 
+def check_importable(dotted_path):
+    """
+    Check that the module of a dotted path can be found, without importing it.
+    Raise ImportError if it can't. The attribute itself is only resolved (and the
+    module imported) by `import_string`, e.g. when a plugin is instantiated.
+    """
+
+    try:
+        module_path, _ = dotted_path.rsplit(".", 1)
+    except ValueError as err:
+        raise ImportError(f"{dotted_path} doesn't look like a module path") from err
+
+    try:
+        spec = find_spec(module_path)
+    except (ImportError, ValueError) as err:
+        raise ImportError(f"No module named {module_path}") from err
+
+    if spec is None:
+        raise ImportError(f"No module named {module_path}")
+
+
 def import_string(dotted_path):
     """
     Import a dotted module path and return the attribute/class designated by the
@@ -39,14 +59,23 @@ def import_string(dotted_path):
         ) from err
 
 
+def is_url(url: str) -> bool:
+    return url.startswith("http") or url.startswith("https")
+
+
 def load_introspection_from_url(
-    url: AnyHttpUrl, headers: Optional[Dict[str, str]] = None
+    url: AnyHttpUrl,
+    headers: Optional[Dict[str, str]] = None,
+    transport: Optional[Transport] = None,
+    **options,
 ) -> IntrospectionResult:
     """Introspect a GraphQL schema using introspection query
 
     Args:
         schema_url (str): The Schema url
-        bearer_token (str, optional): A Bearer token. Defaults to None.
+        headers (Dict[str, str], optional): Additional headers. Defaults to None.
+        transport (Transport, optional): The transport to send the request with. Defaults to the default transport.
+        **options: The timeout, retries and backoff of the request (see `Transport.request`)
 
     Raises:
         GenerationError: An error occurred while generating the schema.
@@ -54,22 +83,20 @@ def load_introspection_from_url(
     Returns:
         dict: The introspection query response.
     """
-    try:  # pragma: no cover
-        import requests  # pragma: no cover
-    except ImportError:  # pragma: no cover
-        raise GenerationError(
-            "The requests library is required to introspect a schema from a url"
-        )  # pragma: no cover
+    from graphql import get_introspection_query
+    from turms.streaming import load_json_stream
 
     jdata = json.dumps({"query": get_introspection_query()}).encode("utf-8")
     default_headers = {"Content-Type": "application/json", "Accept": "application/json"}
     if headers:
         default_headers.update(headers)
     try:
-        req = requests.post(url, data=jdata, headers=default_headers)
-        x = req.json()
-    except Exception:
-        raise GenerationError(f"Failed to fetch schema from {url}")
+        chunks = (transport or get_default_transport()).request(
+            "POST", url, headers=default_headers, data=jdata, **options
+        )
+        x = load_json_stream(chunks, split_depth=4)
+    except Exception as e:
+        raise GenerationError(f"Failed to fetch schema from {url}") from e
     if "errors" in x:  # pragma: no cover
         raise GenerationError(
             f"Failed to fetch schema from {url} Graphql error: {x['errors']}"
@@ -83,22 +110,19 @@ def load_introspection_from_url(
     return x["data"]
 
 
-def load_dsl_from_url(url: AnyHttpUrl, headers: Dict[str, str] = None) -> DSLString:
-    try:  # pragma: no cover
-        import requests  # pragma: no cover
-    except ImportError:  # pragma: no cover
-        raise GenerationError(
-            "The requests library is required to introspect a schema from a url"
-        )  # pragma: no cover
-
-    default_headers = {}
-    if headers:
-        default_headers.update(headers)
+def load_dsl_from_url(
+    url: AnyHttpUrl,
+    headers: Dict[str, str] = None,
+    transport: Optional[Transport] = None,
+    **options,
+) -> DSLString:
+    """Load a GraphQL DSL from a url (see `load_introspection_from_url` for the arguments)"""
     try:
-        req = requests.get(url, headers=default_headers)
-        assert req.status_code == 200, "Incorrect status code"
-        assert req.content, "No content"
-        x = req.content.decode()
+        chunks = (transport or get_default_transport()).request(
+            "GET", url, headers=headers, **options
+        )
+        x = b"".join(chunks).decode("utf-8-sig")
+        assert x, "No content"
     except Exception as e:
         raise GenerationError(f"Failed to fetch schema from {url}") from e
     return x
@@ -111,9 +135,12 @@ def load_dsl_from_file(file_path: str) -> DSLString:
 
 
 def load_introspection_from_file(file_path: str) -> IntrospectionResult:
-    """Load a GraphQL introspection file and return its content as a string"""
+    """Load a GraphQL introspection file, decoding it while it is read in blocks
+    (see `load_json_stream`), as introspection results can be huge"""
+    from turms.streaming import load_json_stream
+
     with open(file_path, "rb") as f:
-        return json.loads(f.read().decode("utf-8-sig"))
+        return load_json_stream(iter(lambda: f.read(READ_BLOCK_SIZE), b""))
 
 
 ParseResult = Tuple[Optional[DSLString], Optional[IntrospectionResult]]
@@ -128,11 +155,8 @@ def load_dsl_from_glob(
     if len(schema_glob) == 0:
         raise GenerationError(f"No files found for glob string {glob_string}")
 
-    dsl_string = ""
-    for file in schema_glob:
-        dsl_string += load_dsl_from_file(file)
-
-    return dsl_string
+    # Files are separated, as a definition might end at the very end of a file
+    return "\n".join(load_dsl_from_file(file) for file in schema_glob)
 
 
 def load_introspection_from_glob(
@@ -0,0 +1,82 @@
+import ast
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from graphql.utilities.build_client_schema import GraphQLSchema
+
+from turms.config import GeneratorConfig
+from turms.registry import ClassRegistry, RegistryAdditions
+
+DefinitionGenerator = Callable[
+    [Any, GraphQLSchema, GeneratorConfig, Any, ClassRegistry], List[ast.AST]
+]
+"""A module level function that generates the ast for one definition, with the
+same signature as e.g. `turms.plugins.operations.generate_operation`"""
+
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _initialize_worker(
+    generator: DefinitionGenerator,
+    client_schema: GraphQLSchema,
+    config: GeneratorConfig,
+    plugin_config: Any,
+    registry: ClassRegistry,
+):
+    _worker_state["generator"] = generator
+    _worker_state["args"] = (client_schema, config, plugin_config)
+    _worker_state["registry"] = registry
+
+
+def _generate_in_worker(definition: Any) -> Tuple[List[ast.AST], RegistryAdditions]:
+    registry = _worker_state["registry"].fork()
+    tree = _worker_state["generator"](definition, *_worker_state["args"], registry)
+    return tree, registry.additions()
+
+
+def generate_in_pool(
+    generator: DefinitionGenerator,
+    definitions: Sequence[Any],
+    client_schema: GraphQLSchema,
+    config: GeneratorConfig,
+    plugin_config: Any,
+    registry: ClassRegistry,
+    max_workers: Optional[int] = None,
+) -> List[ast.AST]:
+    """Generates the ast for independent definitions in a process pool
+
+    Every worker receives a fork of the registry once. Each definition is then
+    generated against a fresh fork of that registry, and the resulting subtrees
+    as well as the imports, builtins and forward references that were registered
+    along the way are merged back in the order of `definitions`. Classnames that
+    need to be shared between definitions have to be registered before calling
+    this function.
+
+    Args:
+        generator (DefinitionGenerator): The module level function generating one definition
+        definitions (Sequence[Any]): The definitions to generate (need to be picklable)
+        client_schema (GraphQLSchema): The schema
+        config (GeneratorConfig): The generator config
+        plugin_config (Any): The config of the calling plugin
+        registry (ClassRegistry): The registry to merge the results into
+        max_workers (Optional[int], optional): The maximum amount of processes. Defaults to None.
+
+    Returns:
+        List[ast.AST]: The generated ast (in the order of the definitions)
+    """
+    tree = []
+
+    if not definitions:
+        return tree
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_initialize_worker,
+        initargs=(generator, client_schema, config, plugin_config, registry.fork()),
+    ) as executor:
+        for subtree, additions in executor.map(_generate_in_worker, definitions):
+            tree += subtree
+            registry.merge(additions)
+
+    return tree
@@ -0,0 +1,456 @@
+from turms.parsers.base import Parser, ParserConfig
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import ast
+from pydantic_settings import SettingsConfigDict
+from pydantic import Field
+
+
+PASSTHROUGH_TYPES = {"str", "int", "float", "bool", "Any", "Dict", "dict", "Literal"}
+"""Annotations that are trusted as they come from the json response"""
+
+LIST_TYPES = {"List", "list", "Sequence", "Tuple", "tuple"}
+
+
+class DecodersParserConfig(ParserConfig):
+    model_config = SettingsConfigDict(env_prefix="TURMS_PARSERS_DECODERS_")
+    type: str = "turms.parsers.decoders.DecodersParser"
+    prefix: str = "decode_"
+    """The prefix of the generated decode functions (followed by the class name)"""
+
+
+def is_enum_class(node: ast.ClassDef) -> bool:
+    return any(
+        isinstance(base, ast.Name) and base.id in ("Enum", "StrEnum")
+        for base in node.bases
+    )
+
+
+def is_operation_class(node: ast.ClassDef) -> bool:
+    """Operations are the classes with a nested Meta class holding their document"""
+    for sub_node in iter_body(node.body):
+        if isinstance(sub_node, ast.ClassDef) and sub_node.name == "Meta":
+            return any(
+                isinstance(meta_node, ast.Assign)
+                and any(
+                    isinstance(target, ast.Name) and target.id == "document"
+                    for target in meta_node.targets
+                )
+                for meta_node in iter_body(sub_node.body)
+            )
+    return False
+
+
+def iter_body(body: List) -> Iterator[ast.AST]:
+    """Flattens a class body (plugins may nest lists of statements)"""
+    for node in body:
+        if isinstance(node, list):
+            yield from iter_body(node)
+        else:
+            yield node
+
+
+def unwrap_forward_reference(annotation: ast.AST) -> ast.AST:
+    if isinstance(annotation, ast.Constant) and isinstance(annotation.value, str):
+        return ast.parse(annotation.value, mode="eval").body
+    return annotation
+
+
+def get_subscript_elements(annotation: ast.Subscript) -> List[ast.AST]:
+    if isinstance(annotation.slice, ast.Tuple):
+        return list(annotation.slice.elts)
+    return [annotation.slice]
+
+
+def get_field_key_and_default(field: ast.AnnAssign):
+    """Returns the response key of a field and the ast of its default (None if required)"""
+    key = field.target.id
+    default = None
+
+    if (
+        isinstance(field.value, ast.Call)
+        and getattr(field.value.func, "id", None) == "Field"
+    ):
+        for keyword in field.value.keywords:
+            if keyword.arg == "alias" and isinstance(keyword.value, ast.Constant):
+                key = keyword.value.value
+            if keyword.arg == "default" and isinstance(keyword.value, ast.Constant):
+                default = keyword.value
+    elif isinstance(field.value, ast.Constant):
+        default = field.value
+
+    return key, default
+
+
+class DecoderBuilder:
+    """Builds straight-line decode functions for the model classes of a module"""
+
+    def __init__(self, asts: List[ast.AST], config: DecodersParserConfig):
+        self.config = config
+        self.classes: Dict[str, ast.ClassDef] = {}
+        self.aliases: Dict[str, ast.AST] = {}
+        self.enums: Set[str] = set()
+
+        for node in asts:
+            if isinstance(node, ast.ClassDef):
+                self.classes[node.name] = node
+                if is_enum_class(node):
+                    self.enums.add(node.name)
+            if (
+                isinstance(node, ast.Assign)
+                and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and isinstance(node.value, ast.Subscript)
+            ):
+                self.aliases[node.targets[0].id] = node.value
+
+        self.pending: List[str] = []
+        self.decoded: Set[str] = set()
+        self.unions: Dict[tuple, Tuple[str, Optional[str]]] = {}
+        self.adapters: Dict[str, str] = {}
+        self.helpers: List[ast.AST] = []
+
+    def function_name(self, class_name: str) -> str:
+        return f"{self.config.prefix}{class_name}"
+
+    def is_model(self, name: str) -> bool:
+        return name in self.classes and name not in self.enums
+
+    def get_fields(self, class_name: str) -> Dict[str, ast.AnnAssign]:
+        """Collects the fields of a class, including the fields of its (generated) bases"""
+        node = self.classes[class_name]
+        fields = {}
+
+        for base in reversed(node.bases):
+            if (
+                isinstance(base, ast.Name)
+                and self.is_model(base.id)
+                and base.id != class_name
+            ):
+                fields.update(self.get_fields(base.id))
+
+        for sub_node in iter_body(node.body):
+            if isinstance(sub_node, ast.AnnAssign) and isinstance(
+                sub_node.target, ast.Name
+            ):
+                fields[sub_node.target.id] = sub_node
+
+        return fields
+
+    def get_typename(self, class_name: str) -> Optional[str]:
+        """Returns the literal typename of a class, None for catch all classes"""
+        field = self.get_fields(class_name).get("typename")
+        if field is None:
+            return None
+        annotation = field.annotation
+        if (
+            isinstance(annotation, ast.Subscript)
+            and getattr(annotation.value, "id", None) == "Literal"
+            and isinstance(annotation.slice, ast.Constant)
+        ):
+            return annotation.slice.value
+        return None
+
+    def resolve_union_members(self, annotation: ast.AST) -> Optional[List[str]]:
+        """Returns the model classes of a union, or None if it is not a union of models"""
+        annotation = unwrap_forward_reference(annotation)
+
+        if isinstance(annotation, ast.Name):
+            if annotation.id in self.aliases:
+                return self.resolve_union_members(self.aliases[annotation.id])
+            if self.is_model(annotation.id):
+                return [annotation.id]
+            return None
+
+        if isinstance(annotation, ast.Subscript):
+            wrapper = getattr(annotation.value, "id", None)
+            elements = get_subscript_elements(annotation)
+            if wrapper == "Annotated":
+                return self.resolve_union_members(elements[0])
+            if wrapper == "Union":
+                members = []
+                for element in elements:
+                    resolved = self.resolve_union_members(element)
+                    if resolved is None:
+                        return None
+                    members += resolved
+                return members
+
+        return None
+
+    def reference_decoder(self, class_name: str) -> ast.Name:
+        if class_name not in self.decoded:
+            self.decoded.add(class_name)
+            self.pending.append(class_name)
+        return ast.Name(id=self.function_name(class_name), ctx=ast.Load())
+
+    def reference_union(self, members: List[str]) -> Tuple[str, Optional[str]]:
+        """Returns a lookup of decoders by typename and the catch all class (if any)"""
+        key = tuple(members)
+        if key not in self.unions:
+            name = f"_{self.config.prefix}union_{len(self.unions)}"
+
+            keys, values = [], []
+            catch = None
+            for member in members:
+                typename = self.get_typename(member)
+                if typename is None:
+                    catch = member
+                    continue
+                keys.append(ast.Constant(value=typename))
+                values.append(self.reference_decoder(member))
+
+            self.helpers.append(
+                ast.Assign(
+                    targets=[ast.Name(id=name, ctx=ast.Store())],
+                    value=ast.Dict(keys=keys, values=values),
+                )
+            )
+            self.unions[key] = (name, catch)
+
+        return self.unions[key]
+
+    def reference_adapter(self, annotation: ast.AST) -> ast.Name:
+        """Falls back to validating values of unknown types (e.g. custom scalars)"""
+        source = ast.unparse(annotation)
+        if source not in self.adapters:
+            name = f"_{self.config.prefix}adapter_{len(self.adapters)}"
+            self.adapters[source] = name
+            self.helpers.append(
+                ast.Assign(
+                    targets=[ast.Name(id=name, ctx=ast.Store())],
+                    value=ast.Attribute(
+                        value=ast.Call(
+                            func=ast.Name(id="TypeAdapter", ctx=ast.Load()),
+                            args=[annotation],
+                            keywords=[],
+                        ),
+                        attr="validate_python",
+                        ctx=ast.Load(),
+                    ),
+                )
+            )
+        return ast.Name(id=self.adapters[source], ctx=ast.Load())
+
+    def decode_value(
+        self, annotation: ast.AST, value: ast.AST, depth: int = 0
+    ) -> ast.AST:
+        """Builds the expression decoding the value according to the annotation"""
+        annotation = unwrap_forward_reference(annotation)
+
+        if isinstance(annotation, ast.Name):
+            if annotation.id in PASSTHROUGH_TYPES:
+                return value
+            if annotation.id in self.enums:
+                return ast.Call(func=annotation, args=[value], keywords=[])
+            if annotation.id in self.aliases:
+                return self.decode_value(self.aliases[annotation.id], value, depth)
+            if self.is_model(annotation.id):
+                return ast.Call(
+                    func=self.reference_decoder(annotation.id),
+                    args=[value],
+                    keywords=[],
+                )
+
+        if isinstance(annotation, ast.Subscript):
+            wrapper = getattr(annotation.value, "id", None)
+            elements = get_subscript_elements(annotation)
+
+            if wrapper in PASSTHROUGH_TYPES:
+                return value
+
+            if wrapper == "Optional":
+                return ast.IfExp(
+                    test=ast.Compare(
+                        left=value, ops=[ast.Is()], comparators=[ast.Constant(None)]
+                    ),
+                    body=ast.Constant(None),
+                    orelse=self.decode_value(elements[0], value, depth),
+                )
+
+            if wrapper == "Annotated":
+                return self.decode_value(elements[0], value, depth)
+
+            if wrapper in LIST_TYPES and len(elements) == 1:
+                item = ast.Name(id=f"item{depth}", ctx=ast.Load())
+                return ast.ListComp(
+                    elt=self.decode_value(elements[0], item, depth + 1),
+                    generators=[
+                        ast.comprehension(
+                            target=ast.Name(id=f"item{depth}", ctx=ast.Store()),
+                            iter=value,
+                            ifs=[],
+                            is_async=0,
+                        )
+                    ],
+                )
+
+            if wrapper == "Union":
+                members = self.resolve_union_members(annotation)
+                if members:
+                    lookup, catch = self.reference_union(members)
+                    typename = ast.Subscript(
+                        value=value, slice=ast.Constant("__typename"), ctx=ast.Load()
+                    )
+                    decoder = (
+                        ast.Call(
+                            func=ast.Attribute(
+                                value=ast.Name(id=lookup, ctx=ast.Load()),
+                                attr="get",
+                                ctx=ast.Load(),
+                            ),
+                            args=[typename, self.reference_decoder(catch)],
+                            keywords=[],
+                        )
+                        if catch
+                        else ast.Subscript(
+                            value=ast.Name(id=lookup, ctx=ast.Load()),
+                            slice=typename,
+                            ctx=ast.Load(),
+                        )
+                    )
+                    return ast.Call(func=decoder, args=[value], keywords=[])
+
+        return ast.Call(
+            func=self.reference_adapter(annotation), args=[value], keywords=[]
+        )
+
+    def build_decoder(self, class_name: str) -> ast.FunctionDef:
+        data = ast.Name(id="data", ctx=ast.Load())
+        keywords = []
+
+        for name, field in self.get_fields(class_name).items():
+            key, default = get_field_key_and_default(field)
+
+            if default is None:
+                value = ast.Subscript(
+                    value=data, slice=ast.Constant(key), ctx=ast.Load()
+                )
+            else:
+                value = ast.Call(
+                    func=ast.Attribute(value=data, attr="get", ctx=ast.Load()),
+                    args=[ast.Constant(key)]
+                    + ([default] if default.value is not None else []),
+                    keywords=[],
+                )
+
+            annotation = unwrap_forward_reference(field.annotation)
+            if (
+                default is not None
+                and default.value is None
+                and getattr(getattr(annotation, "value", None), "id", None)
+                != "Optional"
+            ):
+                # Missing values fall back to the None default
+                annotation = ast.Subscript(
+                    value=ast.Name(id="Optional", ctx=ast.Load()),
+                    slice=annotation,
+                    ctx=ast.Load(),
+                )
+
+            keywords.append(
+                ast.keyword(arg=name, value=self.decode_value(annotation, value))
+            )
+
+        return ast.FunctionDef(
+            name=self.function_name(class_name),
+            args=ast.arguments(
+                posonlyargs=[],
+                args=[
+                    ast.arg(
+                        arg="data",
+                        annotation=ast.Subscript(
+                            value=ast.Name(id="Dict", ctx=ast.Load()),
+                            slice=ast.Tuple(
+                                elts=[
+                                    ast.Name(id="str", ctx=ast.Load()),
+                                    ast.Name(id="Any", ctx=ast.Load()),
+                                ],
+                                ctx=ast.Load(),
+                            ),
+                            ctx=ast.Load(),
+                        ),
+                    )
+                ],
+                kwonlyargs=[],
+                kw_defaults=[],
+                defaults=[],
+            ),
+            body=[
+                ast.Expr(
+                    value=ast.Constant(
+                        value=f"Decodes trusted response data into {class_name} without validation"
+                    )
+                ),
+                ast.Return(
+                    value=ast.Call(
+                        func=ast.Attribute(
+                            value=ast.Name(id=class_name, ctx=ast.Load()),
+                            attr="model_construct",
+                            ctx=ast.Load(),
+                        ),
+                        args=[],
+                        keywords=keywords,
+                    )
+                ),
+            ],
+            decorator_list=[],
+            returns=ast.Constant(value=class_name),
+        )
+
+    def build(self) -> Tuple[List[ast.AST], List[ast.AST]]:
+        for class_name, node in self.classes.items():
+            if is_operation_class(node):
+                self.reference_decoder(class_name)
+
+        functions = []
+        while self.pending:
+            functions.append(self.build_decoder(self.pending.pop(0)))
+
+        imports = [
+            ast.ImportFrom(
+                module="typing",
+                names=[ast.alias(name="Any"), ast.alias(name="Dict")],
+                level=0,
+            )
+        ]
+        if self.adapters:
+            imports.append(
+                ast.ImportFrom(
+                    module="pydantic", names=[ast.alias(name="TypeAdapter")], level=0
+                )
+            )
+
+        # Lookups reference the decoders, so they come last
+        return imports, functions + self.helpers
+
+
+class DecodersParser(Parser):
+    """The decoders parser generates a decode function for every operation (and the
+    classes it references), that builds the models from trusted response data via
+    `model_construct`, without validating it again.
+
+    The functions are compiled from the generated classes, so they handle aliases,
+    nullability, lists, enums and unions (which are dispatched on their __typename).
+    Values of other types (e.g. custom scalars) are still validated by a TypeAdapter.
+    This is only safe for responses of a server that validated them against the same
+    schema, and requires pydantic v2.
+
+    The gain is largest for (non discriminated) unions, where pydantic tries every
+    member, as pydantic-core validates plain objects about as fast as they are constructed.
+    """
+
+    config: DecodersParserConfig = Field(default_factory=DecodersParserConfig)
+
+    def parse_ast(
+        self,
+        asts: List[ast.AST],
+    ) -> List[ast.AST]:
+        imports, decoders = DecoderBuilder(asts, self.config).build()
+
+        import_count = 0
+        for node in asts:
+            if not isinstance(node, (ast.Import, ast.ImportFrom)):
+                break
+            import_count += 1
+
+        return asts[:import_count] + imports + asts[import_count:] + decoders
@@ -0,0 +1,351 @@
+from turms.parsers.base import Parser, ParserConfig
+from turms.parsers.decoders import iter_body
+from typing import Dict, Iterator, List, Optional, Set
+import ast
+from pydantic_settings import SettingsConfigDict
+from pydantic import Field
+
+
+PYDANTIC_NAMES = {"BaseModel", "Field", "ConfigDict", "PrivateAttr"}
+"""Names that are no longer imported from pydantic once all models are structs"""
+
+PYDANTIC_METHODS = {"__hash__", "__eq__", "model_copy"}
+"""Methods generated for pydantic models (e.g. cached hashes), structs bring their own"""
+
+
+class StructsParserConfig(ParserConfig):
+    model_config = SettingsConfigDict(env_prefix="TURMS_PARSERS_STRUCTS_")
+    type: str = "turms.parsers.structs.StructsParser"
+    model_bases: List[str] = ["BaseModel"]
+    """The (unqualified) names of the bases that mark a class as model"""
+    tag_unions: bool = True
+    """Tag the members of unions on __typename (by their literal typename), so that unions are decoded by their tag"""
+
+
+def get_keyword(call: ast.AST, name: str) -> Optional[ast.AST]:
+    if isinstance(call, ast.Call):
+        for keyword in call.keywords:
+            if keyword.arg == name:
+                return keyword.value
+    return None
+
+
+def is_field_call(node: ast.AST) -> bool:
+    return isinstance(node, ast.Call) and getattr(node.func, "id", None) == "Field"
+
+
+def unwrap_annotated(annotation: ast.AST) -> ast.AST:
+    """Removes pydantic Field metadata from Annotated annotations"""
+    if isinstance(annotation, ast.Subscript):
+        if getattr(annotation.value, "id", None) == "Annotated" and isinstance(
+            annotation.slice, ast.Tuple
+        ):
+            return unwrap_annotated(annotation.slice.elts[0])
+        slice = annotation.slice
+        if isinstance(slice, ast.Tuple):
+            slice = ast.Tuple(
+                elts=[unwrap_annotated(elt) for elt in slice.elts], ctx=ast.Load()
+            )
+        else:
+            slice = unwrap_annotated(slice)
+        return ast.Subscript(value=annotation.value, slice=slice, ctx=ast.Load())
+    return annotation
+
+
+def get_literal_typename(field: ast.AnnAssign) -> Optional[str]:
+    annotation = field.annotation
+    if (
+        isinstance(annotation, ast.Subscript)
+        and getattr(annotation.value, "id", None) == "Literal"
+        and isinstance(annotation.slice, ast.Constant)
+    ):
+        return annotation.slice.value
+    return None
+
+
+def walk(node) -> Iterator[ast.AST]:
+    """Like `ast.walk`, but descends into the nested lists of statements of plugins"""
+    if isinstance(node, list):
+        for sub_node in node:
+            yield from walk(sub_node)
+    elif isinstance(node, ast.AST):
+        yield node
+        for _, value in ast.iter_fields(node):
+            yield from walk(value)
+
+
+def get_union_members(asts: List[ast.AST]) -> Set[str]:
+    """Collects the names within Union annotations (and aliases) of more than one type"""
+    members = set()
+
+    for node in walk(asts):
+        if isinstance(node, ast.Subscript) and (
+            getattr(node.value, "id", None) == "Union"
+            or getattr(node.value, "attr", None) == "Union"
+        ):
+            elts = (
+                node.slice.elts if isinstance(node.slice, ast.Tuple) else [node.slice]
+            )
+            names = [
+                elt.id if isinstance(elt, ast.Name) else elt.value
+                for elt in elts
+                if isinstance(elt, ast.Name)
+                or (isinstance(elt, ast.Constant) and isinstance(elt.value, str))
+            ]
+            if len(names) > 1:
+                members.update(names)
+
+    return members
+
+
+def is_frozen(node: ast.ClassDef) -> bool:
+    """Checks the pydantic v2 model_config and the v1 Config class for frozen models"""
+    for sub_node in iter_body(node.body):
+        if isinstance(sub_node, ast.Assign) and any(
+            getattr(target, "id", None) == "model_config" for target in sub_node.targets
+        ):
+            frozen = get_keyword(sub_node.value, "frozen")
+            if isinstance(frozen, ast.Constant) and frozen.value:
+                return True
+        if isinstance(sub_node, ast.ClassDef) and sub_node.name == "Config":
+            for config_node in iter_body(sub_node.body):
+                if (
+                    isinstance(config_node, ast.Assign)
+                    and any(
+                        getattr(target, "id", None) == "frozen"
+                        for target in config_node.targets
+                    )
+                    and isinstance(config_node.value, ast.Constant)
+                    and config_node.value.value
+                ):
+                    return True
+    return False
+
+
+class StructsConverter:
+    """Converts the pydantic models of a module to msgspec structs"""
+
+    def __init__(self, asts: List[ast.AST], config: StructsParserConfig):
+        self.config = config
+        self.classes: Dict[str, ast.ClassDef] = {
+            node.name: node for node in asts if isinstance(node, ast.ClassDef)
+        }
+        self.models: Set[str] = set()
+        self.union_members = get_union_members(asts)
+
+        # Models are the classes that (transitively) inherit from a model base
+        changed = True
+        while changed:
+            changed = False
+            for name, node in self.classes.items():
+                if name not in self.models and any(
+                    isinstance(base, ast.Name)
+                    and (base.id in config.model_bases or base.id in self.models)
+                    for base in node.bases
+                ):
+                    self.models.add(name)
+                    changed = True
+
+    def is_model_base(self, base: ast.AST) -> bool:
+        return isinstance(base, ast.Name) and (
+            base.id in self.config.model_bases or base.id in self.models
+        )
+
+    def get_fields(self, node: ast.ClassDef) -> Dict[str, ast.AnnAssign]:
+        """Flattens the fields of a model and its model bases (in the order of the MRO)"""
+        fields = {}
+
+        for base in reversed(node.bases):
+            if (
+                isinstance(base, ast.Name)
+                and base.id in self.models
+                and base.id != node.name
+            ):
+                fields.update(self.get_fields(self.classes[base.id]))
+
+        for sub_node in iter_body(node.body):
+            if (
+                isinstance(sub_node, ast.AnnAssign)
+                and isinstance(sub_node.target, ast.Name)
+                and not sub_node.target.id.startswith("_")
+            ):
+                # Names with a leading underscore are private attributes, not fields
+                fields[sub_node.target.id] = sub_node
+
+        return fields
+
+    def convert_field(self, field: ast.AnnAssign):
+        """Returns the struct field and the renamed key (if the field has an alias)"""
+        alias = None
+        value = field.value
+
+        if is_field_call(field.value):
+            alias_node = get_keyword(field.value, "alias")
+            if isinstance(alias_node, ast.Constant):
+                alias = alias_node.value
+
+            default = get_keyword(field.value, "default")
+            default_factory = get_keyword(field.value, "default_factory")
+            if default is not None:
+                value = default
+            elif default_factory is not None:
+                value = ast.Call(
+                    func=ast.Attribute(
+                        value=ast.Name(id="msgspec", ctx=ast.Load()),
+                        attr="field",
+                        ctx=ast.Load(),
+                    ),
+                    args=[],
+                    keywords=[
+                        ast.keyword(arg="default_factory", value=default_factory)
+                    ],
+                )
+            else:
+                value = None
+
+        struct_field = ast.AnnAssign(
+            target=ast.Name(id=field.target.id, ctx=ast.Store()),
+            annotation=unwrap_annotated(field.annotation),
+            value=value,
+            simple=1,
+        )
+        return struct_field, alias
+
+    def convert_class(self, node: ast.ClassDef) -> ast.ClassDef:
+        fields = self.get_fields(node)
+        keywords = [ast.keyword(arg="kw_only", value=ast.Constant(value=True))]
+        rename = {}
+
+        typename_field = fields.get("typename")
+        typename = get_literal_typename(typename_field) if typename_field else None
+        tagged = (
+            typename is not None
+            and self.config.tag_unions
+            and node.name in self.union_members
+        )
+        if tagged:
+            # The typename becomes the tag of the struct (and a class attribute)
+            fields.pop("typename")
+            keywords += [
+                ast.keyword(arg="tag_field", value=ast.Constant(value="__typename")),
+                ast.keyword(arg="tag", value=ast.Constant(value=typename)),
+            ]
+
+        if is_frozen(node):
+            keywords.append(ast.keyword(arg="frozen", value=ast.Constant(value=True)))
+
+        body = []
+        sub_nodes = list(iter_body(node.body))
+        if (
+            sub_nodes
+            and isinstance(sub_nodes[0], ast.Expr)
+            and isinstance(sub_nodes[0].value, ast.Constant)
+        ):
+            body.append(sub_nodes[0])
+
+        if tagged:
+            body.append(
+                ast.Assign(
+                    targets=[ast.Name(id="typename", ctx=ast.Store())],
+                    value=ast.Constant(value=typename),
+                )
+            )
+
+        for name, field in fields.items():
+            struct_field, alias = self.convert_field(field)
+            if alias and alias != name:
+                rename[name] = alias
+            body.append(struct_field)
+
+        for sub_node in sub_nodes:
+            if isinstance(sub_node, ast.ClassDef):
+                if sub_node.name == "Config":
+                    continue
+                if any(self.is_model_base(base) for base in sub_node.bases):
+                    body.append(self.convert_class(sub_node))
+                else:
+                    body.append(sub_node)
+            elif isinstance(sub_node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if sub_node.name not in PYDANTIC_METHODS:
+                    body.append(sub_node)
+
+        if rename:
+            keywords.append(
+                ast.keyword(
+                    arg="rename",
+                    value=ast.Dict(
+                        keys=[ast.Constant(value=key) for key in rename],
+                        values=[ast.Constant(value=value) for value in rename.values()],
+                    ),
+                )
+            )
+
+        bases = [
+            ast.Attribute(
+                value=ast.Name(id="msgspec", ctx=ast.Load()),
+                attr="Struct",
+                ctx=ast.Load(),
+            )
+        ] + [base for base in node.bases if not self.is_model_base(base)]
+
+        return ast.ClassDef(
+            name=node.name,
+            bases=bases,
+            keywords=keywords,
+            body=body or [ast.Pass()],
+            decorator_list=node.decorator_list,
+        )
+
+    def convert_import(self, node: ast.ImportFrom) -> Optional[ast.ImportFrom]:
+        names = [alias for alias in node.names if alias.name not in PYDANTIC_NAMES]
+        if not names:
+            return None
+        return ast.ImportFrom(module=node.module, names=names, level=node.level)
+
+    def convert(self, asts: List[ast.AST]) -> List[ast.AST]:
+        converted = [ast.Import(names=[ast.alias(name="msgspec")])]
+
+        for node in asts:
+            if isinstance(node, ast.ImportFrom) and node.module == "pydantic":
+                node = self.convert_import(node)
+            elif isinstance(node, ast.ClassDef) and node.name in self.models:
+                node = self.convert_class(node)
+            elif isinstance(node, ast.Assign):
+                node = ast.Assign(
+                    targets=node.targets, value=unwrap_annotated(node.value)
+                )
+            elif (
+                isinstance(node, ast.Expr)
+                and isinstance(node.value, ast.Call)
+                and getattr(node.value.func, "attr", None) == "model_rebuild"
+            ):
+                # Structs resolve forward references on first use
+                node = None
+
+            if node is not None:
+                converted.append(node)
+
+        return converted
+
+
+class StructsParser(Parser):
+    """The structs parser converts the generated pydantic models to `msgspec.Struct`
+    classes, so that responses can be decoded with `msgspec.convert` (or
+    `msgspec.json.decode(..., type=...)`) at a fraction of the cost and memory.
+
+    Aliased fields are renamed, and the members of unions are tagged on __typename
+    by their literal typename, so that unions are decoded by their tag. Their
+    typename is then a class attribute instead of a field (all other classes keep
+    their typename field). As structs do not
+    support multiple inheritance of fields, the fields of fragments are flattened
+    into the classes that spread them. Pydantic validators of custom scalars are
+    not applied, and the decoders parser should not be combined with this parser.
+    """
+
+    config: StructsParserConfig = Field(default_factory=StructsParserConfig)
+
+    def parse_ast(
+        self,
+        asts: List[ast.AST],
+    ) -> List[ast.AST]:
+        return StructsConverter(asts, self.config).convert(asts)
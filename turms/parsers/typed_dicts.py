@@ -0,0 +1,261 @@
+from turms.parsers.base import Parser, ParserConfig
+from turms.parsers.decoders import is_operation_class, iter_body
+from turms.parsers.structs import (
+    StructsConverter,
+    get_keyword,
+    is_field_call,
+    unwrap_annotated,
+)
+from typing import Dict, List, Optional
+from keyword import iskeyword
+import ast
+from pydantic_settings import SettingsConfigDict
+from pydantic import Field
+
+
+class TypedDictsParserConfig(ParserConfig):
+    model_config = SettingsConfigDict(env_prefix="TURMS_PARSERS_TYPED_DICTS_")
+    type: str = "turms.parsers.typed_dicts.TypedDictsParser"
+    model_bases: List[str] = ["BaseModel"]
+    """The (unqualified) names of the bases that mark a class as model"""
+    typing_module: str = "typing_extensions"
+    """The module to import TypedDict and NotRequired from (typing only has NotRequired from 3.11 on)"""
+
+
+def can_be_class_key(key: str) -> bool:
+    """Keys starting with __ would be mangled within a class body"""
+    return key.isidentifier() and not iskeyword(key) and not key.startswith("__")
+
+
+def is_optional(annotation: ast.AST) -> bool:
+    return (
+        isinstance(annotation, ast.Subscript)
+        and getattr(annotation.value, "id", None) == "Optional"
+    )
+
+
+def get_key(field: ast.AnnAssign) -> str:
+    """The key of a field in the raw response (its alias if it has one)"""
+    if is_field_call(field.value):
+        alias = get_keyword(field.value, "alias")
+        if isinstance(alias, ast.Constant):
+            return alias.value
+    return field.target.id
+
+
+class TypedDictsConverter(StructsConverter):
+    """Converts the pydantic models of a module to TypedDicts keyed like the raw response"""
+
+    def __init__(self, asts: List[ast.AST], config: TypedDictsParserConfig):
+        super().__init__(asts, config)
+        self.operations: Dict[str, Dict[str, str]] = {
+            name: {
+                field_name: get_key(field)
+                for field_name, field in self.get_fields(node).items()
+            }
+            for name, node in self.classes.items()
+            if name in self.models and is_operation_class(node)
+        }
+
+    def convert_items(self, node: ast.ClassDef) -> Dict[str, ast.AST]:
+        items = {}
+        for field in self.get_fields(node).values():
+            annotation = unwrap_annotated(field.annotation)
+            if is_optional(annotation):
+                annotation = ast.Subscript(
+                    value=ast.Name(id="NotRequired", ctx=ast.Load()),
+                    slice=annotation,
+                    ctx=ast.Load(),
+                )
+            items[get_key(field)] = annotation
+        return items
+
+    def functional_typed_dict(self, name: str, target: ast.AST, items) -> ast.Assign:
+        return ast.Assign(
+            targets=[target],
+            value=ast.Call(
+                func=ast.Name(id="TypedDict", ctx=ast.Load()),
+                args=[
+                    ast.Constant(value=name),
+                    ast.Dict(
+                        keys=[ast.Constant(value=key) for key in items],
+                        values=list(items.values()),
+                    ),
+                ],
+                keywords=[],
+            ),
+        )
+
+    def convert_nested(self, sub_node: ast.ClassDef) -> Optional[ast.AST]:
+        if sub_node.name == "Config":
+            return None
+        if any(self.is_model_base(base) for base in sub_node.bases):
+            return self.functional_typed_dict(
+                sub_node.name,
+                ast.Name(id=sub_node.name, ctx=ast.Store()),
+                self.convert_items(sub_node),
+            )
+        return sub_node
+
+    def convert_class(self, node: ast.ClassDef) -> List[ast.AST]:
+        items = self.convert_items(node)
+        sub_nodes = list(iter_body(node.body))
+        nested = [
+            converted
+            for converted in (
+                self.convert_nested(sub_node)
+                for sub_node in sub_nodes
+                if isinstance(sub_node, ast.ClassDef)
+            )
+            if converted is not None
+        ]
+
+        if all(can_be_class_key(key) for key in items):
+            body = []
+            if (
+                sub_nodes
+                and isinstance(sub_nodes[0], ast.Expr)
+                and isinstance(sub_nodes[0].value, ast.Constant)
+            ):
+                body.append(sub_nodes[0])
+            body += [
+                ast.AnnAssign(
+                    target=ast.Name(id=key, ctx=ast.Store()),
+                    annotation=annotation,
+                    value=None,
+                    simple=1,
+                )
+                for key, annotation in items.items()
+            ]
+            return [
+                ast.ClassDef(
+                    name=node.name,
+                    bases=[ast.Name(id="TypedDict", ctx=ast.Load())],
+                    keywords=[],
+                    body=body + nested or [ast.Pass()],
+                    decorator_list=[],
+                )
+            ]
+
+        # Keys like __typename need the functional syntax, nested classes are attached afterwards
+        converted = [
+            self.functional_typed_dict(
+                node.name, ast.Name(id=node.name, ctx=ast.Store()), items
+            )
+        ]
+        for nested_node in nested:
+            if isinstance(nested_node, ast.ClassDef):
+                nested_name = nested_node.name
+                nested_node.name = f"_{node.name}{nested_name}"
+            else:
+                nested_name = nested_node.targets[0].id
+                nested_node.targets = [
+                    ast.Name(id=f"_{node.name}{nested_name}", ctx=ast.Store())
+                ]
+            converted += [
+                nested_node,
+                ast.Assign(
+                    targets=[
+                        ast.Attribute(
+                            value=ast.Name(id=node.name, ctx=ast.Load()),
+                            attr=nested_name,
+                            ctx=ast.Store(),
+                        )
+                    ],
+                    value=ast.Name(id=f"_{node.name}{nested_name}", ctx=ast.Load()),
+                ),
+            ]
+        return converted
+
+    def convert(self, asts: List[ast.AST]) -> List[ast.AST]:
+        converted = [
+            ast.ImportFrom(
+                module=self.config.typing_module,
+                names=[ast.alias(name="NotRequired"), ast.alias(name="TypedDict")],
+                level=0,
+            )
+        ]
+
+        for node in asts:
+            if isinstance(node, ast.ImportFrom) and node.module == "pydantic":
+                node = self.convert_import(node)
+            elif isinstance(node, ast.ClassDef) and node.name in self.models:
+                converted += self.convert_class(node)
+                continue
+            elif isinstance(node, ast.Assign):
+                node = ast.Assign(
+                    targets=node.targets, value=unwrap_annotated(node.value)
+                )
+            elif (
+                isinstance(node, ast.Expr)
+                and isinstance(node.value, ast.Call)
+                and getattr(node.value.func, "attr", None) == "model_rebuild"
+            ):
+                node = None
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                node = ResultAccessTransformer(self.operations).visit(node)
+
+            if node is not None:
+                converted.append(node)
+
+        return converted
+
+
+class ResultAccessTransformer(ast.NodeTransformer):
+    """Rewrites attribute access on operation results (as generated by the funcs plugin)
+    to item access, as the results are now plain dictionaries"""
+
+    def __init__(self, operations: Dict[str, Dict[str, str]]):
+        self.operations = operations
+        self.event_operations: Dict[str, str] = {}
+
+    def get_operation(self, node: ast.AST) -> Optional[str]:
+        if isinstance(node, ast.Await):
+            node = node.value
+        if isinstance(node, ast.Call):
+            for arg in node.args:
+                if isinstance(arg, ast.Name) and arg.id in self.operations:
+                    return arg.id
+        if isinstance(node, ast.Name):
+            return self.event_operations.get(node.id)
+        return None
+
+    def visit_For(self, node):
+        operation = self.get_operation(node.iter)
+        if operation and isinstance(node.target, ast.Name):
+            self.event_operations[node.target.id] = operation
+        return self.generic_visit(node)
+
+    visit_AsyncFor = visit_For
+
+    def visit_Attribute(self, node: ast.Attribute):
+        node = self.generic_visit(node)
+        operation = self.get_operation(node.value)
+        if operation and node.attr in self.operations[operation]:
+            return ast.Subscript(
+                value=node.value,
+                slice=ast.Constant(value=self.operations[operation][node.attr]),
+                ctx=ast.Load(),
+            )
+        return node
+
+
+class TypedDictsParser(Parser):
+    """The typed dicts parser converts the generated pydantic models (fragments,
+    operations and inputs) to `TypedDict` classes, keyed like the raw response (so
+    with aliases and a literal __typename). Nullable fields are `NotRequired`.
+
+    This is a typing only mode: responses are used as plain dictionaries without any
+    validation, and no pydantic schemas are built when the module is imported. The
+    funcs plugin's access to the operation result is rewritten to item access, so
+    that generated functions return the raw dictionaries. Enums and custom scalars
+    keep their annotations, while the dictionaries hold their raw json values.
+    """
+
+    config: TypedDictsParserConfig = Field(default_factory=TypedDictsParserConfig)
+
+    def parse_ast(
+        self,
+        asts: List[ast.AST],
+    ) -> List[ast.AST]:
+        return TypedDictsConverter(asts, self.config).convert(asts)
@@ -309,7 +309,9 @@ class FragmentsPlugin(Plugin):
         plugin_tree = []
 
         documents = parse_documents(
-            client_schema, self.config.fragments_glob or config.documents
+            client_schema,
+            self.config.fragments_glob or config.documents,
+            cache_dir=config.parse_cache_dir,
         )
 
         definitions = documents.definitions
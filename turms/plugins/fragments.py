@@ -27,6 +27,7 @@ from turms.utils import (
     generate_generic_typename_field,
     generate_pydantic_config,
     generate_typename_field,
+    generate_union_annotation,
     get_additional_bases_for_type,
     get_interface_bases,
     non_typename_fields,
@@ -450,18 +451,13 @@ def generate_fragment(
             f.name.value, implementationMap
         )
 
-        registry.register_import("typing.Union")
         mother_class = ast.Assign(
             targets=[ast.Name(id=base_fragment_name, ctx=ast.Load())],
-            value=ast.Subscript(
-                value=ast.Name(id="Union", ctx=ast.Load()),
-                slice=ast.Tuple(
-                    elts=[
-                        ast.Name(id=f"{base_fragment_name}{i.name}", ctx=ast.Load())
-                        for i in type.types
-                    ],
-                    ctx=ast.Load(),
-                ),
+            value=generate_union_annotation(
+                [f"{base_fragment_name}{i.name}" for i in type.types],
+                [i.name for i in type.types],
+                registry,
+                config,
             ),
             simple=1,
         )
@@ -513,7 +509,9 @@ class FragmentsPlugin(Plugin):
         plugin_tree = []
 
         documents = parse_documents(
-            client_schema, self.config.fragments_glob or config.documents
+            client_schema,
+            self.config.fragments_glob or config.documents,
+            cache_dir=config.parse_cache_dir,
         )
 
         # Find dependencies and sort fragments topologically
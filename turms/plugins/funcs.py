@@ -3,7 +3,7 @@ from __future__ import annotations
 import ast
 import logging
 import re
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 
 from graphql import (
@@ -12,7 +12,10 @@ from graphql import (
     GraphQLObjectType,
     Undefined,
     VariableNode,
+    get_named_type,
+    is_specified_scalar_type,
     is_wrapping_type,
+    type_from_ast,
 )
 from graphql.type.definition import (
     GraphQLEnumType,
@@ -29,6 +32,7 @@ from graphql.utilities.type_info import get_field_def
 from pydantic import BaseModel, Field
 from pydantic_settings import SettingsConfigDict
 from turms.config import GeneratorConfig
+from turms.parallel import generate_in_pool
 from turms.plugins.base import Plugin, PluginConfig
 from turms.registry import ClassRegistry
 from turms.utils import (
@@ -88,6 +92,14 @@ class FuncsPluginConfig(PluginConfig):
     extract_documentation: bool = True
     argument_key_is_styled: bool = False
     expand_input_types: List[str] = []
+    parallel: bool = False
+    """Generate the functions in a process pool (output is identical to the serial generation)"""
+    max_workers: Optional[int] = None
+    """The maximum amount of processes when generating in parallel. Defaults to the amount of CPUs"""
+    serialize_variables: bool = False
+    """Generate a variable serializer for every operation, so that the functions pass
+    ready to json variables to the proxy function (instead of variables that still need
+    to be validated through `operation.Arguments`)"""
 
 
 def camel_to_snake(name):
@@ -487,6 +499,26 @@ def generate_variable_dict(
     plugin_config: FuncsPluginConfig,
     registry: ClassRegistry,
     client_schema: GraphQLSchema,
+):
+    variables = generate_raw_variable_dict(o, plugin_config, registry, client_schema)
+
+    if plugin_config.serialize_variables:
+        return ast.Call(
+            func=ast.Name(
+                id=get_variable_serializer_name(o, registry), ctx=ast.Load()
+            ),
+            args=[variables],
+            keywords=[],
+        )
+
+    return variables
+
+
+def generate_raw_variable_dict(
+    o: OperationDefinitionNode,
+    plugin_config: FuncsPluginConfig,
+    registry: ClassRegistry,
+    client_schema: GraphQLSchema,
 ):
     keys = []
     values = []
@@ -513,6 +545,274 @@ def generate_variable_dict(
     return ast.Dict(keys=keys, values=values)
 
 
+def get_variable_serializer_name(
+    o: OperationDefinitionNode, registry: ClassRegistry
+) -> str:
+    return f"serialize_{get_operation_class_name(o, registry)}_variables"
+
+
+def get_input_serializer_name(
+    input_type: GraphQLInputObjectType, registry: ClassRegistry
+) -> str:
+    return f"serialize_{registry.style_inputtype_class(input_type.name)}"
+
+
+def is_passthrough_type(type: GraphQLInputType) -> bool:
+    """Checks if values of this type are already json serializable (builtin scalars and
+    enums, whose generated classes subclass str)"""
+    if isinstance(type, (GraphQLNonNull, GraphQLList)):
+        return is_passthrough_type(type.of_type)
+    if isinstance(type, GraphQLScalarType):
+        return is_specified_scalar_type(type)
+    return isinstance(type, GraphQLEnumType)
+
+
+def generate_value_serializer(
+    type: GraphQLInputType,
+    value: ast.AST,
+    registry: ClassRegistry,
+    depth: int = 0,
+) -> ast.AST:
+    """Generates an expression that converts value (of the given type) to json
+    serializable python objects. Nullable values are checked for None."""
+    if is_passthrough_type(type):
+        return value
+
+    is_optional = not isinstance(type, GraphQLNonNull)
+    if not is_optional:
+        type = type.of_type
+
+    if isinstance(type, GraphQLList):
+        item = f"item{depth}" if depth else "item"
+        serialized = ast.ListComp(
+            elt=generate_value_serializer(
+                type.of_type, ast.Name(id=item, ctx=ast.Load()), registry, depth + 1
+            ),
+            generators=[
+                ast.comprehension(
+                    target=ast.Name(id=item, ctx=ast.Store()),
+                    iter=value,
+                    ifs=[],
+                    is_async=0,
+                )
+            ],
+        )
+    elif isinstance(type, GraphQLInputObjectType):
+        serialized = ast.Call(
+            func=ast.Name(id=get_input_serializer_name(type, registry), ctx=ast.Load()),
+            args=[value],
+            keywords=[],
+        )
+    else:
+        # Custom scalars are serialized like pydantic would in json mode
+        registry.register_import("pydantic_core.to_jsonable_python")
+        serialized = ast.Call(
+            func=ast.Name(id="to_jsonable_python", ctx=ast.Load()),
+            args=[value],
+            keywords=[],
+        )
+
+    if not is_optional:
+        return serialized
+
+    return ast.IfExp(
+        test=ast.Compare(
+            left=value, ops=[ast.Is()], comparators=[ast.Constant(value=None)]
+        ),
+        body=ast.Constant(value=None),
+        orelse=serialized,
+    )
+
+
+def collect_input_types(
+    type: GraphQLInputType, collected: Dict[str, GraphQLInputObjectType]
+):
+    """Collects the input object types (recursively) used by a type"""
+    type = get_named_type(type)
+    if isinstance(type, GraphQLInputObjectType) and type.name not in collected:
+        collected[type.name] = type
+        for field in type.fields.values():
+            collect_input_types(field.type, collected)
+
+
+def generate_input_serializer(
+    input_type: GraphQLInputObjectType,
+    registry: ClassRegistry,
+) -> ast.FunctionDef:
+    """Generates a function that converts an instance of the input model to a
+    json serializable dict (keyed by the field names of the schema)"""
+    registry.register_import("typing.Dict")
+    registry.register_import("typing.Any")
+
+    return ast.FunctionDef(
+        name=get_input_serializer_name(input_type, registry),
+        args=ast.arguments(
+            args=[
+                ast.arg(
+                    arg="value",
+                    annotation=registry.reference_inputtype(
+                        input_type.name, "SHOULD_NOT_BE_USED"
+                    ),
+                )
+            ],
+            posonlyargs=[],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        ),
+        body=[
+            ast.Return(
+                value=ast.Dict(
+                    keys=[ast.Constant(value=key) for key in input_type.fields],
+                    values=[
+                        generate_value_serializer(
+                            field.type,
+                            ast.Attribute(
+                                value=ast.Name(id="value", ctx=ast.Load()),
+                                attr=registry.generate_node_name(key),
+                                ctx=ast.Load(),
+                            ),
+                            registry,
+                        )
+                        for key, field in input_type.fields.items()
+                    ],
+                )
+            )
+        ],
+        decorator_list=[],
+        returns=ast.Subscript(
+            value=ast.Name(id="Dict", ctx=ast.Load()),
+            slice=ast.Tuple(
+                elts=[
+                    ast.Name(id="str", ctx=ast.Load()),
+                    ast.Name(id="Any", ctx=ast.Load()),
+                ],
+                ctx=ast.Load(),
+            ),
+            ctx=ast.Load(),
+        ),
+    )
+
+
+def generate_variable_serializer(
+    o: OperationDefinitionNode,
+    client_schema: GraphQLSchema,
+    plugin_config: FuncsPluginConfig,
+    registry: ClassRegistry,
+) -> ast.FunctionDef:
+    """Generates a function that converts the variables of an operation (as passed by
+    the generated functions) to json serializable variables.
+
+    Nullable variables without a default value are omitted if they are None, input
+    models are converted through their input serializers and expanded input types
+    are serialized field by field."""
+    registry.register_import("typing.Dict")
+    registry.register_import("typing.Any")
+
+    body = [
+        ast.Assign(
+            targets=[ast.Name(id="serialized", ctx=ast.Store())],
+            value=ast.Dict(keys=[], values=[]),
+        )
+    ]
+
+    for v in o.variable_definitions:
+        key = v.variable.name.value
+        type = type_from_ast(client_schema, v.type)
+        value = ast.Subscript(
+            value=ast.Name(id="variables", ctx=ast.Load()),
+            slice=ast.Constant(value=key),
+            ctx=ast.Load(),
+        )
+
+        if key in plugin_config.expand_input_types:
+            input_type = get_named_type(type)
+            serialized = ast.Dict(
+                keys=[ast.Constant(value=field_key) for field_key in input_type.fields],
+                values=[
+                    generate_value_serializer(
+                        field.type,
+                        ast.Subscript(
+                            value=value,
+                            slice=ast.Constant(value=field_key),
+                            ctx=ast.Load(),
+                        ),
+                        registry,
+                    )
+                    for field_key, field in input_type.fields.items()
+                ],
+            )
+        else:
+            serialized = generate_value_serializer(
+                type, ast.Name(id="value", ctx=ast.Load()), registry
+            )
+
+        assign = ast.Assign(
+            targets=[
+                ast.Subscript(
+                    value=ast.Name(id="serialized", ctx=ast.Load()),
+                    slice=ast.Constant(value=key),
+                    ctx=ast.Store(),
+                )
+            ],
+            value=serialized,
+        )
+
+        if key in plugin_config.expand_input_types:
+            body.append(assign)
+            continue
+
+        body.append(
+            ast.Assign(targets=[ast.Name(id="value", ctx=ast.Store())], value=value)
+        )
+
+        if isinstance(type, GraphQLNonNull) or v.default_value:
+            body.append(assign)
+        else:
+            # The None check is already done by the if statement
+            if isinstance(assign.value, ast.IfExp):
+                assign.value = assign.value.orelse
+            body.append(
+                ast.If(
+                    test=ast.Compare(
+                        left=ast.Name(id="value", ctx=ast.Load()),
+                        ops=[ast.IsNot()],
+                        comparators=[ast.Constant(value=None)],
+                    ),
+                    body=[assign],
+                    orelse=[],
+                )
+            )
+
+    body.append(ast.Return(value=ast.Name(id="serialized", ctx=ast.Load())))
+
+    dict_annotation = ast.Subscript(
+        value=ast.Name(id="Dict", ctx=ast.Load()),
+        slice=ast.Tuple(
+            elts=[
+                ast.Name(id="str", ctx=ast.Load()),
+                ast.Name(id="Any", ctx=ast.Load()),
+            ],
+            ctx=ast.Load(),
+        ),
+        ctx=ast.Load(),
+    )
+
+    return ast.FunctionDef(
+        name=get_variable_serializer_name(o, registry),
+        args=ast.arguments(
+            args=[ast.arg(arg="variables", annotation=dict_annotation)],
+            posonlyargs=[],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        ),
+        body=body,
+        decorator_list=[],
+        returns=dict_annotation,
+    )
+
+
 def generate_document_arg(o: OperationDefinitionNode, registry: ClassRegistry):
     return ast.Name(id=get_operation_class_name(o, registry), ctx=ast.Load())
 
@@ -1179,6 +1479,36 @@ def generate_operation_func(
     return tree
 
 
+def generate_operation_funcs(
+    o: OperationDefinitionNode,
+    client_schema: GraphQLSchema,
+    config: GeneratorConfig,
+    plugin_config: FuncsPluginConfig,
+    registry: ClassRegistry,
+):
+    """Generates the functions for every matching definition of an operation"""
+    tree = []
+
+    if plugin_config.serialize_variables and get_definitions_for_onode(
+        o, plugin_config
+    ):
+        tree.append(
+            generate_variable_serializer(o, client_schema, plugin_config, registry)
+        )
+
+    for definition in get_definitions_for_onode(o, plugin_config):
+        tree += generate_operation_func(
+            definition,
+            o,
+            client_schema,
+            config,
+            plugin_config,
+            registry,
+        )
+
+    return tree
+
+
 class FuncsPlugin(Plugin):
     """This plugin generates functions for each operation in the schema.
 
@@ -1207,6 +1537,12 @@ class FuncsPlugin(Plugin):
 
     Subscriptions are supported and will map to an async iterator.
 
+    Setting `serialize_variables` generates a serializer for every operation (and for
+    the input types it uses), that the functions apply to their variables. The proxy
+    function then receives ready to json variables, and can pass them to the transport
+    without building the `Arguments` model on every call.
+
+    Setting `parallel` will generate the functions of each operation in a process pool.
 
     """
 
@@ -1221,7 +1557,9 @@ class FuncsPlugin(Plugin):
         plugin_tree = []
 
         documents = parse_documents(
-            client_schema, self.config.funcs_glob or config.documents
+            client_schema,
+            self.config.funcs_glob or config.documents,
+            cache_dir=config.parse_cache_dir,
         )
 
         operations = [
@@ -1230,15 +1568,34 @@ class FuncsPlugin(Plugin):
             if isinstance(node, OperationDefinitionNode)
         ]
 
+        if self.config.serialize_variables:
+            input_types: Dict[str, GraphQLInputObjectType] = {}
+            for operation in operations:
+                if get_definitions_for_onode(operation, self.config):
+                    for v in operation.variable_definitions:
+                        collect_input_types(
+                            type_from_ast(client_schema, v.type), input_types
+                        )
+
+            plugin_tree += [
+                generate_input_serializer(input_type, registry)
+                for input_type in input_types.values()
+            ]
+
+        if self.config.parallel:
+            return plugin_tree + generate_in_pool(
+                generate_operation_funcs,
+                operations,
+                client_schema,
+                config,
+                self.config,
+                registry,
+                max_workers=self.config.max_workers,
+            )
+
         for operation in operations:
-            for definition in get_definitions_for_onode(operation, self.config):
-                plugin_tree += generate_operation_func(
-                    definition,
-                    operation,
-                    client_schema,
-                    config,
-                    self.config,
-                    registry,
-                )
+            plugin_tree += generate_operation_funcs(
+                operation, client_schema, config, self.config, registry
+            )
 
         return plugin_tree
@@ -284,7 +284,10 @@ def generate_inputs(
 
     if plugin_config.skip_unreferenced and config.documents:
         ref_registry = create_reference_registry_from_documents(
-            client_schema, parse_documents(client_schema, config.documents)
+            client_schema,
+            parse_documents(
+                client_schema, config.documents, cache_dir=config.parse_cache_dir
+            ),
         )
     else:
         ref_registry = None
@@ -1,11 +1,13 @@
 import ast
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from pydantic_settings import SettingsConfigDict
 from turms.config import GeneratorConfig
+from turms.errors import GenerationError
 from graphql.utilities.build_client_schema import GraphQLSchema
 from graphql.language.ast import OperationDefinitionNode, OperationType
 from turms.recurse import type_field_node
+from turms.parallel import generate_in_pool
 from turms.plugins.base import Plugin, PluginConfig
 from pydantic import Field
 from graphql.language.ast import (
@@ -20,6 +22,7 @@ from graphql.utilities.type_info import get_field_def
 import re
 from graphql import NonNullTypeNode, VariableDefinitionNode, language
 from turms.registry import ClassRegistry
+from turms.streaming import generate_iter_json_list
 from turms.utils import (
     generate_pydantic_config,
     inspect_operation_for_documentation,
@@ -27,6 +30,8 @@ from turms.utils import (
     recurse_type_annotation,
     replace_iteratively,
     parse_value_node,
+    should_defer_build,
+    target_from_node,
 )
 import logging
 
@@ -46,6 +51,16 @@ class OperationsPluginConfig(PluginConfig):
     create_arguments: bool = True
     extract_documentation: bool = True
     arguments_allow_population_by_field_name: bool = False
+    parallel: bool = False
+    """Generate the operations in a process pool (output is identical to the serial generation)"""
+    max_workers: Optional[int] = None
+    """The maximum amount of processes when generating in parallel. Defaults to the amount of CPUs"""
+    bytes_entry_points: bool = False
+    """Generate a `from_response_bytes` classmethod, that validates an operation straight from the raw json body of a response"""
+    json_loads: str = "json.loads"
+    """The function used by `from_response_bytes` to parse the body (e.g. orjson.loads, which is considerably faster)"""
+    streaming_lists: bool = False
+    """Generate an `iter_<field>` classmethod for every top level list field, that decodes its items one by one from a streamed response body"""
 
 
 def get_query_bases(
@@ -264,25 +279,39 @@ def generate_expanded_types(
         fields_body += [assign]
 
 
+def register_operation(o: OperationDefinitionNode, registry: ClassRegistry) -> str:
+    """Registers the class for the operation in the registry and returns its classname"""
+    assert o.name.value, "Operation names are required"
+
+    if o.operation == OperationType.MUTATION:
+        return registry.generate_mutation(o.name.value)
+    if o.operation == OperationType.SUBSCRIPTION:
+        return registry.generate_subscription(o.name.value)
+    if o.operation == OperationType.QUERY:
+        return registry.generate_query(o.name.value)
+
+    raise GenerationError(f"Unknown operation type {o.operation}")
+
+
 def generate_operation(
     o: OperationDefinitionNode,
     client_schema: GraphQLSchema,
     config: GeneratorConfig,
     plugin_config: OperationsPluginConfig,
     registry: ClassRegistry,
+    class_name: Optional[str] = None,
 ):
     tree = []
-    assert o.name.value, "Operation names are required"
 
-    # Generation means creating a class for the operation
+    # Generation means creating a class for the operation (unless it was already reserved)
+    if class_name is None:
+        class_name = register_operation(o, registry)
+
     if o.operation == OperationType.MUTATION:
-        class_name = registry.generate_mutation(o.name.value)
         extra_bases = get_mutation_bases(config, plugin_config, registry)
     if o.operation == OperationType.SUBSCRIPTION:
-        class_name = registry.generate_subscription(o.name.value)
         extra_bases = get_subscription_bases(config, plugin_config, registry)
     if o.operation == OperationType.QUERY:
-        class_name = registry.generate_query(o.name.value)
         extra_bases = get_query_bases(config, plugin_config, registry)
 
     x = get_operation_root_type(client_schema, o)
@@ -300,22 +329,34 @@ def generate_operation(
             )
         )
 
+    list_iterators = []
+
     for field_node in o.selection_set.selections:
         field_node: FieldNode = field_node
         field_definition = get_field_def(client_schema, x, field_node)
         assert field_definition, "Couldn't find field definition"
 
-        class_body_fields += [
-            type_field_node(
-                field_node,
-                class_name,
-                field_definition,
-                client_schema,
+        field = type_field_node(
+            field_node,
+            class_name,
+            field_definition,
+            client_schema,
+            config,
+            tree,
+            registry,
+        )
+        class_body_fields += [field]
+
+        if plugin_config.streaming_lists:
+            # Fields with a description are followed by their docstring
+            iterator = generate_list_iterator(
+                field[0] if isinstance(field, list) else field,
+                target_from_node(field_node),
                 config,
-                tree,
                 registry,
-            ),
-        ]
+            )
+            if iterator is not None:
+                list_iterators.append(iterator)
 
     query_document = language.print_ast(o)
     merged_document = replace_iteratively(query_document, registry)
@@ -407,6 +448,23 @@ def generate_operation(
             o.operation, config, plugin_config, registry
         )
 
+        if should_defer_build(o.operation, config):
+            registry.register_import("pydantic.ConfigDict")
+            arguments_body += [
+                ast.Assign(
+                    targets=[ast.Name(id="model_config", ctx=ast.Store())],
+                    value=ast.Call(
+                        func=ast.Name(id="ConfigDict", ctx=ast.Load()),
+                        args=[],
+                        keywords=[
+                            ast.keyword(
+                                arg="defer_build", value=ast.Constant(value=True)
+                            )
+                        ],
+                    ),
+                )
+            ]
+
         class_body_fields += [
             ast.ClassDef(
                 "Arguments",
@@ -435,6 +493,13 @@ def generate_operation(
         ast.ClassDef("Meta", bases=[], decorator_list=[], keywords=[], body=meta_body)
     ]
 
+    if plugin_config.bytes_entry_points:
+        class_body_fields += [
+            generate_from_response_bytes(class_name, config, plugin_config, registry)
+        ]
+
+    class_body_fields += list_iterators
+
     tree.append(
         ast.ClassDef(
             class_name,
@@ -449,6 +514,265 @@ def generate_operation(
     return tree
 
 
+def generate_from_response_bytes(
+    class_name: str,
+    config: GeneratorConfig,
+    plugin_config: OperationsPluginConfig,
+    registry: ClassRegistry,
+) -> ast.FunctionDef:
+    """Generates the `from_response_bytes` classmethod of an operation, that parses
+    the raw body of a graphql response with the configured json loader and validates
+    its data (raising a ValueError with the errors if there is no data)"""
+    registry.register_import(plugin_config.json_loads)
+    registry.register_import("typing.Union")
+    loads = plugin_config.json_loads.split(".")[-1]
+    validate = "model_validate" if config.pydantic_version == "v2" else "parse_obj"
+
+    response = ast.Name(id="response", ctx=ast.Load())
+
+    def get(key: str) -> ast.Call:
+        return ast.Call(
+            func=ast.Attribute(value=response, attr="get", ctx=ast.Load()),
+            args=[ast.Constant(value=key)],
+            keywords=[],
+        )
+
+    return ast.FunctionDef(
+        name="from_response_bytes",
+        args=ast.arguments(
+            args=[
+                ast.arg(arg="cls"),
+                ast.arg(
+                    arg="body",
+                    annotation=ast.Subscript(
+                        value=ast.Name(id="Union", ctx=ast.Load()),
+                        slice=ast.Tuple(
+                            elts=[
+                                ast.Name(id="bytes", ctx=ast.Load()),
+                                ast.Name(id="str", ctx=ast.Load()),
+                            ],
+                            ctx=ast.Load(),
+                        ),
+                        ctx=ast.Load(),
+                    ),
+                ),
+            ],
+            posonlyargs=[],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        ),
+        body=[
+            ast.Expr(
+                value=ast.Constant(
+                    value="Validates the operation from the raw json body of a graphql response"
+                )
+            ),
+            ast.Assign(
+                targets=[ast.Name(id="response", ctx=ast.Store())],
+                value=ast.Call(
+                    func=ast.Name(id=loads, ctx=ast.Load()),
+                    args=[ast.Name(id="body", ctx=ast.Load())],
+                    keywords=[],
+                ),
+            ),
+            ast.If(
+                test=ast.BoolOp(
+                    op=ast.And(),
+                    values=[
+                        ast.Compare(
+                            left=get("data"),
+                            ops=[ast.Is()],
+                            comparators=[ast.Constant(value=None)],
+                        ),
+                        get("errors"),
+                    ],
+                ),
+                body=[
+                    ast.Raise(
+                        exc=ast.Call(
+                            func=ast.Name(id="ValueError", ctx=ast.Load()),
+                            args=[
+                                ast.Subscript(
+                                    value=response,
+                                    slice=ast.Constant(value="errors"),
+                                    ctx=ast.Load(),
+                                )
+                            ],
+                            keywords=[],
+                        )
+                    )
+                ],
+                orelse=[],
+            ),
+            ast.Return(
+                value=ast.Call(
+                    func=ast.Attribute(
+                        value=ast.Name(id="cls", ctx=ast.Load()),
+                        attr=validate,
+                        ctx=ast.Load(),
+                    ),
+                    args=[
+                        ast.Subscript(
+                            value=response,
+                            slice=ast.Constant(value="data"),
+                            ctx=ast.Load(),
+                        )
+                    ],
+                    keywords=[],
+                )
+            ),
+        ],
+        decorator_list=[ast.Name(id="classmethod", ctx=ast.Load())],
+        returns=ast.Constant(value=class_name),
+    )
+
+
+def get_list_item_annotation(annotation: ast.AST) -> Optional[ast.AST]:
+    """Returns the annotation of the items of a (possibly optional) list annotation"""
+    if (
+        isinstance(annotation, ast.Subscript)
+        and getattr(annotation.value, "id", None) == "Optional"
+    ):
+        annotation = annotation.slice
+
+    if isinstance(annotation, ast.Subscript):
+        container = getattr(annotation.value, "id", None)
+        if container == "List":
+            return annotation.slice
+        if container == "Tuple" and isinstance(annotation.slice, ast.Tuple):
+            return annotation.slice.elts[0]
+
+    return None
+
+
+def generate_list_iterator(
+    field: ast.AnnAssign,
+    target: str,
+    config: GeneratorConfig,
+    registry: ClassRegistry,
+) -> Optional[ast.FunctionDef]:
+    """Generates an `iter_<field>` classmethod for a top level list field, that
+    validates the items of the list one by one while they are decoded from the
+    chunks of a response body (through the generated `iter_json_list`)"""
+    item_annotation = get_list_item_annotation(field.annotation)
+    if item_annotation is None:
+        return None
+
+    registry.register_import("typing.Iterable")
+    registry.register_import("typing.Iterator")
+    registry.register_import("typing.Union")
+
+    item = ast.Name(id="item", ctx=ast.Load())
+    if config.pydantic_version == "v2":
+        registry.register_import("pydantic.TypeAdapter")
+        setup = [
+            ast.Assign(
+                targets=[ast.Name(id="adapter", ctx=ast.Store())],
+                value=ast.Call(
+                    func=ast.Name(id="TypeAdapter", ctx=ast.Load()),
+                    args=[item_annotation],
+                    keywords=[],
+                ),
+            )
+        ]
+        validated = ast.Call(
+            func=ast.Attribute(
+                value=ast.Name(id="adapter", ctx=ast.Load()),
+                attr="validate_python",
+                ctx=ast.Load(),
+            ),
+            args=[item],
+            keywords=[],
+        )
+    else:
+        registry.register_import("pydantic.parse_obj_as")
+        setup = []
+        validated = ast.Call(
+            func=ast.Name(id="parse_obj_as", ctx=ast.Load()),
+            args=[item_annotation, item],
+            keywords=[],
+        )
+
+    return ast.FunctionDef(
+        name=f"iter_{field.target.id}",
+        args=ast.arguments(
+            args=[
+                ast.arg(arg="cls"),
+                ast.arg(
+                    arg="chunks",
+                    annotation=ast.Subscript(
+                        value=ast.Name(id="Iterable", ctx=ast.Load()),
+                        slice=ast.Subscript(
+                            value=ast.Name(id="Union", ctx=ast.Load()),
+                            slice=ast.Tuple(
+                                elts=[
+                                    ast.Name(id="bytes", ctx=ast.Load()),
+                                    ast.Name(id="str", ctx=ast.Load()),
+                                ],
+                                ctx=ast.Load(),
+                            ),
+                            ctx=ast.Load(),
+                        ),
+                        ctx=ast.Load(),
+                    ),
+                ),
+            ],
+            posonlyargs=[],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        ),
+        body=[
+            ast.Expr(
+                value=ast.Constant(
+                    value=f"Decodes the items of {target} one by one from the chunks of a raw json response body"
+                )
+            ),
+            *setup,
+            ast.For(
+                target=ast.Name(id="item", ctx=ast.Store()),
+                iter=ast.Call(
+                    func=ast.Name(id="iter_json_list", ctx=ast.Load()),
+                    args=[
+                        ast.Name(id="chunks", ctx=ast.Load()),
+                        ast.Tuple(
+                            elts=[
+                                ast.Constant(value="data"),
+                                ast.Constant(value=target),
+                            ],
+                            ctx=ast.Load(),
+                        ),
+                    ],
+                    keywords=[],
+                ),
+                body=[ast.Expr(value=ast.Yield(value=validated))],
+                orelse=[],
+            ),
+        ],
+        decorator_list=[ast.Name(id="classmethod", ctx=ast.Load())],
+        returns=ast.Subscript(
+            value=ast.Name(id="Iterator", ctx=ast.Load()),
+            slice=item_annotation,
+            ctx=ast.Load(),
+        ),
+    )
+
+
+def generate_reserved_operation(
+    reserved: Tuple[OperationDefinitionNode, str],
+    client_schema: GraphQLSchema,
+    config: GeneratorConfig,
+    plugin_config: OperationsPluginConfig,
+    registry: ClassRegistry,
+):
+    """Generates an operation whose classname was already reserved through `register_operation`"""
+    o, class_name = reserved
+    return generate_operation(
+        o, client_schema, config, plugin_config, registry, class_name=class_name
+    )
+
+
 class OperationsPlugin(Plugin):
     """ " Generate operations as classes
 
@@ -460,6 +784,17 @@ class OperationsPlugin(Plugin):
 
     If you want to generate python functions instead, use the `funcs` plugin in ADDITION to this plugin.
 
+    Setting `parallel` will first reserve the classnames of all operations and then
+    generate the operations in a process pool.
+
+    Setting `bytes_entry_points` generates a `from_response_bytes` classmethod on every
+    operation, so that transports can hand over the raw body of a response. The body
+    is parsed with `json_loads` (set it to `orjson.loads` if orjson is installed).
+
+    Setting `streaming_lists` generates an `iter_<field>` classmethod for every top level
+    list field, that yields the validated items one by one while the body is read in
+    chunks, so that very large lists never have to be held in memory at once.
+
     """
 
     config: OperationsPluginConfig = Field(default_factory=OperationsPluginConfig)
@@ -473,7 +808,9 @@ class OperationsPlugin(Plugin):
         plugin_tree = []
 
         documents = parse_documents(
-            client_schema, self.config.operations_glob or config.documents
+            client_schema,
+            self.config.operations_glob or config.documents,
+            cache_dir=config.parse_cache_dir,
         )
 
         definitions = documents.definitions
@@ -481,6 +818,24 @@ class OperationsPlugin(Plugin):
             node for node in definitions if isinstance(node, OperationDefinitionNode)
         ]
 
+        if self.config.streaming_lists:
+            plugin_tree += generate_iter_json_list(registry)
+
+        if self.config.parallel:
+            reserved = [
+                (operation, register_operation(operation, registry))
+                for operation in operations
+            ]
+            return plugin_tree + generate_in_pool(
+                generate_reserved_operation,
+                reserved,
+                client_schema,
+                config,
+                self.config,
+                registry,
+                max_workers=self.config.max_workers,
+            )
+
         for operation in operations:
             plugin_tree += generate_operation(
                 operation, client_schema, config, self.config, registry
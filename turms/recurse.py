@@ -10,6 +10,7 @@ from turms.utils import (
     generate_generic_typename_field,
     generate_pydantic_config,
     generate_typename_field,
+    generate_union_annotation,
     get_additional_bases_for_type,
     get_interface_bases,
     non_typename_fields,
@@ -74,6 +75,7 @@ def recurse_annotation(
     if isinstance(type, GraphQLUnionType):
 
         union_class_names = []
+        union_typenames = []
 
         sub_nodes = non_typename_fields(node)
 
@@ -82,8 +84,22 @@ def recurse_annotation(
             if isinstance(sub_node, FragmentSpreadNode):
                 fragment_name = registry.inherit_fragment(sub_node.name.value)
                 union_class_names.append(fragment_name)
+                fragment_type = registry.get_fragment_type(sub_node.name.value)
+                union_typenames.append(
+                    fragment_type.name
+                    if isinstance(fragment_type, GraphQLObjectType)
+                    else None
+                )
 
             if isinstance(sub_node, InlineFragmentNode):
+                condition_type = client_schema.get_type(
+                    sub_node.type_condition.name.value
+                )
+                union_typenames.append(
+                    condition_type.name
+                    if isinstance(condition_type, GraphQLObjectType)
+                    else None
+                )
                 inline_fragment_name = (
                     f"{parent}{sub_node.type_condition.name.value}InlineFragment"
                 )
@@ -140,13 +156,8 @@ def recurse_annotation(
         ), f"You have set 'always_resolve_interfaces' to True but you have no sub-fragments in your query of {base_name}"
 
         if len(union_class_names) > 1:
-            registry.register_import("typing.Union")
-            union_slice = ast.Tuple(
-                elts=[
-                    ast.Name(id=clsname, ctx=ast.Load())
-                    for clsname in union_class_names
-                ],
-                ctx=ast.Load(),
+            union_annotation = generate_union_annotation(
+                union_class_names, union_typenames, registry, config
             )
 
             if is_optional:
@@ -154,19 +165,11 @@ def recurse_annotation(
 
                 return ast.Subscript(
                     value=ast.Name("Optional", ctx=ast.Load()),
-                    slice=ast.Subscript(
-                        value=ast.Name("Union", ctx=ast.Load()),
-                        slice=union_slice,
-                    ),
+                    slice=union_annotation,
                     ctx=ast.Load(),
                 )
             else:
-                registry.register_import("typing.Union")
-                return ast.Subscript(
-                    value=ast.Name("Union", ctx=ast.Load()),
-                    slice=union_slice,
-                    ctx=ast.Load(),
-                )
+                return union_annotation
         else:
             return ast.Name(id=union_class_names[0], ctx=ast.Load())
 
@@ -1,6 +1,8 @@
 import ast
+import copy
+from dataclasses import dataclass, field
 from keyword import iskeyword
-from typing import Dict, List
+from typing import Dict, List, Set, Tuple
 
 from turms.config import GeneratorConfig, LogFunction
 from turms.errors import (
@@ -70,6 +72,28 @@ built_in_map = {
 }  # builtin map provides the default types for any schema if they are referenced
 
 
+class RecordingLog(object):
+    """A picklable log function that records messages instead of printing them,
+    so that warnings raised in a forked registry can be replayed later"""
+
+    def __init__(self):
+        self.messages: List[Tuple[str, str]] = []
+
+    def __call__(self, message, level="INFO"):
+        self.messages.append((message, level))
+
+
+@dataclass
+class RegistryAdditions:
+    """The imports, builtins, forward references and log messages that were
+    added to a forked registry"""
+
+    imports: Set[str] = field(default_factory=set)
+    builtins: Set[str] = field(default_factory=set)
+    forward_references: Set[str] = field(default_factory=set)
+    messages: List[Tuple[str, str]] = field(default_factory=list)
+
+
 class ClassRegistry(object):
     """Class Registry is responsible for keeping track of all the classes that are generated
     as well as their names. It also keeps track of all the imports that are required for the
@@ -426,6 +450,43 @@ class ClassRegistry(object):
             allow_forward,
         )
 
+    def fork(self) -> "ClassRegistry":
+        """Creates a detached copy of the registry
+
+        The fork knows about every class that was registered up to this point,
+        but starts with empty imports, builtins and forward references. Its log
+        is recorded, so that the fork can be pickled and sent to another process.
+        Use `additions` and `merge` to bring the results back into this registry.
+        """
+        forked = copy.copy(self)
+        for key, value in vars(self).items():
+            if isinstance(value, dict):
+                setattr(forked, key, dict(value))
+
+        forked._imports = set()
+        forked._builtins = set()
+        forked.forward_references = set()
+        forked.log = RecordingLog()
+        return forked
+
+    def additions(self) -> RegistryAdditions:
+        """Returns the additions of a forked registry"""
+        return RegistryAdditions(
+            imports=set(self._imports),
+            builtins=set(self._builtins),
+            forward_references=set(self.forward_references),
+            messages=list(getattr(self.log, "messages", [])),
+        )
+
+    def merge(self, additions: RegistryAdditions):
+        """Merges the additions of a forked registry into this registry
+        and replays the recorded log messages"""
+        self._imports |= additions.imports
+        self._builtins |= additions.builtins
+        self.forward_references |= additions.forward_references
+        for message, level in additions.messages:
+            self.log(message, level=level)
+
     def register_import(self, name):
         if name in ("bool", "str", "int", "float", "dict", "list", "tuple"):
             return
@@ -445,14 +506,15 @@ class ClassRegistry(object):
                     name.split(".")[-1]
                 )
 
-        for lone_top_import in lone_top_imports:
+        # Sorted so that the output does not depend on the order of registration
+        for lone_top_import in sorted(lone_top_imports):
             imports.append(ast.Import(names=[ast.alias(name=lone_top_import)]))
 
-        for top_level_name, sub_level_names in top_level.items():
+        for top_level_name, sub_level_names in sorted(top_level.items()):
             imports.append(
                 ast.ImportFrom(
                     module=top_level_name,
-                    names=[ast.alias(name=name) for name in sub_level_names],
+                    names=[ast.alias(name=name) for name in sorted(sub_level_names)],
                     level=0,
                 )
             )
@@ -462,7 +524,7 @@ class ClassRegistry(object):
     def generate_builtins(self):
         builtins = []
 
-        for built_in in self._builtins:
+        for built_in in sorted(self._builtins):
             builtins.append(built_in_map[built_in])
 
         return builtins
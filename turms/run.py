@@ -1,13 +1,21 @@
 import ast
+import glob
+import hashlib
+import importlib.util
 import os
-from typing import Dict, List, Optional, Callable, Tuple
+import py_compile
+import shutil
+from importlib import metadata
+from typing import Any, Dict, List, Optional, Callable, Tuple
 
 import yaml
 from graphql import GraphQLSchema, parse, build_ast_schema, build_client_schema, print_ast, print_schema
-from pydantic import AnyHttpUrl, ValidationError
+from pydantic import AnyHttpUrl, BaseModel, ValidationError
 from rich import get_console
 
 from turms.config import (
+    AdvancedSchemaField,
+    BytecodeMode,
     GeneratorConfig,
     GraphQLConfigMultiple,
     GraphQLConfigSingle,
@@ -18,15 +26,23 @@ from turms.config import (
 from turms.helpers import (
     load_introspection_from_glob,
     load_introspection_from_url,
-    load_dsl_from_glob,
     load_dsl_from_url,
     import_string,
+    is_url,
 )
 from turms.plugins.base import Plugin
 from turms.parsers.base import Parser
 from turms.processors.base import Processor
 from turms.registry import ClassRegistry
+from turms.snapshot import SNAPSHOT_DIR, load_snapshot
 from turms.stylers.base import Styler
+from turms.transport import Transport
+from turms.utils import (
+    generate_warmup,
+    get_deferred_models,
+    merge_documents,
+    parse_schema_glob,
+)
 from pydantic import ValidationError
 
 from .errors import GenerationError
@@ -79,31 +95,68 @@ def get_file_loader(file_name: str) -> Callable:
         ) from err
 
 
+ENV_PREFIX = "TURMS_"
+"""The common prefix of the environment variables that are read by the configs"""
+
+_projects_cache: Dict[str, Tuple[Tuple, Dict[str, GraphQLProject]]] = {}
+
+
+def get_env_key(prefix: str = ENV_PREFIX) -> str:
+    """A hash of the environment variables that can change a loaded config"""
+    env = sorted(
+        (key.upper(), value)
+        for key, value in os.environ.items()
+        if key.upper().startswith(prefix)
+    )
+    return hashlib.sha256(json.dumps(env).encode("utf-8")).hexdigest()
+
+
 def load_projects_from_configpath(
-    config_path: str, select: str = None
+    config_path: str, select: str = None, cache: bool = True
 ) -> Dict[str, GraphQLProject]:
     """Loads the configuration from a configuration file
 
+    The validated projects are cached (per process) by the modification time of the
+    file and the turms environment variables, as validating the nested settings is
+    slow. Every call returns copies, so the projects can be changed.
+
     Args:
         config_path (str): The path to the config file
+        select (str, optional): Only return the project with this name.
+        cache (bool, optional): Use (and fill) the cache. Defaults to True.
 
     Returns:
         GraphQLConfig: The configuration
     """
     file_path, file_name = os.path.split(config_path)
 
-    with open(config_path, "r", encoding="utf-8") as file:
-        loaded_dict = get_file_loader(config_path)(file)
+    cache_path = os.path.abspath(config_path)
+    stat = os.stat(config_path)
+    cache_key = (stat.st_mtime_ns, stat.st_size, get_env_key())
+    cached = _projects_cache.get(cache_path) if cache else None
 
-    try:
-        if "projects" in loaded_dict:
-            projects = GraphQLConfigMultiple(**loaded_dict).projects
-        else:
-            projects = {"default": GraphQLConfigSingle(**loaded_dict)}
-    except ValidationError as err:
-        raise GenerationError(
-            f"File {file_name} at {file_path} does not conform with turms."
-        ) from err
+    if cached and cached[0] == cache_key:
+        projects = cached[1]
+    else:
+        with open(config_path, "r", encoding="utf-8") as file:
+            loaded_dict = get_file_loader(config_path)(file)
+
+        try:
+            if "projects" in loaded_dict:
+                projects = GraphQLConfigMultiple(**loaded_dict).projects
+            else:
+                projects = {"default": GraphQLConfigSingle(**loaded_dict)}
+        except ValidationError as err:
+            raise GenerationError(
+                f"File {file_name} at {file_path} does not conform with turms."
+            ) from err
+
+        if cache:
+            _projects_cache[cache_path] = (cache_key, projects)
+
+    projects = {
+        key: project.model_copy(deep=True) for key, project in projects.items()
+    }
 
     if select:
         projects = {key: project for key, project in projects.items() if key == select}
@@ -156,6 +209,45 @@ def scan_folder_for_single_config(folder_path: str = None) -> str:
     return configs[0]
 
 
+def write_if_changed(path: str, content: str) -> bool:
+    """Writes content to a file, unless the file already has this content
+
+    Unchanged files are not touched, so that their mtime (and with it .pyc
+    caches and file watchers, like reloading servers) are not invalidated. Changed
+    files are written to a temporary file first and then moved in place, so that
+    readers never see a half-written file.
+
+    Args:
+        path (str): The path of the file
+        content (str): The content (written with the newlines of the platform)
+
+    Returns:
+        bool: True if the file was written, False if it was unchanged
+    """
+    data = content.replace("\n", os.linesep).encode("utf-8")
+
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as file:
+                if file.read() == data:
+                    return False
+    except OSError:
+        pass
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return True
+
+
 def write_code_to_file(code: str, outdir: str, filepath: str):
     if not os.path.isdir(outdir):  # pragma: no cover
         os.makedirs(outdir)
@@ -165,17 +257,13 @@ def write_code_to_file(code: str, outdir: str, filepath: str):
         filepath,
     )
 
-    with open(
-        generated_file,
-        "w",
-        encoding="utf-8",
-    ) as file:
-        file.write(code)
-
+    write_if_changed(generated_file, code)
     return generated_file
 
 
-def write_schema_to_file(schema: GraphQLSchema, outdir: str, filepath: str):
+def write_schema_to_file(
+    schema: GraphQLSchema, outdir: str, filepath: str, sdl: Optional[str] = None
+):
     if not os.path.isdir(outdir):  # pragma: no cover
         os.makedirs(outdir)
 
@@ -184,13 +272,7 @@ def write_schema_to_file(schema: GraphQLSchema, outdir: str, filepath: str):
         filepath,
     )
 
-    with open(
-        generated_file,
-        "w",
-        encoding="utf-8",
-    ) as file:
-        file.write(print_schema(schema))
-
+    write_if_changed(generated_file, sdl if sdl is not None else print_schema(schema))
     return generated_file
 
 
@@ -203,16 +285,287 @@ def write_project(project: GraphQLProject, outdir: str, filepath: str):
         filepath,
     )
 
-    with open(
-        generated_file,
-        "w",
-        encoding="utf-8",
-    ) as file:
-        file.write(project.model_dump_json(indent=4))
+    write_if_changed(generated_file, project.model_dump_json(indent=4))
+    return generated_file
+
+
+def is_bytecode_fresh(generated_file: str, cfile: str, mode: BytecodeMode) -> bool:
+    """Checks if the .pyc of a module was compiled (with the given invalidation
+    mode) from the current source, by comparing the header of the .pyc"""
+    try:
+        with open(cfile, "rb") as file:
+            header = file.read(16)
+    except OSError:
+        return False
+
+    if len(header) < 16 or header[:4] != importlib.util.MAGIC_NUMBER:
+        return False
+
+    flags = int.from_bytes(header[4:8], "little")
+    if mode == "timestamp":
+        stat = os.stat(generated_file)
+        return flags == 0 and header[8:16] == (
+            (int(stat.st_mtime) & 0xFFFFFFFF).to_bytes(4, "little")
+            + (stat.st_size & 0xFFFFFFFF).to_bytes(4, "little")
+        )
+
+    with open(generated_file, "rb") as file:
+        source_hash = importlib.util.source_hash(file.read())
+    return flags == (0b11 if mode == "checked-hash" else 0b01) and (
+        header[8:16] == source_hash
+    )
+
+
+def compile_bytecode(generated_file: str, mode: BytecodeMode = "timestamp") -> str:
+    """Compiles a generated module to its .pyc (where the import system looks for
+    it), unless the .pyc is still up to date
+
+    Args:
+        generated_file (str): The path of the generated module
+        mode (BytecodeMode, optional): The invalidation mode of the .pyc. Defaults to "timestamp".
+
+    Returns:
+        str: The path of the .pyc
+    """
+    cfile = importlib.util.cache_from_source(generated_file)
+    if not is_bytecode_fresh(generated_file, cfile, mode):
+        py_compile.compile(
+            generated_file,
+            cfile=cfile,
+            doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode[
+                mode.upper().replace("-", "_")
+            ],
+        )
+    return cfile
+
+
+def get_turms_version() -> str:
+    try:
+        return metadata.version("turms")
+    except metadata.PackageNotFoundError:  # pragma: no cover
+        return "unknown"
+
+
+def get_document_globs(gen_config: GeneratorConfig, project: GraphQLProject) -> List[str]:
+    """Returns all globs that plugins of this project could load documents from"""
+    globs = [gen_config.documents or project.documents]
+
+    for plugin_config in gen_config.plugins:
+        for key, value in plugin_config.model_dump().items():
+            if key.endswith("_glob") and isinstance(value, str):
+                globs.append(value)
+
+    return [document_glob for document_glob in globs if document_glob]
+
+
+def generation_hash(
+    project: GraphQLProject,
+    schema: GraphQLSchema,
+    schemas: Optional["SchemaRegistry"] = None,
+) -> str:
+    """Computes a hash over all inputs of the generation
+
+    The hash covers the resolved generator configuration (including all plugin,
+    parser, styler and processor configs), the turms version, the schema sdl
+    and the content of all document files.
+
+    Args:
+        project (GraphQLProject): The project
+        schema (GraphQLSchema): The schema of the project
+        schemas (SchemaRegistry, optional): The registry to print the schema with. Defaults to None.
+
+    Returns:
+        str: The hex digest of the hash
+    """
+    gen_config = project.extensions.turms
+
+    resolved_config = gen_config.model_dump(mode="json")
+    resolved_config["documents"] = gen_config.documents or project.documents
+
+    hasher = hashlib.sha256()
+    hasher.update(get_turms_version().encode("utf-8"))
+    hasher.update(json.dumps(resolved_config, sort_keys=True).encode("utf-8"))
+    sdl = schemas.print_schema(schema) if schemas else print_schema(schema)
+    hasher.update(sdl.encode("utf-8"))
+
+    files = set()
+    for document_glob in get_document_globs(gen_config, project):
+        files.update(glob.glob(document_glob, recursive=True))
+
+    for file in sorted(files):
+        hasher.update(file.encode("utf-8"))
+        with open(file, "rb") as f:
+            hasher.update(hashlib.sha256(f.read()).digest())
+
+    return hasher.hexdigest()
+
+
+def get_hash_name(gen_config: GeneratorConfig) -> str:
+    return gen_config.hash_name or f".{gen_config.generated_name}.hash"
+
+
+def output_hash(generated_code: str) -> str:
+    """Computes the hash of the generated code, to detect changes of the written file"""
+    return hashlib.sha256(generated_code.encode("utf-8")).hexdigest()
+
+
+def read_generation_hashes(
+    gen_config: GeneratorConfig, outdir: Optional[str] = None
+) -> Tuple[Optional[str], Optional[str]]:
+    """Reads the generation hash and the hash of the generated code, that are stored
+    next to the generated file (if any)"""
+    hash_file = os.path.join(outdir or gen_config.out_dir, get_hash_name(gen_config))
+
+    if not os.path.exists(hash_file):
+        return None, None
+
+    with open(hash_file, "r", encoding="utf-8") as file:
+        lines = file.read().split()
+
+    return (lines[0] if lines else None), (lines[1] if len(lines) > 1 else None)
+
+
+def read_generation_hash(
+    gen_config: GeneratorConfig, outdir: Optional[str] = None
+) -> Optional[str]:
+    """Reads the generation hash stored next to the generated file (if any)"""
+    return read_generation_hashes(gen_config, outdir)[0]
+
+
+def write_generation_hash(
+    project: GraphQLProject,
+    schema: GraphQLSchema,
+    outdir: Optional[str] = None,
+    schemas: Optional["SchemaRegistry"] = None,
+    generated_code: Optional[str] = None,
+):
+    """Writes the generation hash next to the generated file, followed by the hash
+    of the generated code (if given), so that changes of the written file are noticed"""
+    gen_config = project.extensions.turms
+    hashes = [generation_hash(project, schema, schemas)]
+    if generated_code is not None:
+        hashes.append(output_hash(generated_code))
+
+    return write_code_to_file(
+        "\n".join(hashes),
+        outdir or gen_config.out_dir,
+        get_hash_name(gen_config),
+    )
+
+
+def is_generation_cached(
+    project: GraphQLProject,
+    schema: GraphQLSchema,
+    outdir: Optional[str] = None,
+    schemas: Optional["SchemaRegistry"] = None,
+) -> bool:
+    """Checks if the stored hashes match both the inputs of the generation and the
+    generated file on disk (which could have been edited or deleted)"""
+    gen_config = project.extensions.turms
+    outdir = outdir or gen_config.out_dir
+    generated_file = os.path.join(outdir, gen_config.generated_name)
+
+    stored_hash, stored_output_hash = read_generation_hashes(gen_config, outdir)
+    if stored_hash is None or stored_output_hash is None:
+        return False
+
+    if not os.path.exists(generated_file):
+        return False
+
+    with open(generated_file, "r", encoding="utf-8") as file:
+        if output_hash(file.read()) != stored_output_hash:
+            return False
+
+    return stored_hash == generation_hash(project, schema, schemas)
+
+
+def write_generation(
+    project: GraphQLProject,
+    generated_code: str,
+    schema: GraphQLSchema,
+    outdir: Optional[str] = None,
+    schemas: Optional["SchemaRegistry"] = None,
+):
+    """Writes the generated code of a project, as well as the schema, the
+    configuration and the generation hash if enabled in the config
+
+    Args:
+        project (GraphQLProject): The project
+        generated_code (str): The generated code
+        schema (GraphQLSchema): The schema that was used for the generation
+        outdir (Optional[str], optional): Overwrites the out_dir of the project. Defaults to None.
+        schemas (SchemaRegistry, optional): The registry of the run, to print shared schemas once. Defaults to None.
+    """
+    schemas = schemas or SchemaRegistry()
+    gen_config = project.extensions.turms
+    outdir = outdir or gen_config.out_dir
+
+    generated_file = write_code_to_file(
+        generated_code,
+        outdir,
+        gen_config.generated_name,
+    )
+
+    if gen_config.compile_bytecode:
+        compile_bytecode(generated_file, gen_config.compile_bytecode)
+
+    if gen_config.dump_schema:
+        write_schema_to_file(
+            schema, outdir, gen_config.schema_name, sdl=schemas.print_schema(schema)
+        )
+
+    if gen_config.dump_configuration:
+        write_project(project, outdir, gen_config.configuration_name)
+
+    if gen_config.cache:
+        write_generation_hash(project, schema, outdir, schemas, generated_code)
 
     return generated_file
 
 
+def is_up_to_date(
+    project: GraphQLProject,
+    log: Optional[LogFunction] = None,
+    schemas: Optional["SchemaRegistry"] = None,
+    outdir: Optional[str] = None,
+) -> bool:
+    """Checks if the generated code of a project is up to date, without writing anything
+
+    If a generation hash is stored next to the generated file, only the hashes
+    (of the inputs and of the generated file) are compared. Otherwise the code is
+    generated in memory and compared with the generated file.
+
+    Args:
+        project (GraphQLProject): The project
+        schemas (SchemaRegistry, optional): The registry of the run. Defaults to None.
+        outdir (Optional[str], optional): Overwrites the out_dir of the project. Defaults to None.
+
+    Returns:
+        bool: True if the generated code is up to date
+    """
+    gen_config = project.extensions.turms
+    outdir = outdir or gen_config.out_dir
+    generated_file = os.path.join(outdir, gen_config.generated_name)
+
+    if not os.path.exists(generated_file):
+        return False
+
+    schemas = schemas or SchemaRegistry()
+
+    if read_generation_hash(gen_config, outdir) is not None:
+        schema = schemas.get_schema(
+            project.schema_url,
+            allow_introspection=gen_config.allow_introspection,
+            use_snapshots=gen_config.use_snapshots,
+        )
+        return is_generation_cached(project, schema, outdir, schemas)
+
+    generated_code, _ = generate(project, log=log, schemas=schemas, outdir=outdir)
+    with open(generated_file, "r", encoding="utf-8") as file:
+        return file.read() == generated_code
+
+
 def gen(
     filepath: Optional[str] = None,
     project_name: Optional[str] = None,
@@ -230,6 +583,7 @@ def gen(
         filepath = scan_folder_for_single_config()
 
     projects = load_projects_from_configpath(filepath, project_name)
+    schemas = SchemaRegistry()
 
     for key, project in projects.items():
         try:
@@ -237,29 +591,13 @@ def gen(
                 f"-------------- Generating project: {key} --------------"
             )
 
-            generated_code = generate(project)
-
-            write_code_to_file(
-                generated_code,
-                overwrite_path or project.extensions.turms.out_dir,
-                project.extensions.turms.generated_name,
+            generated_code, schema = generate(
+                project, schemas=schemas, outdir=overwrite_path
             )
 
-            if project.extensions.turms.dump_schema:
-                schema = build_schema_from_schema_type(
-                            project.schema_url,
-                            allow_introspection=project.extensions.turms.allow_introspection,
-                        )
-                
-                write_schema_to_file(schema, project.extensions.turms.out_dir, project.extensions.turms.schema_name)
-
-            if project.extensions.turms.dump_configuration:
-                write_project(project, project.extensions.turms.out_dir, project.extensions.turms.configuration_name)
-
-
-
-
-
+            write_generation(
+                project, generated_code, schema, overwrite_path, schemas=schemas
+            )
 
             get_console().print("Sucessfull!! :right-facing_fist::left-facing_fist:")
         except Exception as e:
@@ -285,30 +623,120 @@ def instantiate(module_path: str, **kwargs):
     return import_string(module_path)(**kwargs)
 
 
-def is_url(url: str) -> bool:
-    return url.startswith("http") or url.startswith("https")
+def get_schema_key(schema: SchemaType) -> str:
+    """A key that is equal for schema types that point to the same urls or globs
+    with the same headers, e.g. to fetch a schema shared by many projects once"""
+
+    def normalize(value):
+        if isinstance(value, list):
+            if len(value) == 1:
+                # Single schemas in a list are built like the schema itself
+                return normalize(value[0])
+            return [normalize(item) for item in value]
+        if isinstance(value, dict):
+            return {str(key): normalize(item) for key, item in value.items()}
+        if isinstance(value, BaseModel):
+            return normalize(value.model_dump())
+        return str(value)
+
+    return json.dumps(normalize(schema), sort_keys=True)
+
+
+class SchemaRegistry:
+    """Builds every distinct schema of a run only once
+
+    Schemas are keyed by their normalized schema type (urls, globs and headers, see
+    `get_schema_key`), so that projects pointing to the same schema share one
+    (immutable) GraphQLSchema. The printed sdl of a schema is cached as well, as it
+    is needed for the generation hash and when dumping the schema.
+    """
+
+    def __init__(self, transport: Optional[Transport] = None):
+        self.transport = transport
+        self._schemas: Dict[Tuple[str, bool, bool], GraphQLSchema] = {}
+        self._sdls: Dict[int, Tuple[GraphQLSchema, str]] = {}
+
+    def get_schema(
+        self,
+        schema: SchemaType,
+        allow_introspection: bool = False,
+        use_snapshots: bool = False,
+    ) -> GraphQLSchema:
+        """Returns the schema for a schema type, building it (or loading it from its
+        snapshot, if enabled) on first request"""
+        key = (get_schema_key(schema), allow_introspection, use_snapshots)
+        if key not in self._schemas:
+            self._schemas[key] = build_schema_from_schema_type(
+                schema,
+                allow_introspection=allow_introspection,
+                transport=self.transport,
+                snapshot_dir=SNAPSHOT_DIR if use_snapshots else None,
+            )
+        return self._schemas[key]
+
+    def print_schema(self, schema: GraphQLSchema) -> str:
+        """Returns the sdl of a schema, printing it on first request"""
+        # The schema is kept alongside its sdl, so that its id can not be reused
+        if id(schema) not in self._sdls:
+            self._sdls[id(schema)] = (schema, print_schema(schema))
+        return self._sdls[id(schema)][1]
+
+
+def get_transport_options(field: AdvancedSchemaField) -> Dict[str, Any]:
+    """The options of an advanced schema field that are passed to the transport"""
+    return {
+        "timeout": field.timeout,
+        "retries": field.retries,
+        "backoff": field.backoff,
+    }
 
 
 def build_schema_from_schema_type(
-    schema: SchemaType, allow_introspection: bool = False
+    schema: SchemaType,
+    allow_introspection: bool = False,
+    transport: Optional[Transport] = None,
+    snapshot_dir: Optional[str] = None,
 ) -> GraphQLSchema:
     """Builds a schema from a project
 
+    If a snapshot directory is given, local schemas are loaded from their snapshot
+    (see `turms download --snapshot`) if there is one and their files did not
+    change since.
+
     Args:
         project (GraphQLProject): The project
+        transport (Transport, optional): The transport for schemas loaded from urls
+            (e.g. to share a connection pool). Defaults to the default transport.
+        snapshot_dir (str, optional): The directory of the snapshots (e.g.
+            SNAPSHOT_DIR), None to always build the schema. Defaults to None.
 
     Returns:
         GraphQLSchema: The schema
     """
+    if snapshot_dir:
+        snapshot = load_snapshot(schema, snapshot_dir)
+        if snapshot is not None:
+            return snapshot
+
     if isinstance(schema, dict):
         if len(schema.values()) == 1:
             key, value = list(schema.items())[0]
             try:
-                dsl_string = load_dsl_from_url(key, value.headers)
+                dsl_string = load_dsl_from_url(
+                    key,
+                    value.headers,
+                    transport=transport,
+                    **get_transport_options(value),
+                )
                 return build_ast_schema(parse(dsl_string))
             except Exception as e:
                 if allow_introspection:
-                    intropection = load_introspection_from_url(key, value.headers)
+                    intropection = load_introspection_from_url(
+                        key,
+                        value.headers,
+                        transport=transport,
+                        **get_transport_options(value),
+                    )
                     return build_client_schema(intropection)
                 raise e
         else:
@@ -316,45 +744,68 @@ def build_schema_from_schema_type(
             dsl_subschemas = []
 
             for key, value in schema.items():
-                dsl_subschemas.append(load_dsl_from_url(key, value.headers))
+                dsl_subschemas.append(
+                    parse(
+                        load_dsl_from_url(
+                            key,
+                            value.headers,
+                            transport=transport,
+                            **get_transport_options(value),
+                        )
+                    )
+                )
 
-            return build_ast_schema(parse(" ".join(dsl_subschemas)))
+            return build_ast_schema(merge_documents(dsl_subschemas))
 
     if isinstance(schema, list):
         if len(schema) == 1:
             # Only one schema, probably because of aesthetic reasons
             return build_schema_from_schema_type(
-                schema[0], allow_introspection=allow_introspection
+                schema[0],
+                allow_introspection=allow_introspection,
+                transport=transport,
+                snapshot_dir=None,
             )
 
         else:
             dsl_subschemas = []
 
+            # Every subschema is parsed on its own and their definitions are merged
             for item in schema:
-                if is_url(item):
-                    dsl_subschemas.append(load_dsl_from_url(item))
                 if isinstance(item, dict):
                     for key, value in item.items():
-                        dsl_subschemas.append(load_dsl_from_url(key, value.headers))
-                if isinstance(item, str):
-                    dsl_subschemas.append(load_dsl_from_glob(item))
+                        dsl_subschemas.append(
+                            parse(
+                                load_dsl_from_url(
+                                    key,
+                                    value.headers,
+                                    transport=transport,
+                                    **get_transport_options(value),
+                                )
+                            )
+                        )
+                elif is_url(item):
+                    dsl_subschemas.append(
+                        parse(load_dsl_from_url(item, transport=transport))
+                    )
+                elif isinstance(item, str):
+                    dsl_subschemas.append(parse_schema_glob(item))
 
-            return build_ast_schema(parse(" ".join(dsl_subschemas)))
+            return build_ast_schema(merge_documents(dsl_subschemas))
 
     if is_url(schema):
         try:
-            dsl_string = load_dsl_from_url(schema)
+            dsl_string = load_dsl_from_url(schema, transport=transport)
             return build_ast_schema(parse(dsl_string))
         except Exception as e:
             if allow_introspection:
-                intropection = load_introspection_from_url(schema)
+                intropection = load_introspection_from_url(schema, transport=transport)
                 return build_client_schema(intropection)
             raise e
 
     if isinstance(schema, str):
         try:
-            dsl_string = load_dsl_from_glob(schema)
-            return build_ast_schema(parse(dsl_string))
+            return build_ast_schema(parse_schema_glob(schema))
         except Exception as e:
             if allow_introspection:
                 intropection = load_introspection_from_glob(schema)
@@ -364,7 +815,12 @@ def build_schema_from_schema_type(
     raise GenerationError("Could not build schema with type " + str(type(schema)))
 
 
-def generate(project: GraphQLProject, log: Optional[LogFunction] = None) -> Tuple[str, GraphQLSchema ]:
+def generate(
+    project: GraphQLProject,
+    log: Optional[LogFunction] = None,
+    schemas: Optional[SchemaRegistry] = None,
+    outdir: Optional[str] = None,
+) -> Tuple[str, GraphQLSchema]:
     """Genrates the code according to the configugration
 
     The code is generated in the following order:
@@ -378,6 +834,10 @@ def generate(project: GraphQLProject, log: Optional[LogFunction] = None) -> Tupl
 
     Args:
         project (GraphQLConfig): The configuraion for the generation
+        schemas (SchemaRegistry, optional): The registry of the run, so that projects
+            share their schemas. Defaults to None.
+        outdir (Optional[str], optional): The directory the code will be written to, if
+            it overwrites the out_dir of the project (for the cache). Defaults to None.
 
     Returns:
         str: The generated code
@@ -389,14 +849,27 @@ def generate(project: GraphQLProject, log: Optional[LogFunction] = None) -> Tupl
 
     gen_config = project.extensions.turms
 
-    schema = build_schema_from_schema_type(
+    schemas = schemas or SchemaRegistry()
+    schema = schemas.get_schema(
         project.schema_url,
-        allow_introspection=project.extensions.turms.allow_introspection,
+        allow_introspection=gen_config.allow_introspection,
+        use_snapshots=gen_config.use_snapshots,
     )
 
     gen_config.documents = gen_config.documents or project.documents
     verbose = gen_config.verbose
 
+    if gen_config.cache:
+        outdir = outdir or gen_config.out_dir
+        generated_file = os.path.join(outdir, gen_config.generated_name)
+        if is_generation_cached(project, schema, outdir, schemas):
+            log(
+                f"Inputs did not change. Skipping generation of {generated_file}",
+                level="INFO",
+            )
+            with open(generated_file, "r", encoding="utf-8") as file:
+                return file.read(), schema
+
     plugins = []
     stylers = []
     parsers = []
@@ -487,6 +960,13 @@ def generate_ast(
                 f"{plugin.__class__.__name__} failed!\n {str(e)}"
             ) from e
 
+    # Deferred models resolve their forward references when they are first built
+    deferred = get_deferred_models(global_tree)
+    registry.forward_references -= set(deferred)
+
+    if deferred and config.defer_build.warmup:
+        global_tree += generate_warmup(deferred, registry)
+
     global_tree = (
         registry.generate_imports() + registry.generate_builtins() + global_tree
     )
@@ -0,0 +1,193 @@
+import glob
+import hashlib
+import hmac
+import io
+import json
+import os
+import pickle
+import secrets
+from typing import Dict, List, Optional, Tuple
+
+from graphql import GraphQLSchema
+from graphql import version as graphql_version
+from graphql.language import Location
+
+from turms.config import SchemaType
+from turms.helpers import is_url
+
+
+SNAPSHOT_VERSION = 2
+"""The version of the snapshot format, snapshots of other versions are ignored"""
+
+SNAPSHOT_DIR = os.path.join(".turms", "snapshots")
+"""The directory (relative to the working directory) that snapshots are stored in"""
+
+SNAPSHOT_KEY_PATH = os.path.join(os.path.expanduser("~"), ".turms", "snapshot.key")
+"""The secret key (of the user, outside of any project) that snapshots are signed with"""
+
+
+class SnapshotPickler(pickle.Pickler):
+    """Pickles a schema without the source locations of its ast nodes, which make
+    up more than half of the pickle and are not needed for the generation"""
+
+    def reducer_override(self, obj):
+        if obj.__class__ is Location:
+            return type(None), ()
+        return NotImplemented
+
+
+def get_local_globs(schema: SchemaType) -> Optional[List[str]]:
+    """The globs of a schema that is only loaded from local files (sdl or
+    introspection), or None if any part of it is loaded from a url"""
+    items = schema if isinstance(schema, list) else [schema]
+    if not items or any(not isinstance(item, str) or is_url(item) for item in items):
+        return None
+    return items
+
+
+def get_snapshot_path(globs: List[str], snapshot_dir: str = SNAPSHOT_DIR) -> str:
+    key = hashlib.sha256(json.dumps(globs).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(snapshot_dir, f"{key}.schema.snapshot")
+
+
+def hash_sources(globs: List[str]) -> Dict[str, str]:
+    """The sha256 of every file matched by the globs"""
+    sources = {}
+    for file in sorted(
+        {file for item in globs for file in glob.glob(item, recursive=True)}
+    ):
+        with open(file, "rb") as f:
+            sources[file] = hashlib.sha256(f.read()).hexdigest()
+    return sources
+
+
+def get_snapshot_key(create: bool = False) -> Optional[bytes]:
+    """Reads the key that snapshots are signed with, creating it if requested"""
+    try:
+        with open(SNAPSHOT_KEY_PATH, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        if not create:
+            return None
+
+    os.makedirs(os.path.dirname(SNAPSHOT_KEY_PATH), exist_ok=True)
+    try:
+        fd = os.open(SNAPSHOT_KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Created concurrently by another process
+        return get_snapshot_key()
+
+    key = secrets.token_bytes(32)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def sign_snapshot(key: bytes, data: bytes) -> str:
+    return hmac.new(key, data, hashlib.sha256).hexdigest()
+
+
+def write_signed_file(path: str, data: bytes, header: Optional[Dict] = None):
+    """Writes data to a file (atomically), preceded by a json header with the hmac
+    digest of the data (signed with the key of the user, see `get_snapshot_key`)"""
+    header = dict(
+        header or {}, digest=sign_snapshot(get_snapshot_key(create=True), data)
+    )
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def read_signed_file(path: str) -> Optional[Tuple[Dict, bytes]]:
+    """Reads the header and the data of a file written by `write_signed_file`
+
+    Returns None if the file does not exist, is corrupt or was not signed by the
+    current user (e.g. a file planted in a shared or committed directory), so that
+    only verified data is ever unpickled."""
+    key = get_snapshot_key()
+    if key is None:
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            data = f.read()
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(header, dict) or not hmac.compare_digest(
+        str(header.get("digest")), sign_snapshot(key, data)
+    ):
+        return None
+    return header, data
+
+
+def write_snapshot(
+    schema: SchemaType, built_schema: GraphQLSchema, snapshot_dir: str = SNAPSHOT_DIR
+) -> Optional[str]:
+    """Writes a snapshot of a built schema, that `load_snapshot` returns for as long
+    as the source files of the schema do not change
+
+    The snapshot consists of a json header (the snapshot and graphql-core versions,
+    the hashes of all source files and the digest of the pickle) followed by the
+    pickled schema. The digest is an hmac with a key of the user (stored outside of
+    the project), so that snapshots that were not written by this user (e.g. committed
+    to a repository) are never unpickled.
+
+    Args:
+        schema (SchemaType): The schema type the schema was built from
+        built_schema (GraphQLSchema): The built schema
+        snapshot_dir (str, optional): The snapshot directory. Defaults to SNAPSHOT_DIR.
+
+    Returns:
+        Optional[str]: The path of the snapshot, or None if the schema is not local
+    """
+    globs = get_local_globs(schema)
+    if globs is None:
+        return None
+
+    buffer = io.BytesIO()
+    SnapshotPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(built_schema)
+    data = buffer.getvalue()
+
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "graphql_version": graphql_version,
+        "sources": hash_sources(globs),
+    }
+
+    path = get_snapshot_path(globs, snapshot_dir)
+    os.makedirs(snapshot_dir, exist_ok=True)
+    write_signed_file(path, data, header)
+    return path
+
+
+def load_snapshot(
+    schema: SchemaType, snapshot_dir: str = SNAPSHOT_DIR
+) -> Optional[GraphQLSchema]:
+    """Loads the snapshot of a local schema, if there is one, its source files did not
+    change and its digest matches (a corrupt, outdated or foreign snapshot is just a
+    miss). The pickle is only loaded after its digest was verified."""
+    globs = get_local_globs(schema)
+    if globs is None:
+        return None
+
+    signed = read_signed_file(get_snapshot_path(globs, snapshot_dir))
+    if signed is None:
+        return None
+
+    header, data = signed
+    if (
+        header.get("version") != SNAPSHOT_VERSION
+        or header.get("graphql_version") != graphql_version
+        or header.get("sources") != hash_sources(globs)
+    ):
+        return None
+
+    try:
+        return pickle.loads(data)
+    except Exception:
+        return None
@@ -0,0 +1,186 @@
+import ast
+import inspect
+from codecs import getincrementaldecoder
+from json import JSONDecodeError, JSONDecoder
+from typing import Any, Iterable, Iterator, List, Tuple, Union
+
+from turms.registry import ClassRegistry
+
+
+class JSONChunkTokenizer:
+    """Reads the tokens and values of a json document from an iterable of chunks
+    (e.g. the body of a streamed http response), holding only the unread part of the
+    current chunk (and the value that is being decoded) in memory"""
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]], encoding: str = "utf-8"):
+        if isinstance(chunks, (bytes, str)):
+            chunks = [chunks]
+        self.chunks = iter(chunks)
+        self.decoder = JSONDecoder()
+        self.text_decoder = getincrementaldecoder(encoding)()
+        self.buffer = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def read(self, size: int = 0):
+        """Reads at least one chunk, and more until `size` characters are unread"""
+        texts = [self.buffer[self.pos :]]
+        unread = len(texts[0])
+        while True:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.exhausted = True
+                text = self.text_decoder.decode(b"", final=True)
+            elif isinstance(chunk, bytes):
+                text = self.text_decoder.decode(chunk)
+            else:
+                text = chunk
+            texts.append(text)
+            unread += len(text)
+            if self.exhausted or unread >= size:
+                break
+        self.buffer = "".join(texts)
+        self.pos = 0
+
+    def skip_whitespace(self) -> bool:
+        """Skips whitespace, returns False at the end of the document"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return True
+            if self.exhausted:
+                return False
+            self.read()
+
+    def peek(self) -> str:
+        if not self.skip_whitespace():
+            raise ValueError("Unexpected end of the json document")
+        return self.buffer[self.pos]
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} but found {self.buffer[self.pos]!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decodes the next value as a whole (by the C scanner of the json module)"""
+        self.peek()
+        while True:
+            try:
+                result, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except JSONDecodeError:
+                if self.exhausted:
+                    raise
+                # Only decode again once the unread part doubled, so that a value
+                # spanning many chunks is not decoded from its start for every chunk
+                self.read(2 * (len(self.buffer) - self.pos))
+                continue
+            # A number at the end of the buffer might be cut off (e.g. "1." of "1.5")
+            if self.exhausted or (
+                end < len(self.buffer) and self.buffer[end] not in "+-.0123456789Ee"
+            ):
+                self.pos = end
+                return result
+            self.read()
+
+
+def iter_json_list(
+    chunks: Iterable[Union[bytes, str]], path: Tuple[str, ...]
+) -> Iterator[Any]:
+    """Yields the items of the json list at path (a tuple of object keys) one by one,
+    while reading the json document from an iterable of chunks (e.g. the body of a
+    streamed http response). Only the current item and the unread part of the current
+    chunk are held in memory. Yields nothing if the list is null."""
+    tokens = JSONChunkTokenizer(chunks)
+
+    for key in path:
+        if tokens.peek() == "n" and tokens.value() is None:
+            raise ValueError(f"Expected an object containing {key!r} but found null")
+        tokens.expect("{")
+        while True:
+            if tokens.peek() == "}":
+                raise KeyError(key)
+            name = tokens.value()
+            tokens.expect(":")
+            if name == key:
+                break
+            tokens.value()
+            if tokens.peek() != ",":
+                tokens.expect("}")
+                raise KeyError(key)
+            tokens.expect(",")
+
+    if tokens.peek() == "n" and tokens.value() is None:
+        return
+
+    tokens.expect("[")
+    if tokens.peek() == "]":
+        return
+
+    while True:
+        yield tokens.value()
+        if tokens.peek() != ",":
+            tokens.expect("]")
+            return
+        tokens.expect(",")
+
+
+def load_json_stream(chunks: Iterable[Union[bytes, str]], split_depth: int = 3) -> Any:
+    """Decodes a json document from an iterable of chunks (e.g. a file read in blocks
+    or a streamed http response), without holding the whole document as bytes or text
+
+    Objects and arrays up to `split_depth` are decoded member by member and everything
+    below in one go (by the C scanner of the json module), so that besides the result
+    only the unread part of the current chunk and the member being decoded are held in
+    memory. The default depth splits introspection results by type (responses that are
+    wrapped in "data" need a depth of 4).
+    """
+    tokens = JSONChunkTokenizer(chunks, encoding="utf-8-sig")
+
+    def member(depth: int) -> Any:
+        start = tokens.peek()
+        if depth >= split_depth or start not in "{[":
+            return tokens.value()
+
+        tokens.pos += 1
+        end = "}" if start == "{" else "]"
+        result = {} if start == "{" else []
+        if tokens.peek() == end:
+            tokens.pos += 1
+            return result
+
+        while True:
+            if start == "{":
+                key = tokens.value()
+                tokens.expect(":")
+                result[key] = member(depth + 1)
+            else:
+                result.append(member(depth + 1))
+            if tokens.peek() != ",":
+                tokens.expect(end)
+                return result
+            tokens.expect(",")
+
+    document = member(0)
+    if tokens.skip_whitespace():
+        raise ValueError("Extra data after the json document")
+    return document
+
+
+def generate_iter_json_list(registry: ClassRegistry) -> List[ast.stmt]:
+    """Generates the source of `iter_json_list` (and of the `JSONChunkTokenizer` it
+    uses), so that generated modules can decode lists incrementally without depending
+    on turms at runtime"""
+    registry.register_import("codecs.getincrementaldecoder")
+    registry.register_import("json.JSONDecodeError")
+    registry.register_import("json.JSONDecoder")
+    registry.register_import("typing.Any")
+    registry.register_import("typing.Iterable")
+    registry.register_import("typing.Iterator")
+    registry.register_import("typing.Tuple")
+    registry.register_import("typing.Union")
+    return [
+        ast.parse(inspect.getsource(JSONChunkTokenizer)).body[0],
+        ast.parse(inspect.getsource(iter_json_list)).body[0],
+    ]
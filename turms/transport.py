@@ -0,0 +1,139 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, Optional
+
+from turms.errors import GenerationError
+
+
+DEFAULT_TIMEOUT = 30.0
+"""Seconds to wait for a connection or for data from a schema endpoint"""
+DEFAULT_RETRIES = 2
+"""How often a failed request (connection errors, timeouts, 429 and 5xx) is retried"""
+DEFAULT_BACKOFF = 0.5
+"""Seconds to wait before the first retry, doubled for every further retry"""
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TransportError(GenerationError):
+    """Raised when a schema endpoint could not be reached or answered with an error"""
+
+    pass
+
+
+class Transport(ABC):
+    """Base class for the http transports of the schema loaders
+
+    A transport sends a request and returns the (decoded) body of the response as
+    an iterator of byte chunks, so that big responses (e.g. introspection results)
+    can be streamed. Tests can pass their own transport to the loaders (or to
+    `set_default_transport`) instead of talking to a server."""
+
+    @abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[bytes] = None,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+    ) -> Iterator[bytes]: ...  # pragma: no cover
+
+    def close(self):
+        """Releases the connections of the transport"""
+        pass
+
+
+class RequestsTransport(Transport):
+    """A transport using a pooled `requests.Session`, so that connections to the
+    same host are reused. Responses are requested compressed (gzip, deflate and
+    br or zstd if urllib3 can decode them) and streamed in chunks."""
+
+    def __init__(self, pool_maxsize: int = 10, chunk_size: int = 64 * 1024):
+        try:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.request import ACCEPT_ENCODING
+        except ImportError as e:  # pragma: no cover
+            raise GenerationError(
+                "The requests library is required to load a schema from a url"
+            ) from e
+
+        self.chunk_size = chunk_size
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[bytes] = None,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+    ) -> Iterator[bytes]:
+        import requests
+
+        for attempt in range(retries + 1):
+            last_attempt = attempt == retries
+            try:
+                response = self.session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    data=data,
+                    timeout=timeout,
+                    stream=True,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise TransportError(f"Could not reach {url}: {e}") from e
+            else:
+                if response.status_code < 400:
+                    return self.iter_body(response, url)
+
+                response.close()
+                if last_attempt or response.status_code not in RETRY_STATUS_CODES:
+                    raise TransportError(
+                        f"{url} responded with status code {response.status_code}"
+                    )
+
+            time.sleep(backoff * 2**attempt)
+
+    def iter_body(self, response, url: str) -> Iterator[bytes]:
+        import requests
+
+        with response:
+            try:
+                yield from response.iter_content(chunk_size=self.chunk_size)
+            except requests.RequestException as e:
+                raise TransportError(
+                    f"Could not read the response of {url}: {e}"
+                ) from e
+
+    def close(self):
+        self.session.close()
+
+
+_default_transport: Optional[Transport] = None
+
+
+def get_default_transport() -> Transport:
+    """The transport used by the schema loaders if none is passed (created on first
+    use, so that connections are pooled for the whole process)"""
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = RequestsTransport()
+    return _default_transport
+
+
+def set_default_transport(transport: Optional[Transport]):
+    """Replaces the default transport (e.g. with a fake in tests), None resets it"""
+    global _default_transport
+    _default_transport = transport
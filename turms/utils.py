@@ -1,7 +1,12 @@
 import ast
 import glob
+import hashlib
+import os
+import pickle
 import re
-from typing import List, Optional, Set, Union
+from copy import copy
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Union
 
 from graphql import (
     BooleanValueNode,
@@ -22,11 +27,12 @@ from graphql import (
     NullValueNode,
     OperationDefinitionNode,
     SelectionSetNode,
+    Source,
     StringValueNode,
     ValueNode,
     parse,
     print_ast,
-    validate,
+    version as graphql_version,
 )
 from graphql.error.graphql_error import GraphQLError
 from graphql.language.ast import DocumentNode, FieldNode, NameNode
@@ -40,6 +46,8 @@ from turms.errors import (
     NoScalarFound,
 )
 from turms.registry import ClassRegistry
+from turms.snapshot import read_signed_file, write_signed_file
+from turms.validation import validate_incrementally
 
 from .config import GraphQLTypes
 
@@ -154,6 +162,125 @@ def generate_generic_typename_field(
     )
 
 
+def generate_union_annotation(
+    class_names: List[str],
+    typenames: List[Optional[str]],
+    registry: ClassRegistry,
+    config: GeneratorConfig,
+) -> ast.AST:
+    """Generates the annotation for a union of the classes. If 'discriminate_unions' is
+    enabled, the union is discriminated on the typename field of its members
+
+    The typenames are the (object) types of the classes, None for a class that
+    matches several types (e.g. a fragment on a union). The union is only
+    discriminated if every typename is known and unique, otherwise pydantic could
+    not map a typename to one member and a plain union is generated."""
+
+    registry.register_import("typing.Union")
+
+    union = ast.Subscript(
+        value=ast.Name("Union", ctx=ast.Load()),
+        slice=ast.Tuple(
+            elts=[ast.Name(id=clsname, ctx=ast.Load()) for clsname in class_names],
+            ctx=ast.Load(),
+        ),
+        ctx=ast.Load(),
+    )
+
+    if not config.discriminate_unions:
+        return union
+
+    if None in typenames or len(set(typenames)) != len(typenames):
+        return union
+
+    registry.register_import("typing.Annotated")
+    registry.register_import("pydantic.Field")
+
+    return ast.Subscript(
+        value=ast.Name("Annotated", ctx=ast.Load()),
+        slice=ast.Tuple(
+            elts=[
+                union,
+                ast.Call(
+                    func=ast.Name(id="Field", ctx=ast.Load()),
+                    args=[],
+                    keywords=[
+                        ast.keyword(arg="discriminator", value=ast.Constant("typename"))
+                    ],
+                ),
+            ],
+            ctx=ast.Load(),
+        ),
+        ctx=ast.Load(),
+    )
+
+
+def generate_cached_hash(registry: ClassRegistry) -> List[ast.AST]:
+    """Generates a cached `__hash__` and a short-circuiting `__eq__` for a frozen model
+
+    The hash is computed once per instance and kept in a private attribute (nested
+    frozen models cache their own hashes, so hashing deep models stays cheap).
+    Copies with updates reset the cached hash."""
+    registry.register_import("pydantic.PrivateAttr")
+    registry.register_import("typing.Any")
+    registry.register_import("typing.Dict")
+    registry.register_import("typing.Optional")
+
+    return ast.parse(
+        '''
+_cached_hash: Optional[int] = PrivateAttr(default=None)
+
+
+def __hash__(self) -> int:
+    cached = self.__pydantic_private__["_cached_hash"]
+    if cached is None:
+        cached = hash((self.__class__, tuple(self.__dict__.values())))
+        self.__pydantic_private__["_cached_hash"] = cached
+    return cached
+
+
+def __eq__(self, other: object) -> bool:
+    if self is other:
+        return True
+    if other.__class__ is not self.__class__:
+        return super().__eq__(other)
+    own = self.__pydantic_private__["_cached_hash"]
+    theirs = other.__pydantic_private__["_cached_hash"]
+    if own is not None and theirs is not None and own != theirs:
+        return False
+    return (
+        self.__dict__ == other.__dict__
+        and self.__pydantic_extra__ == other.__pydantic_extra__
+    )
+
+
+def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False):
+    copied = super().model_copy(update=update, deep=deep)
+    if update:
+        copied.__pydantic_private__["_cached_hash"] = None
+    return copied
+'''
+    ).body
+
+
+def should_defer_build(
+    graphQLType: GraphQLTypes, config: GeneratorConfig, typename: str = None
+) -> bool:
+    """Checks if building the model of a type should be deferred (pydantic v2)"""
+    if not config.defer_build.enabled or config.pydantic_version != "v2":
+        return False
+    # Operations are passed as OperationType, so the types are compared by value
+    if getattr(graphQLType, "value", graphQLType) not in [
+        type.value for type in config.defer_build.types
+    ]:
+        return False
+    if config.defer_build.exclude and typename in config.defer_build.exclude:
+        return False
+    if config.defer_build.include and typename not in config.defer_build.include:
+        return False
+    return True
+
+
 def generate_config_dict(
     graphQLType: GraphQLTypes,
     config: GeneratorConfig,
@@ -172,6 +299,7 @@ def generate_config_dict(
     """
 
     config_keywords = []
+    frozen = False
 
     if config.freeze.enabled:
         if graphQLType in config.freeze.types:
@@ -180,10 +308,16 @@ def generate_config_dict(
             elif config.freeze.include and typename not in config.freeze.include:
                 pass
             else:
+                frozen = True
                 config_keywords.append(
                     ast.keyword(arg="frozen", value=ast.Constant(value=True))
                 )
 
+    if should_defer_build(graphQLType, config, typename):
+        config_keywords.append(
+            ast.keyword(arg="defer_build", value=ast.Constant(value=True))
+        )
+
     if config.options.enabled:
         if graphQLType in config.options.types:
             if config.options.exclude and typename in config.options.exclude:
@@ -249,6 +383,10 @@ def generate_config_dict(
                     ast.keyword(arg=key, value=ast.Constant(value=value))
                 )
 
+    members = []
+    if frozen and config.freeze.cache_hash:
+        members = generate_cached_hash(registy)
+
     if len(config_keywords) > 0:
         registy.register_import("pydantic.ConfigDict")
         return [
@@ -260,9 +398,9 @@ def generate_config_dict(
                     keywords=config_keywords,
                 ),
             )
-        ]
+        ] + members
     else:
-        return []
+        return members
 
 
 def generate_config_class_pydantic(
@@ -391,6 +529,87 @@ def generate_config_class_pydantic(
         return []
 
 
+def get_defer_build(node: ast.ClassDef) -> Optional[bool]:
+    """Returns the `defer_build` value of the model_config of a class (if set)"""
+    for sub_node in node.body:
+        if (
+            isinstance(sub_node, ast.Assign)
+            and any(
+                getattr(target, "id", None) == "model_config"
+                for target in sub_node.targets
+            )
+            and isinstance(sub_node.value, ast.Call)
+        ):
+            for keyword in sub_node.value.keywords:
+                if keyword.arg == "defer_build" and isinstance(
+                    keyword.value, ast.Constant
+                ):
+                    return bool(keyword.value.value)
+    return None
+
+
+def get_deferred_models(tree: List[ast.AST], parent: str = None) -> List[str]:
+    """Returns the (qualified) names of the models that are configured with
+    `defer_build=True`, either through `defer_build` or `additional_config`,
+    or that inherit it from a deferred base"""
+    deferred = []
+    for node in tree:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        name = f"{parent}.{node.name}" if parent else node.name
+        defer_build = get_defer_build(node)
+        if defer_build is None:
+            defer_build = any(
+                isinstance(base, ast.Name) and base.id in deferred
+                for base in node.bases
+            )
+        if defer_build:
+            deferred.append(name)
+        deferred += get_deferred_models(node.body, parent=name)
+    return deferred
+
+
+def generate_warmup(deferred: List[str], registry: ClassRegistry) -> List[ast.AST]:
+    """Generates a `warmup` function that builds the deferred models
+
+    The function builds the given models (or all deferred models) in a daemon
+    thread and returns the thread, or builds them right away when called with
+    `background=False`."""
+    registry.register_import("threading.Thread")
+    registry.register_import("typing.Iterable")
+    registry.register_import("typing.Optional")
+    registry.register_import("typing.Type")
+    registry.register_import("pydantic.BaseModel")
+
+    source = f'''
+DEFERRED_MODELS = ({", ".join(deferred)},)
+
+
+def warmup(
+    models: Optional[Iterable[Type[BaseModel]]] = None, background: bool = True
+) -> Optional[Thread]:
+    """Builds the validators of deferred models ahead of their first use
+
+    Args:
+        models: The models to build. Defaults to all deferred models.
+        background: Build the models in a daemon thread (which is returned)
+    """
+
+    def build():
+        for model in DEFERRED_MODELS if models is None else models:
+            model.model_rebuild(force=True)
+
+    if not background:
+        build()
+        return None
+
+    thread = Thread(target=build, name="warmup", daemon=True)
+    thread.start()
+    return thread
+'''
+    return ast.parse(source).body
+
+
 def generate_pydantic_config(
     graphQLType: GraphQLTypes,
     config: GeneratorConfig,
@@ -434,47 +653,233 @@ def add_typename_recursively(selection_set: SelectionSetNode, skip=False) -> Non
     # Update the selection set with potentially added __typename fields
     selection_set.selections = tuple(selections)
 
+def copy_selection_set(
+    selection_set: Optional[SelectionSetNode],
+) -> Optional[SelectionSetNode]:
+    """Copies a selection set and the (nested) fields with selection sets in it, which
+    are the nodes that `add_typename_recursively` changes"""
+    if selection_set is None:
+        return None
+
+    selection_set = copy(selection_set)
+    selections = []
+    for field in selection_set.selections:
+        if isinstance(field, FieldNode) and field.selection_set:
+            field = copy(field)
+            field.selection_set = copy_selection_set(field.selection_set)
+        selections.append(field)
+
+    selection_set.selections = tuple(selections)
+    return selection_set
+
+
 def auto_add_typename_field_to_all_objects(document: DocumentNode) -> DocumentNode:
+    """Returns a copy of the document with __typename added to all selection sets (but
+    the root of operations). The nodes of the document (which are shared by the
+    document cache) are not changed."""
+    definitions = []
     for definition in document.definitions:
         if isinstance(definition, (OperationDefinitionNode, FragmentDefinitionNode)):
-            add_typename_recursively(definition.selection_set, skip=isinstance(definition, OperationDefinitionNode))
-    
-    
+            definition = copy(definition)
+            definition.selection_set = copy_selection_set(definition.selection_set)
+            add_typename_recursively(
+                definition.selection_set,
+                skip=isinstance(definition, OperationDefinitionNode),
+            )
+        definitions.append(definition)
+
+    return DocumentNode(definitions=tuple(definitions), loc=document.loc)
+
+
+def parse_document_file(file_path: str) -> DocumentNode:
+    """Parses a single document file. The file path is set as the name of
+    the source, so that errors point to the file they occured in"""
+    with open(file_path, "r") as f:
+        return parse(Source(f.read(), file_path))
+
+
+@dataclass
+class CachedDocument:
+    mtime_ns: int
+    size: int
+    digest: str
+    document: Optional[DocumentNode]
+
+
+_document_cache: Dict[str, CachedDocument] = {}
+"""Parsed documents of this process, keyed by their absolute path"""
+
+
+def clear_document_cache():
+    """Clears the in memory cache of parsed documents"""
+    _document_cache.clear()
+
+
+def parse_document_file_cached(
+    file_path: str, cache_dir: Optional[str] = None
+) -> Optional[DocumentNode]:
+    """Parses a single document file, reusing earlier results if the file did not change
+
+    Files are looked up in memory by their mtime and size first. If those changed,
+    the content is hashed and the document is only parsed again if the hash
+    changed too. If a `cache_dir` is given, parsed documents are additionally
+    stored there as pickles, keyed by the path, the content hash and the
+    graphql-core version. The pickles are signed with the key of the user (see
+    `write_signed_file`), pickles with another or no signature are ignored.
+
+    Args:
+        file_path (str): The document file
+        cache_dir (Optional[str], optional): The directory for pickled documents. Defaults to None.
+
+    Raises:
+        GraphQLError: If the document has syntax errors (with the file as source name)
+
+    Returns:
+        Optional[DocumentNode]: The document, or None if the file is empty
+    """
+    key = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+
+    cached = _document_cache.get(key)
+    if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+        return cached.document
+
+    with open(file_path, "rb") as f:
+        content = f.read()
+
+    digest = hashlib.sha256(content).hexdigest()
+
+    if cached and cached.digest == digest:
+        cached.mtime_ns, cached.size = stat.st_mtime_ns, stat.st_size
+        return cached.document
+
+    pickle_path = None
+    document = None
+    loaded = False
+
+    if cache_dir:
+        pickle_key = hashlib.sha256(
+            f"{graphql_version}:{key}:{digest}".encode()
+        ).hexdigest()
+        pickle_path = os.path.join(cache_dir, f"{pickle_key}.pickle")
+        # Unsigned (e.g. planted) or corrupt pickles are just a cache miss
+        signed = read_signed_file(pickle_path)
+        if signed is not None:
+            try:
+                document = pickle.loads(signed[1])
+                loaded = True
+            except Exception:
+                loaded = False
+
+    if not loaded:
+        body = content.decode("utf-8")
+        document = parse(Source(body, file_path)) if body.strip() else None
+
+        if pickle_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            write_signed_file(pickle_path, pickle.dumps(document))
+
+    _document_cache[key] = CachedDocument(
+        mtime_ns=stat.st_mtime_ns, size=stat.st_size, digest=digest, document=document
+    )
     return document
 
 
-def parse_documents(client_schema: GraphQLSchema, scan_glob) -> DocumentNode:
-    """ """
+def merge_documents(documents: Iterable[Optional[DocumentNode]]) -> DocumentNode:
+    """Merges the definitions of documents into one document (None is skipped)"""
+    return DocumentNode(
+        definitions=tuple(
+            definition
+            for document in documents
+            if document is not None
+            for definition in document.definitions
+        )
+    )
+
+
+def parse_schema_glob(glob_string: str) -> DocumentNode:
+    """Parses the schema files matched by the glob into one document
+
+    Every file is parsed on its own (see `parse_document_file_cached`), so that
+    unchanged files are not parsed again (e.g. when watching) and errors point to
+    the file they occured in. Their definitions are merged, instead of parsing
+    the concatenated content of all files.
+
+    Args:
+        glob_string (str): The glob to find the schema files
+
+    Raises:
+        GenerationError: If the glob did not match any file
+
+    Returns:
+        DocumentNode: The merged document
+    """
+    files = sorted(glob.glob(glob_string, recursive=True))
+    if len(files) == 0:
+        raise GenerationError(f"No files found for glob string {glob_string}")
+
+    return merge_documents(parse_document_file_cached(file) for file in files)
+
+
+def parse_documents(
+    client_schema: GraphQLSchema, scan_glob, cache_dir: Optional[str] = None
+) -> DocumentNode:
+    """Parses and validates all documents matched by the glob
+
+    Every file is parsed on its own (see `parse_document_file_cached`), so that
+    unchanged files are not parsed again and errors point to the file they
+    occured in. The definitions of all files are merged into one document,
+    which is validated incrementally (see `validate_incrementally`).
+
+    Args:
+        client_schema (GraphQLSchema): The schema to validate against
+        scan_glob (str): The glob to find the documents
+        cache_dir (Optional[str], optional): The directory for pickled documents. Defaults to None.
+
+    Raises:
+        NoDocumentsFoundError: If the glob did not match any non empty document
+        InvalidDocuments: If any document has syntax errors or is invalid
+
+    Returns:
+        DocumentNode: The merged document
+    """
     if not scan_glob:
         raise GenerationError("Couldnt find documents glob")
 
     x = glob.glob(scan_glob, recursive=True)
 
     errors: List[GraphQLError] = []
-
-    dsl = ""
+    definitions = []
 
     for file in x:
-        with open(file, "r") as f:
-            dsl += f.read()
+        try:
+            document = parse_document_file_cached(file, cache_dir=cache_dir)
+        except GraphQLError as e:
+            errors.append(e)
+            continue
 
-    if dsl == "":
+        if document is not None:
+            definitions += document.definitions
+
+    if errors:
+        raise InvalidDocuments(
+            "Invalid Documents \n" + "\n".join(str(e) for e in errors)
+        )
+
+    if not definitions:
         raise NoDocumentsFoundError(
             f"Glob {scan_glob} did not find documents. Or only empty documents"
         )
 
-    nodes = parse(dsl)
+    nodes = DocumentNode(definitions=tuple(definitions))
 
-    errors = validate(client_schema, nodes)
+    errors = validate_incrementally(client_schema, nodes, cache_dir=cache_dir)
     if len(errors) > 0:
         raise InvalidDocuments(
             "Invalid Documents \n" + "\n".join(str(e) for e in errors)
         )
-    
-    
-    nodes = auto_add_typename_field_to_all_objects(nodes)
 
-   
+    nodes = auto_add_typename_field_to_all_objects(nodes)
 
     return nodes
 
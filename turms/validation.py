@@ -0,0 +1,318 @@
+import hashlib
+import json
+import os
+import weakref
+from typing import Dict, Iterable, List, Optional, Set
+
+from graphql import (
+    DefinitionNode,
+    DocumentNode,
+    ExecutableDefinitionNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLSchema,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    print_ast,
+    print_schema,
+    specified_rules,
+    validate,
+    version as graphql_version,
+)
+from graphql.validation import (
+    LoneAnonymousOperationRule,
+    NoUnusedFragmentsRule,
+    UniqueFragmentNamesRule,
+    UniqueOperationNamesRule,
+)
+
+from turms.snapshot import read_signed_file, write_signed_file
+
+GLOBAL_RULES = (
+    UniqueOperationNamesRule,
+    UniqueFragmentNamesRule,
+    NoUnusedFragmentsRule,
+    LoneAnonymousOperationRule,
+)
+"""Validation rules that need to see all definitions at once. These
+are checked across all definitions by `check_global_rules`"""
+
+FILE_RULES = [rule for rule in specified_rules if rule not in GLOBAL_RULES]
+"""Validation rules that are checked for a single file or definition
+(together with the fragments it spreads)"""
+
+VALIDATION_CACHE_NAME = "validation.json"
+"""The file within the cache directory that stores the keys of valid definitions
+(as a sorted json list, signed like the snapshots)"""
+
+
+def collect_fragment_spreads(selection_set: Optional[SelectionSetNode]) -> Set[str]:
+    """Collects the names of all fragments spread within a selection set"""
+    spreads = set()
+    if selection_set is None:
+        return spreads
+
+    for selection in selection_set.selections:
+        if isinstance(selection, FragmentSpreadNode):
+            spreads.add(selection.name.value)
+        elif isinstance(selection, (FieldNode, InlineFragmentNode)):
+            spreads |= collect_fragment_spreads(selection.selection_set)
+
+    return spreads
+
+
+def resolve_fragment_dependencies(
+    document: DocumentNode, fragments: Dict[str, FragmentDefinitionNode]
+) -> List[FragmentDefinitionNode]:
+    """Returns all fragments (transitively) spread in the document that are not defined in it"""
+    defined = {
+        definition.name.value
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+
+    unresolved = set()
+    for definition in document.definitions:
+        unresolved |= collect_fragment_spreads(definition.selection_set)
+
+    dependencies = []
+    seen = set(defined)
+
+    while unresolved:
+        name = unresolved.pop()
+        if name in seen or name not in fragments:
+            continue
+        seen.add(name)
+        dependencies.append(fragments[name])
+        unresolved |= collect_fragment_spreads(fragments[name].selection_set)
+
+    return sorted(dependencies, key=lambda fragment: fragment.name.value)
+
+
+def check_global_rules(definitions: Iterable[DefinitionNode]) -> List[GraphQLError]:
+    """Checks the rules that need to see all definitions at once"""
+    errors = []
+    operations: Dict[str, OperationDefinitionNode] = {}
+    fragments: Dict[str, FragmentDefinitionNode] = {}
+    anonymous_operations = []
+    fragment_definitions: List[FragmentDefinitionNode] = []
+    spreads = set()
+    operation_count = 0
+
+    for definition in definitions:
+        if isinstance(definition, OperationDefinitionNode):
+            spreads |= collect_fragment_spreads(definition.selection_set)
+            operation_count += 1
+            if not definition.name:
+                anonymous_operations.append(definition)
+                continue
+            name = definition.name.value
+            if name in operations:
+                errors.append(
+                    GraphQLError(
+                        f"There can be only one operation named '{name}'.",
+                        [operations[name].name, definition.name],
+                    )
+                )
+            else:
+                operations[name] = definition
+
+        if isinstance(definition, FragmentDefinitionNode):
+            fragment_definitions.append(definition)
+            name = definition.name.value
+            if name in fragments:
+                errors.append(
+                    GraphQLError(
+                        f"There can be only one fragment named '{name}'.",
+                        [fragments[name].name, definition.name],
+                    )
+                )
+            else:
+                fragments[name] = definition
+
+    if operation_count > 1:
+        for operation in anonymous_operations:
+            errors.append(
+                GraphQLError(
+                    "This anonymous operation must be the only defined operation.",
+                    operation,
+                )
+            )
+
+    # Only fragments reachable from an operation are used (like NoUnusedFragmentsRule)
+    used = set()
+    while spreads:
+        name = spreads.pop()
+        if name in used:
+            continue
+        used.add(name)
+        if name in fragments:
+            spreads |= collect_fragment_spreads(fragments[name].selection_set)
+
+    for fragment in fragment_definitions:
+        name = fragment.name.value
+        if name not in used:
+            errors.append(GraphQLError(f"Fragment '{name}' is never used.", fragment))
+
+    return errors
+
+
+def error_key(error: GraphQLError):
+    """A key that is equal for errors reported twice (e.g. in a fragment used by two operations)"""
+    return (
+        error.message,
+        error.source.name if error.source else None,
+        tuple((location.line, location.column) for location in error.locations or []),
+    )
+
+
+_schema_hashes: "weakref.WeakKeyDictionary[GraphQLSchema, str]" = (
+    weakref.WeakKeyDictionary()
+)
+
+_validation_cache: Dict[str, List[GraphQLError]] = {}
+"""Validation results of this process, keyed by `definition_key`"""
+
+_valid_keys_on_disk: Dict[str, Set[str]] = {}
+"""The keys of valid definitions stored in each cache directory"""
+
+
+def clear_validation_cache():
+    """Clears the in memory cache of validation results"""
+    _validation_cache.clear()
+    _valid_keys_on_disk.clear()
+
+
+def hash_schema(client_schema: GraphQLSchema) -> str:
+    """Hashes the printed schema (once per schema object)"""
+    if client_schema not in _schema_hashes:
+        _schema_hashes[client_schema] = hashlib.sha256(
+            print_schema(client_schema).encode()
+        ).hexdigest()
+    return _schema_hashes[client_schema]
+
+
+def hash_definition(definition: ExecutableDefinitionNode) -> str:
+    """Hashes the source of a definition together with its position,
+    as cached errors carry the locations of the definition"""
+    loc = definition.loc
+    if loc is None:
+        text = print_ast(definition)
+    else:
+        text = f"{loc.source.name}:{loc.start}:{loc.source.body[loc.start:loc.end]}"
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _load_valid_keys(cache_dir: str) -> Set[str]:
+    if cache_dir not in _valid_keys_on_disk:
+        keys = set()
+        # A missing, corrupt or unsigned cache is just a cache miss
+        signed = read_signed_file(os.path.join(cache_dir, VALIDATION_CACHE_NAME))
+        if signed is not None:
+            try:
+                loaded = json.loads(signed[1])
+            except ValueError:
+                loaded = None
+            if isinstance(loaded, list):
+                keys = {key for key in loaded if isinstance(key, str)}
+        _valid_keys_on_disk[cache_dir] = keys
+    return _valid_keys_on_disk[cache_dir]
+
+
+def _store_valid_keys(cache_dir: str, keys: Set[str]):
+    os.makedirs(cache_dir, exist_ok=True)
+    write_signed_file(
+        os.path.join(cache_dir, VALIDATION_CACHE_NAME),
+        json.dumps(sorted(keys)).encode("utf-8"),
+    )
+
+
+def validate_incrementally(
+    client_schema: GraphQLSchema,
+    document: DocumentNode,
+    cache_dir: Optional[str] = None,
+) -> List[GraphQLError]:
+    """Validates a document, only revalidating definitions that changed
+
+    Rules that need all definitions (see `GLOBAL_RULES`) are checked over the
+    whole document every time, which is cheap. All other rules are checked
+    per operation and fragment, together with the fragments it (transitively)
+    spreads. These results are cached by a key over the schema hash, the
+    definition hash and the hashes of its transitive fragments, so a change
+    to a fragment revalidates its dependents as well. If a `cache_dir` is
+    given, the keys of valid definitions are additionally stored there
+    (signed with the key of the user, unsigned files are ignored).
+
+    Args:
+        client_schema (GraphQLSchema): The schema to validate against
+        document (DocumentNode): The document
+        cache_dir (Optional[str], optional): The directory to persist valid keys in. Defaults to None.
+
+    Returns:
+        List[GraphQLError]: The validation errors (same rules as `graphql.validate`)
+    """
+    errors = check_global_rules(document.definitions)
+
+    schema_hash = hash_schema(client_schema)
+    valid_keys = _load_valid_keys(cache_dir) if cache_dir else set()
+    new_valid_keys = False
+
+    fragments: Dict[str, FragmentDefinitionNode] = {}
+    definitions: List[ExecutableDefinitionNode] = []
+    hashes: Dict[int, str] = {}
+
+    for definition in document.definitions:
+        if not isinstance(definition, ExecutableDefinitionNode):
+            # Non executable definitions fail validation as a whole
+            return validate(client_schema, document)
+        if isinstance(definition, FragmentDefinitionNode):
+            fragments.setdefault(definition.name.value, definition)
+        definitions.append(definition)
+        hashes[id(definition)] = hash_definition(definition)
+
+    for definition in definitions:
+        dependencies = resolve_fragment_dependencies(
+            DocumentNode(definitions=(definition,)), fragments
+        )
+        key = hashlib.sha256(
+            ":".join(
+                [graphql_version, schema_hash, hashes[id(definition)]]
+                + [hashes[id(fragment)] for fragment in dependencies]
+            ).encode()
+        ).hexdigest()
+
+        if key in _validation_cache:
+            errors += _validation_cache[key]
+            continue
+
+        if key in valid_keys:
+            _validation_cache[key] = []
+            continue
+
+        definition_errors = validate(
+            client_schema,
+            DocumentNode(definitions=(definition, *dependencies)),
+            FILE_RULES,
+        )
+        _validation_cache[key] = definition_errors
+        errors += definition_errors
+
+        if cache_dir and not definition_errors:
+            valid_keys.add(key)
+            new_valid_keys = True
+
+    if new_valid_keys:
+        _store_valid_keys(cache_dir, valid_keys)
+
+    deduplicated = []
+    seen = set()
+    for error in errors:
+        key = error_key(error)
+        if key not in seen:
+            seen.add(key)
+            deduplicated.append(error)
+
+    return deduplicated